@@ -1,19 +1,19 @@
 #!/usr/bin/env python3
 import os
 import argparse
-import dotenv
-from google import genai
-from google.genai import types
 import re  # For markdown formatting
 import threading
 import time
 import sys
+import json
+import socket
 
-dotenv.load_dotenv()
+import llm
 
 # ─────────────── Config ───────────────
-GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY")
-GEMINI_MODEL = "gemini-2.0-flash"
+# Unix socket of the optional background daemon (see ai_daemon.py)
+SOCKET_PATH = os.environ.get("AI_SOCKET", os.path.join(os.path.expanduser("~"), ".ai_daemon.sock"))
+SYSTEM_INSTRUCTION = "You are an AI assistant. For every input, output only the direct answer in plain text. Do not include greetings, restatements, explanations, or any additional formatting or jargon—just the answer itself. If the user explicitly asks for explanations, reasoning, or additional context, provide them accordingly."
 
 # ─────────────── Color Codes ───────────────
 RESET = "\033[0m"
@@ -27,64 +27,131 @@ CYAN = "\033[36m"
 WHITE = "\033[37m"
 
 # ─────────────── Markdown Formatting ───────────────
+HEADER_STYLES = {
+    1: f"{BOLD}{BLUE}",
+    2: f"{BOLD}{CYAN}",
+    3: f"{BOLD}{GREEN}",
+    4: f"{BOLD}{YELLOW}",
+    5: f"{BOLD}{MAGENTA}",
+    6: f"{BOLD}{WHITE}",
+}
+EMPHASIS_STYLES = {
+    "***": f"{BOLD}{YELLOW}",
+    "___": f"{BOLD}{YELLOW}",
+    "**": BOLD,
+    "__": BOLD,
+    "*": YELLOW,
+    "_": YELLOW,
+    "~~": RED,
+}
+HORIZONTAL_RULE = f"{CYAN}{'─' * 50}{RESET}"
+MAX_EMPHASIS_DEPTH = 8  # deeper markers print as-is, so a line of unclosed `*`s stays linear
+
+FENCE_RE = re.compile(r"^\s*(`{3,}|~{3,})")
+BLOCK_RE = re.compile(r"""
+      (?P<hr>^(?:-{3,}|\*{3,}|_{3,})\s*$)
+    | (?P<header>^(?P<hashes>\#{1,6})\s+(?P<htext>.*)$)
+    | (?P<bullet>^(?P<bindent>\s*)[-*+]\s+(?P<btext>.*)$)
+    | (?P<number>^(?P<nindent>\s*)(?P<num>\d+)\.\s+(?P<ntext>.*)$)
+    | (?P<quote>^>\s?(?P<qtext>.*)$)
+""", re.VERBOSE)
+INLINE_RE = re.compile(r"""
+      (?P<tick>`+)(?P<code>.+?)(?P=tick)
+    | \[(?P<label>[^\]]+)\]\((?P<url>[^)\s]+)\)
+    | (?P<mark>\*{1,3}|_{1,3}|~~)
+""", re.VERBOSE)
+
+class MarkdownRenderer:
+    """Render Markdown to ANSI-coloured text incrementally.
+
+    feed() accepts arbitrary chunks and returns the rendered text of every line
+    completed so far; the unfinished tail is buffered until the next chunk (or
+    close()). Fenced code blocks are tracked across lines, emphasis is matched
+    within a line.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._fence = None  # opening fence of the code block we are inside, if any
+
+    def feed(self, chunk):
+        """Add a chunk of Markdown; returns rendered output for completed lines."""
+        self._buffer += chunk
+        if "\n" not in chunk:
+            return ""
+        *lines, self._buffer = self._buffer.split("\n")
+        return "".join(self._render_line(line) for line in lines)
+
+    def close(self):
+        """Render whatever is left in the buffer (the last line has no newline)."""
+        line, self._buffer = self._buffer, ""
+        return self._render_line(line).rstrip("\n") if line else ""
+
+    def _render_line(self, line):
+        fence = FENCE_RE.match(line)
+        if self._fence:
+            if fence and fence.group(1)[0] == self._fence[0] and len(fence.group(1)) >= len(self._fence):
+                self._fence = None
+                return ""
+            return f"{MAGENTA}{line}{RESET}\n"
+        if fence:
+            self._fence = fence.group(1)
+            return ""
+
+        m = BLOCK_RE.match(line)
+        if not m:
+            return self._inline(line) + "\n"
+        if m.group("hr"):
+            return HORIZONTAL_RULE + "\n"
+        if m.group("header"):
+            style = HEADER_STYLES[len(m.group("hashes"))]
+            return f"{style}{self._inline(m.group('htext'), style)}{RESET}\n"
+        if m.group("bullet"):
+            return f"{m.group('bindent')}{CYAN}•{RESET} {self._inline(m.group('btext'))}\n"
+        if m.group("number"):
+            return f"{m.group('nindent')}{CYAN}{m.group('num')}.{RESET} {self._inline(m.group('ntext'))}\n"
+        return f"{GREEN}│{RESET} {self._inline(m.group('qtext'))}\n"
+
+    @staticmethod
+    def _inline(text, base=""):
+        """Single pass over a line for code spans, links and emphasis."""
+        out = []
+        stack = []  # currently open emphasis markers
+        pos = 0
+        for m in INLINE_RE.finditer(text):
+            out.append(text[pos:m.start()])
+            pos = m.end()
+            restore = RESET + base + "".join(EMPHASIS_STYLES[s] for s in stack)
+            if m.group("tick"):
+                out.append(f"{MAGENTA}{m.group('code')}{restore}")
+                continue
+            if m.group("label"):
+                out.append(f"{BLUE}{m.group('label')}{RESET} ({CYAN}{m.group('url')}{restore})")
+                continue
+
+            mark = m.group("mark")
+            before = text[m.start() - 1] if m.start() else " "
+            after = text[m.end()] if m.end() < len(text) else " "
+            intraword = mark[0] == "_" and (before.isalnum() or after.isalnum())
+            if mark in stack and not before.isspace() and not (intraword and after.isalnum()):
+                while stack.pop() != mark:
+                    pass
+                out.append(RESET + base + "".join(EMPHASIS_STYLES[s] for s in stack))
+            elif (not after.isspace() and not (intraword and before.isalnum())
+                  and len(stack) < MAX_EMPHASIS_DEPTH and text.find(mark, m.end()) != -1):
+                stack.append(mark)
+                out.append(EMPHASIS_STYLES[mark])
+            else:
+                out.append(mark)
+        out.append(text[pos:])
+        if stack:
+            out.append(RESET + base)
+        return "".join(out)
+
 def format_markdown(text):
-    """Format markdown text for terminal display."""
-    # Handle code blocks first (they need special treatment)
-    # Match fenced code blocks with language specification
-    code_block_pattern = r'```(?:\w+)?\n(.*?)```'
-    code_blocks = re.findall(code_block_pattern, text, re.DOTALL)
-    
-    # Replace code blocks with placeholders
-    placeholder_map = {}
-    for i, block in enumerate(code_blocks):
-        placeholder = f"__CODE_BLOCK_{i}__"
-        placeholder_map[placeholder] = f"{MAGENTA}{block}{RESET}"
-        text = text.replace(f"```{block}```", placeholder, 1)
-    
-    # Headers
-    text = re.sub(r'^# (.*?)$', f"{BOLD}{BLUE}\\1{RESET}", text, flags=re.MULTILINE)
-    text = re.sub(r'^## (.*?)$', f"{BOLD}{CYAN}\\1{RESET}", text, flags=re.MULTILINE)
-    text = re.sub(r'^### (.*?)$', f"{BOLD}{GREEN}\\1{RESET}", text, flags=re.MULTILINE)
-    text = re.sub(r'^#### (.*?)$', f"{BOLD}{YELLOW}\\1{RESET}", text, flags=re.MULTILINE)
-    text = re.sub(r'^##### (.*?)$', f"{BOLD}{MAGENTA}\\1{RESET}", text, flags=re.MULTILINE)
-    text = re.sub(r'^###### (.*?)$', f"{BOLD}{WHITE}\\1{RESET}", text, flags=re.MULTILINE)
-    
-    # Bold and Italic
-    text = re.sub(r'\*\*\*(.*?)\*\*\*', f"{BOLD}{YELLOW}\\1{RESET}", text)
-    text = re.sub(r'___(.+?)___', f"{BOLD}{YELLOW}\\1{RESET}", text)
-    text = re.sub(r'\*\*(.*?)\*\*', f"{BOLD}\\1{RESET}", text)
-    text = re.sub(r'__(.+?)__', f"{BOLD}\\1{RESET}", text)
-    text = re.sub(r'\*(.*?)\*', f"{YELLOW}\\1{RESET}", text)
-    text = re.sub(r'_(.+?)_', f"{YELLOW}\\1{RESET}", text)
-    
-    # Strikethrough
-    text = re.sub(r'~~(.*?)~~', f"{RED}\\1{RESET}", text)
-    
-    # Lists
-    text = re.sub(r'^- (.*?)$', f"{CYAN}•{RESET} \\1", text, flags=re.MULTILINE)
-    text = re.sub(r'^\* (.*?)$', f"{CYAN}•{RESET} \\1", text, flags=re.MULTILINE)
-    text = re.sub(r'^\+ (.*?)$', f"{CYAN}•{RESET} \\1", text, flags=re.MULTILINE)
-    text = re.sub(r'^(\d+)\. (.*?)$', f"{CYAN}\\1.{RESET} \\2", text, flags=re.MULTILINE)
-    
-    # Blockquotes
-    text = re.sub(r'^> (.*?)$', f"{GREEN}│{RESET} \\1", text, flags=re.MULTILINE)
-    
-    # Horizontal rules
-    text = re.sub(r'^---+$', f"{CYAN}{'─' * 50}{RESET}", text, flags=re.MULTILINE)
-    text = re.sub(r'^\*\*\*+$', f"{CYAN}{'─' * 50}{RESET}", text, flags=re.MULTILINE)
-    text = re.sub(r'^___+$', f"{CYAN}{'─' * 50}{RESET}", text, flags=re.MULTILINE)
-    
-    # Links
-    text = re.sub(r'\[(.*?)\]\((.*?)\)', f"{BLUE}\\1{RESET} ({CYAN}\\2{RESET})", text)
-    
-    # Inline code (after other formatting to avoid conflicts)
-    text = re.sub(r'`(.*?)`', f"{MAGENTA}\\1{RESET}", text)
-    
-    # Restore code blocks
-    for placeholder, content in placeholder_map.items():
-        text = text.replace(placeholder, content)
-    
-    return text
+    """Format markdown text for terminal display (single pass, see MarkdownRenderer)."""
+    renderer = MarkdownRenderer()
+    return renderer.feed(text) + renderer.close()
 
 # ─────────────── Loading Animation ───────────────
 def _animate_loading():
@@ -97,75 +164,103 @@ def _animate_loading():
         idx += 1
         time.sleep(0.1)
 
-def ask_gemini(question_text):
-    """Send a question to Gemini and stream back the answer."""
-    if not GEMINI_API_KEY:
-        print(f"{RED}Error: GEMINI_API_KEY environment variable not set.{RESET}")
-        print("Please set this environment variable with your API key.")
-        return None
+def _render_stream(response_chunks):
+    """Show the spinner until the first chunk, then print rendered lines as they arrive.
+
+    Returns the full response text; errors are re-raised after the spinner stops.
+    """
+    # Start the loading animation in a separate thread
+    stop_animation = threading.Event()
+    animation_thread = threading.Thread(
+        target=lambda: _animate_loading_wrapper(stop_animation)
+    )
+    animation_thread.daemon = True
+    animation_thread.start()
+    
+    def stop_loading():
+        if not stop_animation.is_set():
+            stop_animation.set()
+            animation_thread.join()
+            sys.stdout.write("\r" + " " * 20 + "\r")  # Clear the animation line
+            print()  # Add a newline before the response
     
     try:
-        # Start the loading animation in a separate thread
-        stop_animation = threading.Event()
-        animation_thread = threading.Thread(
-            target=lambda: _animate_loading_wrapper(stop_animation)
-        )
-        animation_thread.daemon = True
-        animation_thread.start()
-        
-        client = genai.Client(api_key=GEMINI_API_KEY)
-        
-        contents = [
-            types.Content(
-                role="user",
-                parts=[types.Part.from_text(text=question_text)],
-            ),
-        ]
-        
-        # Use system_instruction in the config instead of as a content item
-        generate_content_config = types.GenerateContentConfig(
-            response_mime_type="text/plain",
-            system_instruction=[
-                types.Part.from_text(text="You are an AI assistant. For every input, output only the direct answer in plain text. Do not include greetings, restatements, explanations, or any additional formatting or jargon—just the answer itself. If the user explicitly asks for explanations, reasoning, or additional context, provide them accordingly."),
-            ],
-        )
-        
-        response_chunks = client.models.generate_content_stream(
-            model=GEMINI_MODEL,
-            contents=contents,
-            config=generate_content_config,
-        )
-        
-        # Collect the entire response first
+        # Render complete lines as soon as they arrive
+        renderer = MarkdownRenderer()
         full_response = ""
         for chunk in response_chunks:
-            full_response += chunk.text
-        
-        # Stop the animation before printing the response
-        stop_animation.set()
-        animation_thread.join()
-        sys.stdout.write("\r" + " " * 20 + "\r")  # Clear the animation line
-        
-        # Format the entire response at once
-        formatted_response = format_markdown(full_response)
+            stop_loading()
+            full_response += chunk
+            sys.stdout.write(renderer.feed(chunk))
+            sys.stdout.flush()
         
-        # Print the formatted response
-        print()  # Add a newline before the response
-        print(formatted_response)
+        stop_loading()
+        print(renderer.close())
         print()  # Add a newline after the response
         
         return full_response
+    finally:
+        # Make sure to stop the animation if there's an error
+        stop_loading()
 
+def ask_gemini(question_text):
+    """Send a question to Gemini and stream back the answer."""
+    try:
+        backend = llm.get_backend()
+    except llm.MissingAPIKeyError:
+        print(f"{RED}Error: GEMINI_API_KEY environment variable not set.{RESET}")
+        print("Please set this environment variable with your API key.")
+        return None
+    
+    try:
+        return _render_stream(backend.generate_stream(
+            question_text,
+            system_instruction=SYSTEM_INSTRUCTION,
+        ))
     except Exception as e:
-        # Make sure to stop the animation if there's an error
-        if 'stop_animation' in locals() and 'animation_thread' in locals():
-            stop_animation.set()
-            animation_thread.join()
-            sys.stdout.write("\r" + " " * 20 + "\r")  # Clear the animation line
-        
         print(f"\n{RED}Error calling Gemini API: {e}{RESET}")
         return None
 
+def ask_daemon(question_text, session, reset=False, stateless=False):
+    """Ask through a running ai_daemon, which keeps the conversation per session.
+
+    Returns None without printing anything when no daemon is reachable, so the
+    caller can fall back to the in-process path; "" after a reported error.
+    A stateless question neither sees nor extends the session's history.
+    """
+    
+    if not hasattr(socket, "AF_UNIX") or not os.path.exists(SOCKET_PATH):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(SOCKET_PATH)
+    except OSError:
+        sock.close()
+        return None
+    
+    def response_chunks(stream):
+        for line in stream:
+            message = json.loads(line)
+            if "error" in message:
+                raise RuntimeError(message["error"])
+            if message.get("done"):
+                return
+            yield message["chunk"]
+        raise ConnectionError("daemon closed the connection")
+    
+    with sock, sock.makefile("r", encoding="utf-8") as stream:
+        request = {"command": "ask", "question": question_text, "session": session,
+                   "reset": reset, "stateless": stateless}
+        try:
+            sock.sendall((json.dumps(request) + "\n").encode("utf-8"))
+        except OSError:
+            return None  # daemon is shutting down
+        try:
+            return _render_stream(response_chunks(stream))
+        except Exception as e:
+            print(f"\n{RED}Error calling Gemini API: {e}{RESET}")
+            return ""
+
 def _animate_loading_wrapper(stop_event):
     """Wrapper for the animation function that checks for the stop event."""
     animation = "|/-\\"
@@ -174,22 +269,207 @@ def _animate_loading_wrapper(stop_event):
         sys.stdout.write(f"\r{CYAN}Thinking {animation[idx % len(animation)]}{RESET}")
         sys.stdout.flush()
         idx += 1
-        time.sleep(0.1)
+        stop_event.wait(0.1)  # Wakes immediately once the first chunk arrives
+
+def _cache_enabled():
+    """True if AI_CACHE turns the answer cache on without a flag."""
+    return os.environ.get("AI_CACHE", "").lower() in ("1", "true", "yes", "on")
+
+# ─────────────── Batch Mode ───────────────
+BATCH_WORKERS = 8
+BATCH_RETRIES = 2
+
+def read_questions(source):
+    """One question per non-blank line of a file, or of stdin when source is '-'."""
+    if source == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(source, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    return [line.strip() for line in lines if line.strip()]
+
+def _ask_with_retries(backend, question, retries):
+    """Ask one batch question; returns (answer, error, attempts, seconds)."""
+    start = time.perf_counter()
+    for attempt in range(retries + 1):
+        try:
+            answer = backend.generate(question, system_instruction=SYSTEM_INSTRUCTION)
+            return answer, None, attempt + 1, time.perf_counter() - start
+        except Exception as e:
+            error = str(e)
+            if attempt < retries:
+                time.sleep(0.5 * 2 ** attempt)
+    return None, error, retries + 1, time.perf_counter() - start
+
+def _percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+def run_batch(questions, out, workers=BATCH_WORKERS, retries=BATCH_RETRIES, cache=None, refresh=False):
+    """Answer questions concurrently and write one JSON line per question, in input order.
+
+    Returns a stats dict. Results are written as soon as every earlier question
+    is done, so long batches can be followed with `tail -f`.
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    backend = llm.get_backend()
+    model   = llm.selected_model()
+    records = {}
+    pending = []
+    if cache is not None:
+        import ai_cache
+        keys = [ai_cache.cache_key(q, SYSTEM_INSTRUCTION, model) for q in questions]
+    for i, question in enumerate(questions):
+        answer = None if cache is None or refresh else cache.get(keys[i])
+        if answer is None:
+            pending.append(i)
+        else:
+            records[i] = {"index": i, "question": question, "answer": answer, "error": None,
+                          "attempts": 0, "latency": 0.0, "cached": True}
+
+    next_index = 0
+    def flush():
+        nonlocal next_index
+        while next_index in records:
+            out.write(json.dumps(records[next_index], ensure_ascii=False) + "\n")
+            next_index += 1
+        out.flush()
+
+    start = time.perf_counter()
+    flush()
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = {executor.submit(_ask_with_retries, backend, questions[i], retries): i for i in pending}
+        for future in as_completed(futures):
+            i = futures[future]
+            answer, error, attempts, seconds = future.result()
+            records[i] = {"index": i, "question": questions[i], "answer": answer, "error": error,
+                          "attempts": attempts, "latency": round(seconds, 3), "cached": False}
+            if cache is not None and answer:
+                cache.put(keys[i], answer)  # sqlite connection stays on this thread
+            mark = f"{GREEN}✅" if error is None else f"{RED}❌ {error}"
+            print(f"{CYAN}→ #{i + 1}{RESET} {mark}{RESET}", file=sys.stderr, flush=True)
+            flush()
+    wall = time.perf_counter() - start
+
+    asked = [records[i] for i in pending]
+    latencies = [r["latency"] for r in asked if r["error"] is None]
+    return {
+        "total": len(questions),
+        "ok": sum(1 for r in records.values() if r["error"] is None),
+        "failed": sum(1 for r in records.values() if r["error"] is not None),
+        "cached": len(questions) - len(pending),
+        "retries": sum(r["attempts"] - 1 for r in asked),
+        "wall": wall,
+        "per_second": len(questions) / wall if wall else 0,
+        "p50": _percentile(latencies, 50) if latencies else 0,
+        "p95": _percentile(latencies, 95) if latencies else 0,
+    }
+
+def print_batch_stats(stats):
+    """Summarise a batch run on stderr, keeping stdout clean JSONL."""
+    colour = RED if stats["failed"] else GREEN
+    print(f"\n{BOLD}{stats['total']} questions in {stats['wall']:.2f}s "
+          f"({stats['per_second']:.2f}/s){RESET}", file=sys.stderr)
+    print(f"  {colour}{stats['ok']} ok, {stats['failed']} failed{RESET}, {stats['cached']} cached, "
+          f"{stats['retries']} retries", file=sys.stderr)
+    print(f"  latency p50 {stats['p50']:.3f}s, p95 {stats['p95']:.3f}s", file=sys.stderr)
 
 def main():
     parser = argparse.ArgumentParser(description='Ask a question to the Gemini API.')
-    parser.add_argument('question', nargs='+', help='The question to ask Gemini.')
+    parser.add_argument('question', nargs='*', help='The question to ask Gemini.')
+    parser.add_argument('--session', '-s', default=f"shell-{os.getppid()}",
+                        help='Conversation to continue when the daemon is running (default: one per shell)')
+    parser.add_argument('--new', action='store_true', help='Start a fresh conversation in this session')
+    parser.add_argument('--no-daemon', action='store_true', help='Always answer in-process, even if the daemon is running')
+    parser.add_argument('--cache', action='store_true', help='Reuse cached answers to identical questions (or set AI_CACHE=1)')
+    parser.add_argument('--no-cache', action='store_true', help='Bypass the answer cache even if AI_CACHE is set')
+    parser.add_argument('--refresh', action='store_true', help='Ask again and overwrite the cached answer')
+    parser.add_argument('--batch', '-b', metavar='FILE',
+                        help="Answer one question per line of FILE ('-' for stdin) and print JSONL results")
+    parser.add_argument('--output', '-o', help='Write batch results to this file instead of stdout')
+    parser.add_argument('--workers', '-j', type=int, default=BATCH_WORKERS,
+                        help=f'Concurrent questions in batch mode (default: {BATCH_WORKERS})')
+    parser.add_argument('--retries', type=int, default=BATCH_RETRIES,
+                        help=f'Retries per failed batch question (default: {BATCH_RETRIES})')
     
     args = parser.parse_args()
     
+    use_cache = (args.cache or args.refresh or _cache_enabled()) and not args.no_cache
+    
+    if args.batch:
+        batch_main(args, use_cache)
+        return
+    
     question_text = " ".join(args.question)
     
     if not question_text:
         print(f"{RED}Error: No question provided.{RESET}")
         parser.print_help()
         exit(1)
-        
-    ask_gemini(question_text)
+    
+    cache = None
+    if use_cache:
+        import dotenv
+        import ai_cache
+        dotenv.load_dotenv()  # LLM_MODEL may come from .env and is part of the key
+        cache = ai_cache.ResponseCache()
+        key = ai_cache.cache_key(question_text, SYSTEM_INSTRUCTION, llm.selected_model())
+        answer = None if args.refresh else cache.get(key)
+        if answer is not None:
+            # Same output as a streamed answer, minus the spinner
+            print()
+            print(format_markdown(answer))
+            print()
+            return
+    
+    # Cached answers must not depend on a session's history, so ask statelessly
+    answer = None
+    if not args.no_daemon:
+        answer = ask_daemon(question_text, args.session, args.new, stateless=cache is not None)
+    if answer is None:
+        import dotenv
+        dotenv.load_dotenv()
+        answer = ask_gemini(question_text)
+    
+    if cache is not None and answer:
+        cache.put(key, answer)
+
+def batch_main(args, use_cache):
+    """Run `ai --batch`: questions from a file or stdin, JSONL results, stats on stderr."""
+    import dotenv
+    dotenv.load_dotenv()
+    
+    try:
+        questions = read_questions(args.batch)
+    except OSError as e:
+        print(f"{RED}Error: Could not read questions: {e}{RESET}", file=sys.stderr)
+        sys.exit(1)
+    if not questions:
+        print(f"{YELLOW}No questions to ask.{RESET}", file=sys.stderr)
+        return
+    
+    try:
+        llm.get_backend()
+    except llm.MissingAPIKeyError:
+        print(f"{RED}Error: GEMINI_API_KEY environment variable not set.{RESET}", file=sys.stderr)
+        sys.exit(1)
+    
+    cache = None
+    if use_cache:
+        import ai_cache
+        cache = ai_cache.ResponseCache()
+    
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        stats = run_batch(questions, out, args.workers, args.retries, cache, args.refresh)
+    finally:
+        if args.output:
+            out.close()
+    print_batch_stats(stats)
+    if stats["failed"]:
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
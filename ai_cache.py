@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+On-disk response cache for `ai`.
+
+Answers are keyed by the normalized question, the system instruction and the
+backend/model, expire after a TTL and are evicted least-recently-used once the
+cache grows past its size limit. The cache is opt-in (`ai --cache` or
+AI_CACHE=1).
+
+Environment:
+    AI_CACHE         1 to enable caching by default
+    AI_CACHE_DIR     where the cache lives (default: ~/.cache/ai)
+    AI_CACHE_TTL     seconds an answer stays valid (default: 7 days)
+    AI_CACHE_MAX_MB  size limit before LRU eviction (default: 50)
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import sqlite3
+
+# ─────────────── Config ───────────────
+CACHE_DIR    = os.environ.get("AI_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "ai"))
+CACHE_TTL    = float(os.environ.get("AI_CACHE_TTL", 7 * 24 * 3600))
+CACHE_MAX_MB = float(os.environ.get("AI_CACHE_MAX_MB", 50))
+
+WHITESPACE_RE = re.compile(r"\s+")
+
+def normalize(question):
+    """Collapse whitespace and case so trivially different phrasings share an entry."""
+    return WHITESPACE_RE.sub(" ", question).strip().casefold()
+
+def cache_key(question, system_instruction, model):
+    """Stable key for one (question, instruction, model) combination."""
+    payload = json.dumps([normalize(question), system_instruction, model])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class ResponseCache:
+    """Size-bounded LRU cache of answers in a small sqlite database."""
+
+    def __init__(self, path=None, ttl=CACHE_TTL, max_bytes=CACHE_MAX_MB * 1024 * 1024):
+        if path is None:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            path = os.path.join(CACHE_DIR, "responses.db")
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.db = sqlite3.connect(path, timeout=5)
+        self.db.executescript("""
+            PRAGMA journal_mode = WAL;
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY, answer TEXT, size INTEGER, created REAL, accessed REAL
+            );
+            CREATE INDEX IF NOT EXISTS responses_accessed ON responses(accessed);
+        """)
+
+    def get(self, key):
+        """Return the cached answer, or None if missing or expired."""
+        row = self.db.execute("SELECT answer, created FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        answer, created = row
+        now = time.time()
+        with self.db:
+            if now - created > self.ttl:
+                self.db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            self.db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+        return answer
+
+    def put(self, key, answer):
+        """Store an answer and evict the least recently used entries past the size limit."""
+        now = time.time()
+        size = len(answer.encode("utf-8"))
+        with self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO responses (key, answer, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, answer, size, now, now),
+            )
+            self.db.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl,))
+            total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total > self.max_bytes:
+                excess = total - self.max_bytes
+                for old_key, old_size in self.db.execute(
+                    "SELECT key, size FROM responses ORDER BY accessed"
+                ).fetchall():
+                    if excess <= 0:
+                        break
+                    self.db.execute("DELETE FROM responses WHERE key = ?", (old_key,))
+                    excess -= old_size
+
+    def close(self):
+        self.db.close()
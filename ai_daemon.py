@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Background daemon for `ai`.
+
+Keeps one warm LLM client (and its connection pool) alive and remembers the
+conversation of each session, so `ai` only has to start a thin client and
+talk to it over a Unix socket. `ai` falls back to answering in-process when
+the daemon is not running.
+
+    python ai_daemon.py start | stop | status | serve
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import socket
+import threading
+import subprocess
+import socketserver
+
+import llm
+from ai import SOCKET_PATH, SYSTEM_INSTRUCTION, RESET, RED, GREEN, YELLOW, CYAN
+
+# ─────────────── Config ───────────────
+MAX_TURNS   = 20       # question/answer pairs remembered per session
+SESSION_TTL = 6 * 3600 # forget sessions idle for this many seconds
+LOG_FILE    = SOCKET_PATH + ".log"
+
+# ─────────────── Sessions ───────────────
+class SessionStore:
+    """Thread-safe conversation history per session id."""
+
+    def __init__(self, max_turns=MAX_TURNS, ttl=SESSION_TTL):
+        self.max_turns = max_turns
+        self.ttl = ttl
+        self._sessions = {}  # id -> (last used, [turn, ...])
+        self._lock = threading.Lock()
+
+    def history(self, session, reset=False):
+        """Return a copy of the session's turns (oldest first)."""
+        with self._lock:
+            self._expire()
+            if reset:
+                self._sessions.pop(session, None)
+            _, turns = self._sessions.get(session, (0, []))
+            return list(turns)
+
+    def append(self, session, question, answer):
+        """Record one exchange, keeping only the most recent MAX_TURNS."""
+        with self._lock:
+            _, turns = self._sessions.get(session, (0, []))
+            turns = turns + [{"role": "user", "text": question}, {"role": "model", "text": answer}]
+            self._sessions[session] = (time.time(), turns[-2 * self.max_turns:])
+
+    def __len__(self):
+        with self._lock:
+            return len(self._sessions)
+
+    def _expire(self):
+        cutoff = time.time() - self.ttl
+        for session in [s for s, (used, _) in self._sessions.items() if used < cutoff]:
+            del self._sessions[session]
+
+# ─────────────── Server ───────────────
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path, backend):
+        self.backend = backend
+        self.sessions = SessionStore()
+        self.started = time.time()
+        super().__init__(path, RequestHandler)
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    """One JSON request line in, JSON lines out."""
+
+    def send(self, message):
+        self.wfile.write((json.dumps(message) + "\n").encode("utf-8"))
+        self.wfile.flush()
+
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline())
+        except ValueError:
+            return self.send({"error": "malformed request"})
+
+        command = request.get("command", "ask")
+        if command == "ping":
+            return self.send({
+                "ok": True,
+                "pid": os.getpid(),
+                "backend": self.server.backend.name,
+                "model": self.server.backend.model,
+                "sessions": len(self.server.sessions),
+                "uptime": time.time() - self.server.started,
+            })
+        if command == "shutdown":
+            self.send({"ok": True})
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+            return
+        if command != "ask":
+            return self.send({"error": f"unknown command '{command}'"})
+
+        session = request.get("session") or "default"
+        question = request["question"]
+        stateless = request.get("stateless", False)
+        history = [] if stateless else self.server.sessions.history(session, reset=request.get("reset", False))
+        parts = []
+        try:
+            for chunk in self.server.backend.generate_stream(
+                question,
+                system_instruction=SYSTEM_INSTRUCTION,
+                history=history,
+            ):
+                parts.append(chunk)
+                self.send({"chunk": chunk})
+        except (BrokenPipeError, ConnectionResetError):
+            return  # client went away (Ctrl+C); don't record a half answer
+        except Exception as e:
+            return self.send({"error": str(e)})
+
+        if not stateless:
+            self.server.sessions.append(session, question, "".join(parts))
+        self.send({"done": True})
+
+# ─────────────── Control ───────────────
+def request(message, timeout=2.0):
+    """Send one control message to the daemon; returns the reply or None if unreachable."""
+    if not os.path.exists(SOCKET_PATH):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(SOCKET_PATH)
+        sock.sendall((json.dumps(message) + "\n").encode("utf-8"))
+        with sock.makefile("r", encoding="utf-8") as stream:
+            return json.loads(stream.readline())
+    except (OSError, ValueError):
+        return None
+    finally:
+        sock.close()
+
+def load_backend():
+    """The model backend from the environment, or None after printing ai's missing-key message."""
+    import dotenv
+
+    dotenv.load_dotenv()
+    try:
+        return llm.get_backend()
+    except llm.MissingAPIKeyError:
+        print(f"{RED}Error: GEMINI_API_KEY environment variable not set.{RESET}")
+        print("Please set this environment variable with your API key.")
+        return None
+
+def serve():
+    """Run the daemon in the foreground until told to stop."""
+    backend = load_backend()
+    if backend is None:
+        sys.exit(1)
+
+    if os.path.exists(SOCKET_PATH):
+        if request({"command": "ping"}):
+            print(f"{YELLOW}Daemon already running on {SOCKET_PATH}{RESET}")
+            return
+        os.unlink(SOCKET_PATH)  # stale socket from a crashed daemon
+
+    old_umask = os.umask(0o077)  # socket readable by this user only
+    try:
+        server = DaemonServer(SOCKET_PATH, backend)
+    finally:
+        os.umask(old_umask)
+
+    print(f"{GREEN}ai daemon listening on {SOCKET_PATH} ({backend.name}, {backend.model}){RESET}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(SOCKET_PATH):
+            os.unlink(SOCKET_PATH)
+
+def start():
+    """Launch the daemon in the background and wait until it answers."""
+    if request({"command": "ping"}):
+        print(f"{YELLOW}Daemon already running on {SOCKET_PATH}{RESET}")
+        return True
+    if load_backend() is None:
+        return False  # fail here rather than in the detached daemon, where nobody sees it
+
+    with open(LOG_FILE, "a", encoding="utf-8") as log:
+        subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "serve"],
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=log,
+            cwd=os.getcwd(),
+            start_new_session=True,
+        )
+
+    deadline = time.time() + 10
+    while time.time() < deadline:
+        status = request({"command": "ping"})
+        if status:
+            print(f"{GREEN}Daemon started (pid {status['pid']}, {status['backend']}/{status['model']}){RESET}")
+            return True
+        time.sleep(0.1)
+    print(f"{RED}Daemon did not come up; see {LOG_FILE}{RESET}")
+    return False
+
+def main():
+    parser = argparse.ArgumentParser(description="Background daemon that keeps ai's model client warm")
+    parser.add_argument("command", choices=("start", "stop", "status", "serve"), help="What to do")
+    args = parser.parse_args()
+
+    if not hasattr(socket, "AF_UNIX"):
+        print(f"{RED}Error: Unix sockets are not available on this platform; ai runs in-process.{RESET}")
+        sys.exit(1)
+
+    if args.command == "serve":
+        serve()
+    elif args.command == "start":
+        sys.exit(0 if start() else 1)
+    elif args.command == "stop":
+        if request({"command": "shutdown"}):
+            print(f"{GREEN}Daemon stopped.{RESET}")
+        else:
+            print(f"{YELLOW}No daemon running.{RESET}")
+    else:
+        status = request({"command": "ping"})
+        if not status:
+            print(f"{YELLOW}No daemon running — ai answers in-process.{RESET}")
+            sys.exit(1)
+        print(f"{CYAN}Daemon pid {status['pid']} on {SOCKET_PATH}{RESET}")
+        print(f"  backend: {status['backend']} ({status['model']})")
+        print(f"  sessions: {status['sessions']}")
+        print(f"  uptime: {status['uptime'] / 60:.1f} min")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the repository extraction engines.
+
+Generates synthetic git repositories (many small files, a few large ones,
+binary-heavy, deep trees, a long .extractignore) and runs every
+`extract_contents` variant over them in a fresh process, reporting
+throughput (MB/s, files/s), peak RSS and output size. Results can be saved
+and compared against a previous run to catch regressions.
+
+    python bench_extract.py [--profiles many-small deep-tree] [--scale 2] [--save base.json] [--baseline base.json]
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import contextlib
+import subprocess
+
+# ─────────────── Paths & Config ───────────────
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# name -> (module, function, writes the output file itself, extra keyword arguments)
+ENGINES = {
+    "extract":      ("extract", "extract_git_contents", True, {}),
+    "ghextract":    ("ghextract", "extract_git_contents", True, {}),
+    "ghextractall": ("ghextractall", "extract_contents", False, {}),
+    "summarize":    ("summarize", "extract_contents", False, {}),
+    "ghsummarize":  ("ghsummarize", "extract_contents", False, {}),
+    "skeleton":     ("summarize", "extract_contents", False, {"skeleton": True}),
+}
+
+# name -> (text files, text KB each, binary files, binary KB each, directory depth, ignore patterns)
+PROFILES = {
+    "many-small":   (2000, 1, 0, 0, 2, 0),
+    "few-large":    (12, 900, 0, 0, 1, 0),
+    "binary-heavy": (100, 4, 300, 32, 2, 0),
+    "deep-tree":    (600, 2, 0, 0, 12, 0),
+    "big-ignore":   (800, 2, 0, 0, 3, 400),
+}
+
+THROUGHPUT_TOLERANCE = 0.25  # MB/s lower than baseline by more than this fraction counts as a regression
+RSS_TOLERANCE        = 0.25  # peak RSS higher than baseline by more than this fraction counts as a regression
+
+WORDS = ("def", "return", "class", "import", "self", "value", "config", "request", "for", "in",
+         "if", "else", "None", "data", "result", "path", "file", "items", "index", "=", "(", ")")
+
+# ─────────────── Colour Codes ───────────────
+RESET = "\033[0m"
+BOLD = "\033[1m"
+RED = "\033[31m"
+GREEN = "\033[32m"
+CYAN = "\033[36m"
+
+# ─────────────── Synthetic Repos ───────────────
+def text_blob(rng, size):
+    """Roughly `size` bytes of code-shaped text."""
+    lines, total = [], 0
+    while total < size:
+        indent = "    " * rng.randint(0, 3)
+        line = indent + " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 12)))
+        lines.append(line)
+        total += len(line) + 1
+    return "\n".join(lines) + "\n"
+
+def nested_dir(rng, depth):
+    """A relative directory `depth` levels deep (at least one level)."""
+    return os.path.join(*(f"d{rng.randint(0, 3)}" for _ in range(max(1, depth))))
+
+def generate_repo(path, profile, scale=1.0, seed=0):
+    """Create a git repo for a profile under path; returns (tracked files, tracked bytes)."""
+    text_files, text_kb, binary_files, binary_kb, depth, patterns = PROFILES[profile]
+    rng = random.Random(f"{seed}:{profile}")
+    os.makedirs(path)
+    files = []
+    for i in range(int(text_files * scale)):
+        name = os.path.join(nested_dir(rng, depth), f"module_{i}.py")
+        files.append((name, text_blob(rng, text_kb * 1024).encode("utf-8")))
+    for i in range(int(binary_files * scale)):
+        name = os.path.join(nested_dir(rng, depth), f"asset_{i}.png")
+        files.append((name, b"\x89PNG\r\n\x1a\n" + rng.randbytes(binary_kb * 1024)))
+    if patterns:
+        # Mostly misses, so every file is checked against the whole list
+        lines = [f"generated_{i}/*.py" for i in range(patterns - 1)] + ["module_1?.py"]
+        files.append((".extractignore", "\n".join(lines).encode("utf-8")))
+
+    for name, data in files:
+        full = os.path.join(path, name)
+        os.makedirs(os.path.dirname(full), exist_ok=True)
+        with open(full, "wb") as f:
+            f.write(data)
+    subprocess.run(["git", "init", "-q", path], check=True)
+    subprocess.run(["git", "-C", path, "add", "-A"], check=True)
+    return len(files), sum(len(data) for _, data in files)
+
+# ─────────────── Harness ───────────────
+def peak_rss_kb():
+    """This process's peak RSS in KB, or None where the platform can't tell."""
+    try:
+        # ru_maxrss survives exec on Linux and would report the parent's peak
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+def run_child(engine, repo, output):
+    """Run one engine in this (fresh) process and print its timings as JSON."""
+    import importlib
+
+    module_name, func_name, writes_output, kwargs = ENGINES[engine]
+    sys.path.insert(0, SCRIPT_DIR)
+    func = getattr(importlib.import_module(module_name), func_name)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(open(os.devnull, "w")):
+        if writes_output:
+            func(repo, output, **kwargs)
+        else:
+            with open(output, "w", encoding="utf-8") as f:
+                f.write(func(repo, **kwargs))
+    wall = time.perf_counter() - start
+    print(json.dumps({"wall": wall, "rss_kb": peak_rss_kb()}))
+
+def measure(engine, repo, output, runs):
+    """Best wall time and max peak RSS of `runs` fresh-process runs."""
+    walls, rss = [], []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", engine, repo, output],
+            stdout=subprocess.PIPE, text=True, check=True,
+            env={**os.environ, "GITHUB_TOKEN": os.environ.get("GITHUB_TOKEN", "extract-benchmark")},
+        )
+        row = json.loads(result.stdout.splitlines()[-1])
+        walls.append(row["wall"])
+        rss.append(row["rss_kb"])
+    return min(walls), None if None in rss else max(rss)
+
+# ─────────────── Report ───────────────
+def compare(results, baseline, tolerance, rss_tolerance=RSS_TOLERANCE):
+    """Print changes against a baseline; returns the list of regressions."""
+    regressions = []
+    print(f"\n{BOLD}Against baseline{RESET}")
+    for profile, engines in results.items():
+        for engine, row in engines.items():
+            base = baseline.get(profile, {}).get(engine)
+            if not base:
+                continue
+            speed = (row["mb_s"] - base["mb_s"]) / base["mb_s"] if base["mb_s"] else 0
+            rss = (row["rss_kb"] - base["rss_kb"]) / base["rss_kb"] if row["rss_kb"] and base["rss_kb"] else 0
+            output = row["output_bytes"] - base["output_bytes"]
+            regressed = speed < -tolerance or rss > rss_tolerance
+            colour = RED if regressed else GREEN
+            print(f"  {profile:<13} {engine:<13} {colour}MB/s {speed:+.0%}, RSS {rss:+.0%}, "
+                  f"output {output:+d} B{RESET}")
+            if regressed:
+                regressions.append(f"{profile}/{engine}")
+    return regressions
+
+def main():
+    if len(sys.argv) == 5 and sys.argv[1] == "--child":
+        return run_child(*sys.argv[2:])
+
+    parser = argparse.ArgumentParser(description="Benchmark the extraction engines on synthetic git repos")
+    parser.add_argument("--profiles", nargs="+", choices=PROFILES, help="Repo shapes to generate (default: all)")
+    parser.add_argument("--engines", nargs="+", choices=ENGINES, help="Engines to run (default: all)")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every profile's file counts")
+    parser.add_argument("--runs", "-n", type=int, default=3, help="Fresh-process runs per engine (default: 3)")
+    parser.add_argument("--save", metavar="FILE", help="Write the results as JSON")
+    parser.add_argument("--baseline", metavar="FILE", help="Compare against results saved with --save")
+    parser.add_argument("--tolerance", type=float, default=THROUGHPUT_TOLERANCE,
+                        help=f"Allowed throughput drop against the baseline (default: {THROUGHPUT_TOLERANCE:.0%}%)")
+    parser.add_argument("--rss-tolerance", type=float, default=RSS_TOLERANCE,
+                        help=f"Allowed peak RSS growth against the baseline (default: {RSS_TOLERANCE:.0%}%)")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="bench_extract_") as workdir:
+        print(f"{BOLD}{'profile':<13} {'engine':<13} {'files':>6} {'input MB':>9} {'MB/s':>8} "
+              f"{'files/s':>9} {'RSS MB':>7} {'output MB':>10}{RESET}")
+        for profile in args.profiles or PROFILES:
+            repo = os.path.join(workdir, profile)
+            files, size = generate_repo(repo, profile, args.scale)
+            results[profile] = {}
+            for engine in args.engines or ENGINES:
+                output = os.path.join(workdir, f"{profile}.{engine}.txt")
+                wall, rss_kb = measure(engine, repo, output, args.runs)
+                row = {
+                    "files": files,
+                    "input_bytes": size,
+                    "wall": wall,
+                    "mb_s": size / (1024 * 1024) / wall,
+                    "files_s": files / wall,
+                    "rss_kb": rss_kb,
+                    "output_bytes": os.path.getsize(output),
+                }
+                results[profile][engine] = row
+                rss = f"{rss_kb / 1024:>7.1f}" if rss_kb else f"{'-':>7}"
+                print(f"{profile:<13} {engine:<13} {files:>6} {size / (1024 * 1024):>9.1f} {row['mb_s']:>8.1f} "
+                      f"{row['files_s']:>9.0f} {rss} {row['output_bytes'] / (1024 * 1024):>10.1f}", flush=True)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n{GREEN}Saved results to {args.save}{RESET}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance, args.rss_tolerance)
+        if regressions:
+            print(f"\n{RED}Regressions: {', '.join(regressions)}{RESET}")
+            sys.exit(1)
+        print(f"\n{CYAN}No regressions against {args.baseline}.{RESET}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Offline throughput benchmark for the LLM pipelines.
+
+Runs ai, summarize and ghsummarize end to end against the stub backend from
+llm.py, so the numbers reflect our own extraction/prompting/formatting cost
+plus a simulated model, without spending any API quota.
+
+    python bench_llm.py --pipeline all --iterations 20 --concurrency 4 --latency 0.3 --tps 150
+"""
+
+import io
+import os
+import sys
+import time
+import argparse
+import tempfile
+import statistics
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
+
+os.environ.setdefault("GITHUB_TOKEN", "offline-benchmark")
+
+import llm
+
+# ─────────────── Paths & Config ───────────────
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PIPELINES  = ("ai", "summarize", "ghsummarize")
+
+# ─────────────── Colour Codes ───────────────
+RESET = "\033[0m"
+BOLD = "\033[1m"
+RED = "\033[31m"
+GREEN = "\033[32m"
+CYAN = "\033[36m"
+
+# ─────────────── Pipelines ───────────────
+def run_ai(i, repo_path):
+    """One `ai` question, including Markdown formatting of the answer."""
+    import ai
+    return ai.ask_gemini(f"Benchmark question #{i}: how does a {i % 7}-way merge work?") is not None
+
+def run_summarize(i, repo_path):
+    """Extract a local repo and summarize it, as `summarize <repo>` does."""
+    import summarize
+    contents = summarize.extract_contents(repo_path)
+    with tempfile.TemporaryDirectory() as td:
+        ok, _ = summarize.summarize_with_gemini("bench", f"repo{i}", contents,
+                                                output_file=os.path.join(td, "summary.md"))
+    return ok
+
+def run_ghsummarize(i, repo_path):
+    """Full ghsummarize per-repo path (HEAD lookup, extract, summarize, write)."""
+    import ghsummarize
+    with tempfile.TemporaryDirectory() as td:
+        ghsummarize.summarize_repo("bench", f"repo{i}", repo_path, os.path.join(td, "summary.md"))
+    return True
+
+RUNNERS = {"ai": run_ai, "summarize": run_summarize, "ghsummarize": run_ghsummarize}
+
+# ─────────────── Harness ───────────────
+def timed(runner, i, repo_path):
+    """Run one job; returns (ok, seconds)."""
+    start = time.perf_counter()
+    try:
+        ok = runner(i, repo_path)
+    except Exception:
+        ok = False
+    return ok, time.perf_counter() - start
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+def bench_pipeline(name, args):
+    """Run one pipeline `iterations` times and return a result row."""
+    backend = llm.StubBackend(
+        latency=args.latency,
+        tokens_per_second=args.tps,
+        output_tokens=args.output_tokens,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    llm.set_backend(backend)
+
+    runner = RUNNERS[name]
+    start  = time.perf_counter()
+    # The tools print progress and answers; keep the report readable.
+    with contextlib.redirect_stdout(io.StringIO()):
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            results = list(executor.map(lambda i: timed(runner, i, args.repo), range(args.iterations)))
+    wall = time.perf_counter() - start
+    llm.set_backend(None)
+
+    latencies = [t for _, t in results]
+    stats     = backend.stats
+    return {
+        "pipeline": name,
+        "jobs": len(results),
+        "failed": sum(1 for ok, _ in results if not ok),
+        "wall": wall,
+        "jobs_per_s": len(results) / wall if wall else 0,
+        "p50": statistics.median(latencies),
+        "p95": percentile(latencies, 95),
+        "input_tokens": stats["input_tokens"],
+        "output_tokens": stats["output_tokens"],
+        "output_tps": stats["output_tokens"] / wall if wall else 0,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline throughput benchmark for the LLM pipelines")
+    parser.add_argument("--pipeline", choices=PIPELINES + ("all",), default="all", help="Pipeline to run")
+    parser.add_argument("--repo", default=SCRIPT_DIR,
+                        help="Local git repo used by summarize/ghsummarize (default: this tools repo)")
+    parser.add_argument("--iterations", "-n", type=int, default=20, help="Jobs per pipeline (default: 20)")
+    parser.add_argument("--concurrency", "-j", type=int, default=4, help="Parallel jobs (default: 4)")
+    parser.add_argument("--latency", type=float, default=0.2, help="Stub time-to-first-token in s (default: 0.2)")
+    parser.add_argument("--tps", type=float, default=200, help="Stub output tokens per second (default: 200)")
+    parser.add_argument("--output-tokens", type=int, default=400, help="Stub response length (default: 400)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of stub calls that fail")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for error injection")
+    args = parser.parse_args()
+
+    if not os.path.exists(os.path.join(args.repo, ".git")):
+        print(f"{RED}Error: '{args.repo}' is not a git repository{RESET}")
+        sys.exit(1)
+
+    names = PIPELINES if args.pipeline == "all" else (args.pipeline,)
+    print(f"{CYAN}Stub: latency {args.latency}s, {args.tps:g} tok/s, {args.output_tokens} tokens, "
+          f"error rate {args.error_rate:g} — {args.iterations} jobs × {args.concurrency} workers{RESET}\n")
+
+    print(f"{BOLD}{'pipeline':<12} {'jobs':>5} {'failed':>6} {'wall s':>8} {'jobs/s':>8} "
+          f"{'p50 s':>7} {'p95 s':>7} {'in tok':>9} {'out tok':>8} {'out tok/s':>9}{RESET}")
+    for name in names:
+        r = bench_pipeline(name, args)
+        colour = RED if r["failed"] else GREEN
+        print(f"{r['pipeline']:<12} {r['jobs']:>5} {colour}{r['failed']:>6}{RESET} {r['wall']:>8.2f} "
+              f"{r['jobs_per_s']:>8.2f} {r['p50']:>7.3f} {r['p95']:>7.3f} {r['input_tokens']:>9} "
+              f"{r['output_tokens']:>8} {r['output_tps']:>9.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Benchmark for ai.format_markdown on large responses.
+
+Compares the single-pass renderer against the regex cascade it replaced on
+synthetic Markdown of increasing size, reporting time, time per KB (flat means
+linear) and peak traced memory, also as a multiple of the input size. Python
+has no counter of allocations made (tracemalloc and sys.getallocatedblocks
+only see live blocks), so the peak is the memory figure reported.
+
+    python bench_markdown.py [--sizes 100 200 400 800] [--repeat 5]
+"""
+
+import re
+import time
+import random
+import argparse
+import tracemalloc
+
+from ai import (format_markdown, RESET, BOLD, RED, GREEN, YELLOW, BLUE,
+                MAGENTA, CYAN, WHITE)
+
+# ─────────────── Baseline ───────────────
+def legacy_format_markdown(text):
+    """The original regex cascade (about 25 re.sub passes over the whole text)."""
+    # Handle code blocks first (they need special treatment)
+    # Match fenced code blocks with language specification
+    code_block_pattern = r'```(?:\w+)?\n(.*?)```'
+    code_blocks = re.findall(code_block_pattern, text, re.DOTALL)
+    
+    # Replace code blocks with placeholders
+    placeholder_map = {}
+    for i, block in enumerate(code_blocks):
+        placeholder = f"__CODE_BLOCK_{i}__"
+        placeholder_map[placeholder] = f"{MAGENTA}{block}{RESET}"
+        text = text.replace(f"```{block}```", placeholder, 1)
+    
+    # Headers
+    text = re.sub(r'^# (.*?)$', f"{BOLD}{BLUE}\\1{RESET}", text, flags=re.MULTILINE)
+    text = re.sub(r'^## (.*?)$', f"{BOLD}{CYAN}\\1{RESET}", text, flags=re.MULTILINE)
+    text = re.sub(r'^### (.*?)$', f"{BOLD}{GREEN}\\1{RESET}", text, flags=re.MULTILINE)
+    text = re.sub(r'^#### (.*?)$', f"{BOLD}{YELLOW}\\1{RESET}", text, flags=re.MULTILINE)
+    text = re.sub(r'^##### (.*?)$', f"{BOLD}{MAGENTA}\\1{RESET}", text, flags=re.MULTILINE)
+    text = re.sub(r'^###### (.*?)$', f"{BOLD}{WHITE}\\1{RESET}", text, flags=re.MULTILINE)
+    
+    # Bold and Italic
+    text = re.sub(r'\*\*\*(.*?)\*\*\*', f"{BOLD}{YELLOW}\\1{RESET}", text)
+    text = re.sub(r'___(.+?)___', f"{BOLD}{YELLOW}\\1{RESET}", text)
+    text = re.sub(r'\*\*(.*?)\*\*', f"{BOLD}\\1{RESET}", text)
+    text = re.sub(r'__(.+?)__', f"{BOLD}\\1{RESET}", text)
+    text = re.sub(r'\*(.*?)\*', f"{YELLOW}\\1{RESET}", text)
+    text = re.sub(r'_(.+?)_', f"{YELLOW}\\1{RESET}", text)
+    
+    # Strikethrough
+    text = re.sub(r'~~(.*?)~~', f"{RED}\\1{RESET}", text)
+    
+    # Lists
+    text = re.sub(r'^- (.*?)$', f"{CYAN}•{RESET} \\1", text, flags=re.MULTILINE)
+    text = re.sub(r'^\* (.*?)$', f"{CYAN}•{RESET} \\1", text, flags=re.MULTILINE)
+    text = re.sub(r'^\+ (.*?)$', f"{CYAN}•{RESET} \\1", text, flags=re.MULTILINE)
+    text = re.sub(r'^(\d+)\. (.*?)$', f"{CYAN}\\1.{RESET} \\2", text, flags=re.MULTILINE)
+    
+    # Blockquotes
+    text = re.sub(r'^> (.*?)$', f"{GREEN}│{RESET} \\1", text, flags=re.MULTILINE)
+    
+    # Horizontal rules
+    text = re.sub(r'^---+$', f"{CYAN}{'─' * 50}{RESET}", text, flags=re.MULTILINE)
+    text = re.sub(r'^\*\*\*+$', f"{CYAN}{'─' * 50}{RESET}", text, flags=re.MULTILINE)
+    text = re.sub(r'^___+$', f"{CYAN}{'─' * 50}{RESET}", text, flags=re.MULTILINE)
+    
+    # Links
+    text = re.sub(r'\[(.*?)\]\((.*?)\)', f"{BLUE}\\1{RESET} ({CYAN}\\2{RESET})", text)
+    
+    # Inline code (after other formatting to avoid conflicts)
+    text = re.sub(r'`(.*?)`', f"{MAGENTA}\\1{RESET}", text)
+    
+    # Restore code blocks
+    for placeholder, content in placeholder_map.items():
+        text = text.replace(placeholder, content)
+    
+    return text
+
+# ─────────────── Input ───────────────
+WORDS = ("cache", "stream", "token", "parser", "worker", "index", "client", "server", "deploy", "build")
+
+def make_markdown(size_kb, seed=0):
+    """Synthetic LLM-style answer of roughly size_kb kilobytes."""
+    rng = random.Random(seed)
+    words = lambda n: " ".join(rng.choice(WORDS) for _ in range(n))
+    blocks = [
+        lambda: f"## {words(3).title()}\n\n",
+        lambda: f"{words(12)} **{words(2)}** and *{words(1)}* with `{words(1)}` and [{words(1)}](https://example.com/{words(1)}).\n\n",
+        lambda: "".join(f"- {words(6)} __{words(1)}__\n" for _ in range(4)) + "\n",
+        lambda: "".join(f"{i}. {words(5)} ~~{words(1)}~~\n" for i in range(1, 4)) + "\n",
+        lambda: f"> {words(10)}\n\n",
+        lambda: "```python\n" + "".join(f"{words(1)} = {words(2)!r}  # *not* emphasis\n" for _ in range(5)) + "```\n\n",
+        lambda: "---\n\n",
+    ]
+    parts, size = [], 0
+    while size < size_kb * 1024:
+        part = rng.choice(blocks)()
+        parts.append(part)
+        size += len(part)
+    return "".join(parts)
+
+# ─────────────── Harness ───────────────
+def measure(func, text, repeat):
+    """Best-of-`repeat` wall time in ms and peak traced memory in bytes."""
+    best = min(_timed(func, text) for _ in range(repeat))
+    tracemalloc.start()
+    func(text)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+def _timed(func, text):
+    start = time.perf_counter()
+    func(text)
+    return (time.perf_counter() - start) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Markdown formatting on large responses")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[100, 200, 400, 800], help="Input sizes in KB")
+    parser.add_argument("--repeat", "-n", type=int, default=5, help="Timing repetitions (default: 5)")
+    args = parser.parse_args()
+
+    print(f"{BOLD}{'size KB':>8} {'impl':<8} {'ms':>9} {'ms/KB':>8} {'peak MB':>8} {'x input':>8}{RESET}")
+    for size in args.sizes:
+        text = make_markdown(size)
+        for name, func in (("cascade", legacy_format_markdown), ("single", format_markdown)):
+            ms, peak = measure(func, text, args.repeat)
+            colour = GREEN if name == "single" else YELLOW
+            print(f"{size:>8} {colour}{name:<8}{RESET} {ms:>9.2f} {ms / size:>8.3f} {peak / (1024 * 1024):>8.2f} {peak / len(text):>8.1f}")
+
+if __name__ == "__main__":
+    main()
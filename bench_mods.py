@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Benchmark for minecraft_mod_updater against the local Modrinth stand-in.
+
+For synthetic packs of each size, runs the scan (cold and with a warm index),
+update check + dependency plan, download and backup phases and reports wall
+time, API requests, bytes transferred and peak traced memory per phase.
+Results can be saved and compared against a previous run to catch
+regressions.
+
+    python bench_mods.py [--sizes 10 100 1000] [--latency 0.02] [--save base.json] [--baseline base.json]
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import tracemalloc
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
+
+import requests  # imported up front so the first check phase doesn't pay for it
+
+import fake_modrinth
+import minecraft_mod_updater as mmu
+
+# ─────────────── Config ───────────────
+PHASES = ("scan", "scan-indexed", "check", "download", "backup")
+WALL_TOLERANCE = 0.25  # slower than baseline by more than this fraction counts as a regression...
+WALL_SLACK     = 0.05  # ...and by more than this many seconds (timer noise on short phases)
+
+# ─────────────── Colour Codes ───────────────
+RESET = "\033[0m"
+BOLD = "\033[1m"
+RED = "\033[31m"
+GREEN = "\033[32m"
+CYAN = "\033[36m"
+
+# ─────────────── Harness ───────────────
+def measure(server, func):
+    """Run one phase; returns (result, row) with wall time, requests, bytes and peak memory."""
+    server.reset_stats()
+    tracemalloc.start()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = func()
+    wall = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    stats = server.stats
+    return result, {"wall": wall, "requests": stats["requests"], "bytes": stats["bytes"],
+                    "errors": stats["errors"], "peak_mb": peak / (1024 * 1024)}
+
+def bench_pack(size, args):
+    """Benchmark every phase on a fresh pack of `size` mods; returns {phase: row}."""
+    fixtures = fake_modrinth.Fixtures(mods=size, versions=args.versions, jar_kb=args.jar_kb)
+    # The stand-in shares our process; its jars are all built here, outside the memory figures
+    server = fake_modrinth.StandInServer(fixtures, latency=args.latency, error_rate=args.error_rate).start()
+    mmu.MODRINTH_API_BASE = server.url
+    workdir = tempfile.mkdtemp(prefix="bench_mods_")
+    try:
+        mods_dir = os.path.join(workdir, "mods")
+        os.makedirs(mods_dir)
+        for filename, data in fixtures.pack(size):
+            with open(os.path.join(mods_dir, filename), "wb") as f:
+                f.write(data)
+
+        def updater():
+            return mmu.ModUpdater(mods_dir=mods_dir, backup_dir=os.path.join(workdir, "backups"),
+                                  minecraft_version=fake_modrinth.GAME_VERSION, workers=args.workers)
+
+        rows = {}
+        cold = updater()
+        _, rows["scan"] = measure(server, cold.scan_mods)
+        warm = updater()
+        _, rows["scan-indexed"] = measure(server, warm.scan_mods)
+
+        def check():
+            updates = warm.check_updates(list(warm.mods_data.items()))
+            return warm.resolve_dependencies(updates) if updates else updates
+        plan, rows["check"] = measure(server, check)
+
+        def download():
+            with ThreadPoolExecutor(max_workers=warm.workers) as executor:
+                list(executor.map(warm._apply_update, plan))
+        _, rows["download"] = measure(server, download)
+        rows["download"]["files"] = warm.update_count + warm.dependency_count
+
+        after = updater()
+        with contextlib.redirect_stdout(io.StringIO()):
+            after.scan_mods()
+        _, rows["backup"] = measure(server, after.backup_mods)
+        return rows
+    finally:
+        server.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+# ─────────────── Report ───────────────
+def compare(results, baseline, tolerance=WALL_TOLERANCE):
+    """Print changes against a baseline; returns the list of regressions."""
+    regressions = []
+    print(f"\n{BOLD}Against baseline{RESET}")
+    for size, phases in results.items():
+        for phase, row in phases.items():
+            base = baseline.get(size, {}).get(phase)
+            if not base:
+                continue
+            wall_change = (row["wall"] - base["wall"]) / base["wall"] if base["wall"] else 0
+            request_change = row["requests"] - base["requests"]
+            slower = wall_change > tolerance and row["wall"] - base["wall"] > WALL_SLACK
+            regressed = request_change > 0 or slower
+            colour = RED if regressed else GREEN
+            print(f"  {size:>5} {phase:<13} {colour}wall {wall_change:+.0%}, requests {request_change:+d}{RESET}")
+            if regressed:
+                regressions.append(f"{size}/{phase}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark minecraft_mod_updater against a local Modrinth stand-in")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000], help="Pack sizes (default: 10 100 1000)")
+    parser.add_argument("--versions", type=int, default=3, help="Releases per fixture mod (default: 3)")
+    parser.add_argument("--jar-kb", type=int, default=64, help="Fixture jar size in KB (default: 64)")
+    parser.add_argument("--latency", type=float, default=0.02, help="Stand-in latency per request in s (default: 0.02)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests failed with 503")
+    parser.add_argument("--workers", "-j", type=int, default=mmu.DEFAULT_WORKERS,
+                        help=f"Updater workers (default: {mmu.DEFAULT_WORKERS})")
+    parser.add_argument("--save", metavar="FILE", help="Write the results as JSON")
+    parser.add_argument("--baseline", metavar="FILE", help="Compare against results saved with --save")
+    parser.add_argument("--tolerance", type=float, default=WALL_TOLERANCE,
+                        help=f"Allowed wall-time slowdown against the baseline (default: {WALL_TOLERANCE:.0%}%)")
+    args = parser.parse_args()
+
+    print(f"{CYAN}Stand-in latency {args.latency}s, error rate {args.error_rate:g}, "
+          f"{args.jar_kb} KB jars, {args.workers} workers{RESET}\n")
+    print(f"{BOLD}{'mods':>5} {'phase':<13} {'wall s':>8} {'requests':>9} {'KB':>9} {'peak MB':>8}{RESET}")
+
+    results = {}
+    for size in args.sizes:
+        rows = bench_pack(size, args)
+        results[str(size)] = rows
+        for phase in PHASES:
+            row = rows[phase]
+            colour = RED if row["errors"] else ""
+            print(f"{size:>5} {phase:<13} {row['wall']:>8.3f} {colour}{row['requests']:>9}{RESET if colour else ''} "
+                  f"{row['bytes'] / 1024:>9.0f} {row['peak_mb']:>8.1f}")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n{GREEN}Saved results to {args.save}{RESET}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print(f"\n{RED}Regressions: {', '.join(regressions)}{RESET}")
+            sys.exit(1)
+        print(f"\n{CYAN}No regressions against {args.baseline}.{RESET}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for every CLI entry point.
+
+Each tool is launched several times with `python -X importtime` on the cheap
+paths (--help, summarize --extract-only) and its median wall time and import
+time are compared against a per-tool budget. Budgets are scaled by how long
+this host takes to import argparse + subprocess (which every tool needs)
+relative to the machine they were set on, so a slow host or a cold disk
+doesn't fail the gate. Exits non-zero if any tool is over budget, so it can
+run in CI.
+
+    python bench_startup.py [--runs 5] [--only ai summarize]
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+# ─────────────── Paths & Config ───────────────
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# name -> (argv after the script, import budget in ms)
+# Budgets cover our own imports on top of the interpreter's `site` import and
+# are about twice what the reference machine measures; pulling in
+# google.genai or requests costs far more than that.
+TOOLS = {
+    "ai":                    (["ai.py", "--help"], 40),
+    "summarize":             (["summarize.py", "--help"], 40),
+    "summarize-extract":     (["summarize.py", "--extract-only", SCRIPT_DIR, "-o", "{tmp}"], 45),
+    "extract":               (["extract.py", "--help"], 35),
+    "ghextract":             (["ghextract.py", "--help"], 35),
+    "ghextractall":          (["ghextractall.py", "--help"], 40),
+    "ghsummarize":           (["ghsummarize.py", "--help"], 45),
+    "ghsearch":              (["ghsearch.py", "--help"], 30),
+    "minecraft_mod_updater": (["minecraft_mod_updater.py", "--help"], 40),
+}
+
+BASELINE_CODE = "import argparse, subprocess"
+REFERENCE_BASELINE_MS = 15.0  # BASELINE_CODE's import time on the machine the budgets were set on
+
+IMPORT_LINE_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+# ─────────────── Colour Codes ───────────────
+RESET = "\033[0m"
+BOLD = "\033[1m"
+RED = "\033[31m"
+GREEN = "\033[32m"
+CYAN = "\033[36m"
+
+# ─────────────── Helpers ───────────────
+def parse_importtime(stderr):
+    """Return {top-level module: cumulative µs} from -X importtime output."""
+    modules = {}
+    for line in stderr.splitlines():
+        m = IMPORT_LINE_RE.match(line)
+        if m and not m.group(3):
+            modules[m.group(4)] = int(m.group(2))
+    return modules
+
+def own_imports_ms(modules):
+    """Total import time in ms, excluding the interpreter's `site` import."""
+    return sum(us for mod, us in modules.items() if mod != "site") / 1000
+
+def measure_baseline(runs):
+    """Median import time of BASELINE_CODE on this host, in ms."""
+    times = []
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", BASELINE_CODE],
+                                stderr=subprocess.PIPE, text=True, check=True)
+        times.append(own_imports_ms(parse_importtime(result.stderr)))
+    return statistics.median(times)
+
+def run_tool(argv):
+    """Launch one tool cold; returns (wall ms, {module: µs})."""
+    with tempfile.TemporaryDirectory() as td:
+        argv = [a.replace("{tmp}", os.path.join(td, "out.txt")) for a in argv]
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", os.path.join(SCRIPT_DIR, argv[0]), *argv[1:]],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+            cwd=td,
+            env={**os.environ, "GITHUB_TOKEN": os.environ.get("GITHUB_TOKEN", "startup-benchmark")},
+        )
+        wall = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        raise RuntimeError(f"{' '.join(argv)} exited with {result.returncode}")
+    return wall, parse_importtime(result.stderr)
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start benchmark for the CLI tools")
+    parser.add_argument("--runs", "-n", type=int, default=5, help="Launches per tool (default: 5)")
+    parser.add_argument("--only", nargs="+", choices=TOOLS, help="Only benchmark these tools")
+    parser.add_argument("--top", type=int, default=3, help="Heaviest imports to list per tool (default: 3)")
+    parser.add_argument("--no-scale", action="store_true",
+                        help="Use the budgets as-is instead of scaling them to this host's speed")
+    args = parser.parse_args()
+
+    scale = 1.0
+    if not args.no_scale:
+        baseline = measure_baseline(args.runs)
+        scale = max(1.0, baseline / REFERENCE_BASELINE_MS)
+        print(f"{CYAN}Baseline `{BASELINE_CODE}`: {baseline:.1f} ms "
+              f"(reference {REFERENCE_BASELINE_MS:.0f} ms) — budgets x{scale:.2f}{RESET}\n")
+
+    print(f"{BOLD}{'tool':<22} {'wall ms':>8} {'site ms':>8} {'ours ms':>8} {'budget':>7}  heaviest imports{RESET}")
+    over = []
+    for name in args.only or TOOLS:
+        argv, budget = TOOLS[name]
+        budget *= scale
+        walls, ours, site = [], [], []
+        for _ in range(args.runs):
+            wall, modules = run_tool(argv)
+            walls.append(wall)
+            site.append(modules.get("site", 0) / 1000)
+            ours.append(own_imports_ms(modules))
+            heaviest = sorted(((us, mod) for mod, us in modules.items() if mod != "site"), reverse=True)
+
+        imports = statistics.median(ours)
+        colour  = GREEN if imports <= budget else RED
+        if imports > budget:
+            over.append(name)
+        top = ", ".join(f"{mod} {us / 1000:.1f}" for us, mod in heaviest[:args.top])
+        print(f"{name:<22} {statistics.median(walls):>8.1f} {statistics.median(site):>8.1f} "
+              f"{colour}{imports:>8.1f}{RESET} {budget:>7.0f}  {top}")
+
+    if over:
+        print(f"\n{RED}Over budget: {', '.join(over)}{RESET}")
+        sys.exit(1)
+    print(f"\n{CYAN}All tools within their import budget.{RESET}")
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 import os
+import time
 import subprocess
 import argparse
 import fnmatch
@@ -46,19 +47,31 @@ def should_ignore_file(file_path, ignore_patterns):
 
 def list_git_files(repo_path):
     """List all files tracked by git in a repository."""
-    os.chdir(repo_path)
-    result = subprocess.run(['git', 'ls-files'], 
+    result = subprocess.run(['git', '-C', repo_path, 'ls-files'],
                            stdout=subprocess.PIPE, 
+                           stderr=subprocess.PIPE,
                            text=True, 
                            check=True)
     return result.stdout.splitlines()
 
-def extract_git_contents(repo_path, output_file):
-    """Extract all git-tracked files' names and contents to a text file."""
+def find_git_repos(root):
+    """Find every git repository under root (does not descend into a repo once found)."""
+    repos = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        if '.git' in dirnames or '.git' in filenames:
+            repos.append(dirpath)
+            dirnames.clear()
+            continue
+        # Skip hidden directories and common dependency folders
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith('.') and d != 'node_modules')
+    return repos
+
+def extract_git_contents(repo_path, output_file, verbose=True):
+    """Extract all git-tracked files' names and contents to a text file; returns the number of files written."""
     files = list_git_files(repo_path)
     ignore_patterns = load_extractignore_patterns(repo_path)
     
-    if ignore_patterns:
+    if ignore_patterns and verbose:
         print(f"Found .extractignore with {len(ignore_patterns)} patterns")
     
     filtered_files = []
@@ -67,11 +80,12 @@ def extract_git_contents(repo_path, output_file):
     for file_path in files:
         if should_ignore_file(file_path, ignore_patterns):
             ignored_files.append(file_path)
-            print(f"Ignoring: {file_path}")
+            if verbose:
+                print(f"Ignoring: {file_path}")
             continue
         filtered_files.append(file_path)
     
-    if ignored_files:
+    if ignored_files and verbose:
         print(f"Ignored {len(ignored_files)} files based on .extractignore patterns")
     
     with open(output_file, 'w', encoding='utf-8') as f:
@@ -104,14 +118,92 @@ def extract_git_contents(repo_path, output_file):
                 f.write(f"\nFilename: {file_path}\n")
                 f.write(f"Error reading file: {str(e)}\n\n")
 
+    return len(filtered_files)
+
+def output_name(repo_path, root):
+    """Per-repo output file name, unique within the workspace (a/foo and b/foo don't collide)."""
+    rel = os.path.relpath(repo_path, root)
+    if rel == '.':
+        rel = os.path.basename(os.path.abspath(repo_path))
+    return rel.replace(os.sep, '_').replace('/', '_') + '_contents.txt'
+
+def extract_repo(repo_path, output_file):
+    """Worker for --all: extract one repo; returns (repo_path, files, output bytes, error)."""
+    try:
+        files = extract_git_contents(repo_path, output_file, verbose=False)
+        return repo_path, files, os.path.getsize(output_file), None
+    except subprocess.CalledProcessError as e:
+        return repo_path, 0, 0, (e.stderr or '').strip() or str(e)
+    except Exception as e:
+        return repo_path, 0, 0, str(e) or type(e).__name__
+
+def extract_workspace(root, output_dir, workers=None):
+    """Extract every git repo under root across a process pool; returns the number of failures."""
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    repos = find_git_repos(root)
+    if not repos:
+        print(f"No git repositories found under {root}")
+        return 0
+
+    workers = workers or os.cpu_count() or 1
+    os.makedirs(output_dir, exist_ok=True)
+    print(f"Found {len(repos)} repositories under {root} — using {workers} processes.\n")
+
+    start = time.time()
+    done = failed = total_files = total_bytes = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(extract_repo, repo, os.path.join(output_dir, output_name(repo, root))): repo
+            for repo in repos
+        }
+        for future in as_completed(futures):
+            try:
+                repo, files, size, error = future.result()
+            except Exception as e:  # the worker process itself died
+                repo, files, size, error = futures[future], 0, 0, str(e) or type(e).__name__
+            done += 1
+            if error:
+                failed += 1
+                print(f"[{done}/{len(repos)}] ❌ {repo}: {error}", flush=True)
+                continue
+            total_files += files
+            total_bytes += size
+            elapsed = time.time() - start
+            print(f"[{done}/{len(repos)}] ✅ {repo} ({files} files, {size / 1024:.0f} KB) — "
+                  f"{total_files} files, {total_bytes / (1024 * 1024):.1f} MB so far, "
+                  f"{total_bytes / (1024 * 1024) / elapsed if elapsed else 0:.1f} MB/s", flush=True)
+
+    elapsed = time.time() - start
+    print(f"\nDone! {len(repos) - failed}/{len(repos)} repositories extracted to {output_dir} "
+          f"({total_files} files, {total_bytes / (1024 * 1024):.1f} MB in {elapsed:.1f}s)")
+    if failed:
+        print(f"{failed} repositories failed; see ❌ lines above")
+    return failed
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Extract all files from a git repository')
-    parser.add_argument('repo_path', help='Path to the git repository')
+    parser.add_argument('repo_path', nargs='?', help='Path to the git repository')
     parser.add_argument('--output', '-o', default='repo_contents.txt', 
                         help='Output file (default: repo_contents.txt)')
+    parser.add_argument('--all', '-a', metavar='WORKSPACE_DIR',
+                        help='Extract every git repository found under this directory')
+    parser.add_argument('--output-dir', '-d', default='.',
+                        help='Where --all writes <repo>_contents.txt files (default: current directory)')
+    parser.add_argument('--workers', '-j', type=int,
+                        help='Processes to extract with in parallel with --all (default: CPU count)')
     
     args = parser.parse_args()
     
+    if args.all:
+        if not os.path.isdir(args.all):
+            print(f"Error: Workspace directory '{args.all}' does not exist")
+            exit(1)
+        exit(1 if extract_workspace(args.all, args.output_dir, args.workers) else 0)
+    
+    if not args.repo_path:
+        parser.error('a repository path or --all WORKSPACE_DIR is required')
+    
     if not os.path.exists(args.repo_path):
         print(f"Error: Repository path '{args.repo_path}' does not exist")
         exit(1)
@@ -122,4 +214,4 @@ if __name__ == "__main__":
     
     print(f"Extracting files from {args.repo_path}...")
     extract_git_contents(args.repo_path, args.output)
-    print(f"Done! Results saved to {args.output}")
\ No newline at end of file
+    print(f"Done! Results saved to {args.output}")
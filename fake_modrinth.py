@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the parts of the Modrinth API that minecraft_mod_updater uses.
+
+Serves a deterministic set of fixture projects, versions and jars with
+configurable latency and error injection, and counts requests and bytes so
+benchmarks can measure the updater without touching the real API.
+
+    python fake_modrinth.py --mods 100 --port 8765
+    MODRINTH_API_BASE=http://127.0.0.1:8765 python minecraft_mod_updater.py --mods-dir ...
+"""
+
+import io
+import os
+import json
+import time
+import random
+import hashlib
+import zipfile
+import argparse
+import threading
+from urllib.parse import urlsplit, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# ─────────────── Config ───────────────
+GAME_VERSION = "1.20.1"
+LOADER       = "fabric"
+JAR_DATE     = (2024, 1, 1, 0, 0, 0)  # fixed zip timestamps keep jars (and hashes) stable
+
+# ─────────────── Fixtures ───────────────
+class Fixtures:
+    """Deterministic projects: mod<i> with `versions` releases, plus the libraries they need.
+
+    Every `deps_every`-th mod's newest release requires a library project that
+    isn't part of the pack, so dependency resolution has work to do. All jars
+    are built and hashed up front, so any of them (e.g. a pack written by
+    another process with --write-pack) is recognised by /version_files.
+    """
+
+    def __init__(self, mods=100, versions=3, jar_kb=64, deps_every=10, libraries=5, seed=0):
+        self.jar_kb = jar_kb
+        self.seed = seed
+        self.projects = {}  # project id -> project
+        self.versions = {}  # version id -> version
+        self.slugs = {}     # slug -> project id
+        self._jars = {}     # version id -> bytes
+        self._hashes = {}   # (algorithm, hex) -> version id
+
+        for i in range(libraries):
+            self._add_project(f"lib{i}", f"Library {i}", versions, [])
+        for i in range(mods):
+            deps = []
+            if libraries and deps_every and i % deps_every == 0:
+                deps = [{"project_id": f"P-lib{i // deps_every % libraries}", "dependency_type": "required"}]
+            self._add_project(f"mod{i}", f"Mod {i}", versions, deps)
+        for version_id in self.versions:
+            self._build(version_id)
+
+    def _add_project(self, slug, title, versions, latest_deps):
+        project_id = f"P-{slug}"
+        version_ids = []
+        for n in range(1, versions + 1):
+            version_id = f"V-{slug}-{n}"
+            filename = f"{slug}-{n}.0.jar"
+            self.versions[version_id] = {
+                "id": version_id,
+                "project_id": project_id,
+                "name": f"{title} {n}.0",
+                "version_number": f"{n}.0",
+                "loaders": [LOADER],
+                "game_versions": [GAME_VERSION],
+                "date_published": f"2024-01-{n:02d}T00:00:00Z",
+                "dependencies": list(latest_deps) if n == versions else [],
+                "files": [{"filename": filename, "primary": True, "url": None, "hashes": None}],
+            }
+            version_ids.append(version_id)
+        self.projects[project_id] = {
+            "id": project_id,
+            "slug": slug,
+            "title": title,
+            "project_type": "mod",
+            "loaders": [LOADER],
+            "game_versions": [GAME_VERSION],
+            "versions": version_ids,
+        }
+        self.slugs[slug] = project_id
+
+    def _build(self, version_id):
+        """Build a version's jar and register its hashes."""
+        version = self.versions[version_id]
+        slug = self.projects[version["project_id"]]["slug"]
+        rng = random.Random(f"{self.seed}:{version_id}")
+        buf = io.BytesIO()
+        with zipfile.ZipFile(buf, "w", zipfile.ZIP_STORED) as z:
+            meta = {"id": slug, "name": self.projects[version["project_id"]]["title"],
+                    "version": version["version_number"]}
+            z.writestr(zipfile.ZipInfo("fabric.mod.json", JAR_DATE), json.dumps(meta))
+            z.writestr(zipfile.ZipInfo("data.bin", JAR_DATE), rng.randbytes(self.jar_kb * 1024))
+        data = buf.getvalue()
+        sha1, sha512 = hashlib.sha1(data).hexdigest(), hashlib.sha512(data).hexdigest()
+        self._jars[version_id] = data
+        self._hashes[("sha1", sha1)] = version_id
+        self._hashes[("sha512", sha512)] = version_id
+        version["files"][0]["hashes"] = {"sha1": sha1, "sha512": sha512}
+        version["files"][0]["size"] = len(data)
+
+    def jar(self, version_id):
+        """The jar bytes for a version."""
+        return self._jars[version_id]
+
+    def version(self, version_id, base_url):
+        """A version as the API returns it (file URL and hashes filled in)."""
+        version = dict(self.versions[version_id])
+        file = dict(version["files"][0])
+        file["url"] = f"{base_url}/download/{version_id}/{file['filename']}"
+        version["files"] = [file]
+        return version
+
+    def by_hash(self, algorithm, digest):
+        return self._hashes.get((algorithm, digest))
+
+    def latest(self, project_id, loaders=None, game_versions=None):
+        """Newest version id of a project matching the filters, or None."""
+        for version_id in reversed(self.projects[project_id]["versions"]):
+            version = self.versions[version_id]
+            if loaders and not set(loaders) & set(version["loaders"]):
+                continue
+            if game_versions and not set(game_versions) & set(version["game_versions"]):
+                continue
+            return version_id
+        return None
+
+    def pack(self, count, release=1):
+        """(filename, bytes) of `release` for the first `count` mods — an installed pack to update."""
+        pack = []
+        for i in range(count):
+            version_id = f"V-mod{i}-{release}"
+            pack.append((self.versions[version_id]["files"][0]["filename"], self.jar(version_id)))
+        return pack
+
+# ─────────────── Server ───────────────
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, fixtures, port=0, latency=0.0, error_rate=0.0, seed=0):
+        self.fixtures = fixtures
+        self.latency = latency
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "bytes": 0, "errors": 0, "endpoints": {}}
+        super().__init__(("127.0.0.1", port), Handler)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def record(self, endpoint, size, error=False):
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats["bytes"] += size
+            self.stats["errors"] += error
+            self.stats["endpoints"][endpoint] = self.stats["endpoints"].get(endpoint, 0) + 1
+
+    def reset_stats(self):
+        with self._lock:
+            self.stats = {"requests": 0, "bytes": 0, "errors": 0, "endpoints": {}}
+
+    def should_fail(self):
+        with self._lock:
+            return self.error_rate and self._rng.random() < self.error_rate
+
+    def start(self):
+        """Serve in a background thread; returns self."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+
+    def log_message(self, *args):
+        pass
+
+    # ── plumbing ──
+    def _reply(self, endpoint, status, body=b"", content_type="application/json", headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.record(endpoint, len(body), error=status >= 500)
+
+    def _json(self, endpoint, payload):
+        body = json.dumps(payload).encode("utf-8")
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            return self._reply(endpoint, 304, headers={"ETag": etag})
+        self._reply(endpoint, 200, body, headers={"ETag": etag, "Cache-Control": "max-age=300"})
+
+    def _not_found(self, endpoint):
+        self._reply(endpoint, 404, json.dumps({"error": "not_found"}).encode("utf-8"))
+
+    def _begin(self, endpoint):
+        """Apply latency and error injection; returns False if the request was failed."""
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        if self.server.should_fail():
+            self._reply(endpoint, 503, json.dumps({"error": "injected"}).encode("utf-8"))
+            return False
+        return True
+
+    # ── GET ──
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        path = [p for p in parts.path.split("/") if p]
+        query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+        fx, base = self.server.fixtures, self.server.url
+
+        if path[:1] == ["download"] and len(path) == 3:
+            endpoint = "download"
+        elif path[:1] == ["project"] and len(path) == 3 and path[2] == "version":
+            endpoint = "project/version"
+        else:
+            endpoint = "/".join(path[:1]) or "root"
+        if not self._begin(endpoint):
+            return
+
+        if endpoint == "download":
+            if path[1] not in fx.versions:
+                return self._not_found(endpoint)
+            data = fx.jar(path[1])
+            start = 0
+            byte_range = self.headers.get("Range", "")
+            if byte_range.startswith("bytes="):
+                start = int(byte_range[6:].split("-")[0] or 0)
+                if start >= len(data):
+                    return self._reply(endpoint, 416, content_type="application/java-archive")
+                return self._reply(endpoint, 206, data[start:], "application/java-archive",
+                                   {"Content-Range": f"bytes {start}-{len(data) - 1}/{len(data)}"})
+            return self._reply(endpoint, 200, data, "application/java-archive")
+
+        if endpoint in ("project", "project/version") and len(path) >= 2:
+            project_id = path[1] if path[1] in fx.projects else fx.slugs.get(path[1])
+            if project_id is None:
+                return self._not_found(endpoint)
+            if endpoint == "project":
+                return self._json(endpoint, fx.projects[project_id])
+            game_versions = json.loads(query["game_versions"]) if "game_versions" in query else None
+            loaders = json.loads(query["loaders"]) if "loaders" in query else None
+            versions = [fx.version(v, base) for v in reversed(fx.projects[project_id]["versions"])
+                        if (not game_versions or set(game_versions) & set(fx.versions[v]["game_versions"]))
+                        and (not loaders or set(loaders) & set(fx.versions[v]["loaders"]))]
+            return self._json(endpoint, versions)
+
+        if endpoint == "projects":
+            ids = json.loads(query.get("ids", "[]"))
+            return self._json(endpoint, [fx.projects[i] for i in ids if i in fx.projects])
+
+        if endpoint == "versions":
+            ids = json.loads(query.get("ids", "[]"))
+            return self._json(endpoint, [fx.version(i, base) for i in ids if i in fx.versions])
+
+        if endpoint == "search":
+            term = query.get("query", "").lower()
+            limit = int(query.get("limit", 10))
+            hits = [{"project_id": p["id"], "slug": p["slug"], "title": p["title"]}
+                    for p in fx.projects.values() if term in p["slug"] or term in p["title"].lower()]
+            return self._json(endpoint, {"hits": hits[:limit], "total_hits": len(hits)})
+
+        self._not_found(endpoint)
+
+    # ── POST ──
+    def do_POST(self):
+        path = urlsplit(self.path).path.strip("/")
+        endpoint = path
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        if not self._begin(endpoint):
+            return
+        fx, base = self.server.fixtures, self.server.url
+        algorithm = body.get("algorithm", "sha1")
+
+        if path not in ("version_files", "version_files/update"):
+            return self._not_found(endpoint)
+        result = {}
+        for digest in body.get("hashes", []):
+            version_id = fx.by_hash(algorithm, digest)
+            if version_id is None:
+                continue
+            if path == "version_files/update":
+                project_id = fx.versions[version_id]["project_id"]
+                version_id = fx.latest(project_id, body.get("loaders"), body.get("game_versions"))
+                if version_id is None:
+                    continue
+            result[digest] = fx.version(version_id, base)
+        self._json(endpoint, result)
+
+# ─────────────── Main ───────────────
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the Modrinth API")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on (default: 8765)")
+    parser.add_argument("--mods", type=int, default=100, help="Fixture mods to serve (default: 100)")
+    parser.add_argument("--versions", type=int, default=3, help="Releases per mod (default: 3)")
+    parser.add_argument("--jar-kb", type=int, default=64, help="Size of each fixture jar in KB (default: 64)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument("--write-pack", metavar="DIR", help="Write release 1 of every mod into DIR and exit")
+    args = parser.parse_args()
+
+    fixtures = Fixtures(mods=args.mods, versions=args.versions, jar_kb=args.jar_kb)
+    if args.write_pack:
+        os.makedirs(args.write_pack, exist_ok=True)
+        for filename, data in fixtures.pack(args.mods):
+            with open(os.path.join(args.write_pack, filename), "wb") as f:
+                f.write(data)
+        print(f"Wrote {args.mods} jars to {args.write_pack}")
+        return
+
+    server = StandInServer(fixtures, args.port, args.latency, args.error_rate)
+    print(f"Modrinth stand-in on {server.url} ({args.mods} mods, latency {args.latency}s, "
+          f"error rate {args.error_rate:g})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"{server.stats['requests']} requests, {server.stats['bytes'] / 1024:.0f} KB served")
+
+if __name__ == "__main__":
+    main()
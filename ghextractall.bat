@@ -1,9 +1,4 @@
 @echo off
-
-if "%~1" neq "" (
-  echo This script doesn’t take args; just make sure GITHUB_TOKEN and GEMINI_API_KEY are set.
-  pause
-  exit /b
-)
-python "%~dp0ghextractall.py"
+:: Make sure GITHUB_TOKEN is set. Pass --dry-run to preview the schedule.
+python "%~dp0ghextractall.py" %*
 pause
\ No newline at end of file
@@ -2,12 +2,11 @@
 # filepath: c:\Tools\ghextractall.py
 import os
 import re
+import argparse
 import tempfile
 import subprocess
-import requests
-import dotenv
 
-dotenv.load_dotenv()
+from scheduling import DEFAULT_WORKERS, ORDERS, order_repos, print_schedule
 
 # ─────────────── Paths & Config ───────────────
 SCRIPT_DIR        = os.path.dirname(os.path.abspath(__file__))
@@ -15,7 +14,6 @@ IGNORE_FILE       = os.path.join(SCRIPT_DIR, ".ignore")
 OWNER_IGNORE_FILE = os.path.join(SCRIPT_DIR, ".ownerignore")
 BRANCH_FILE       = os.path.join(SCRIPT_DIR, ".branch")
 
-GITHUB_TOKEN      = os.environ["GITHUB_TOKEN"]
 
 OUTPUT_DIR        = os.path.join(SCRIPT_DIR, "CONTENTS")
 
@@ -56,9 +54,11 @@ def load_ignore_list(path):
 
 def get_all_repos():
     """Fetch all repos (public + private) via GitHub API with pagination."""
+    import requests
+
     url     = "https://api.github.com/user/repos"
     params  = {"per_page": 100, "type": "all"}
-    headers = {"Authorization": f"token {GITHUB_TOKEN}"}
+    headers = {"Authorization": f"token {os.environ['GITHUB_TOKEN']}"}
     repos   = []
 
     while url:
@@ -135,7 +135,36 @@ def extract_contents(repo_path):
     return "".join(parts)
 
 # ─────────────── Main ───────────────
+def extract_repo(repo_url, out_file, branch=None):
+    """Clone one repo and write its extract; returns a coloured status."""
+    try:
+        with tempfile.TemporaryDirectory() as td:
+            clone_repo(repo_url, td, branch)
+            contents = extract_contents(td)
+
+            with open(out_file, "w", encoding="utf-8") as fo:
+                fo.write(contents)
+
+        return f"{GREEN}✅{RESET}"
+    except subprocess.TimeoutExpired:
+        return f"{RED}❌ Clone timeout{RESET}"
+    except subprocess.CalledProcessError:
+        return f"{RED}❌ Git error{RESET}"
+    except Exception as e:
+        return f"{RED}❌ {e}{RESET}"
+
 def main():
+    parser = argparse.ArgumentParser(description="Extract every accessible GitHub repo into CONTENTS/")
+    parser.add_argument("--workers", "-j", type=int, default=DEFAULT_WORKERS,
+                        help=f"Repos to process in parallel (default: {DEFAULT_WORKERS})")
+    parser.add_argument("--order", choices=ORDERS, default="size",
+                        help="Processing order: largest first (default), most recently pushed first, or API order")
+    parser.add_argument("--dry-run", action="store_true", help="Print the projected schedule and exit")
+    args = parser.parse_args()
+
+    import dotenv
+    dotenv.load_dotenv()
+
     os.makedirs(OUTPUT_DIR, exist_ok=True)
     repo_ignore_set   = load_ignore_list(IGNORE_FILE)
     owner_ignore_set  = load_ignore_list(OWNER_IGNORE_FILE)
@@ -145,10 +174,10 @@ def main():
     print(f"{CYAN}Found {len(repos)} repos — skipping {len(repo_ignore_set)} by name and {len(owner_ignore_set)} by owner.{RESET}")
     print(f"{CYAN}Using {len(branch_config)} branch specifications from {BRANCH_FILE}.{RESET}\n")
 
+    selected = []
     for repo in repos:
         owner    = repo["owner"]["login"]
-        repo_url = repo["clone_url"]
-        repo_name= get_repo_name(repo_url)
+        repo_name= get_repo_name(repo["clone_url"])
         repo_key = f"{owner}/{repo_name}"
 
         if owner in owner_ignore_set:
@@ -157,33 +186,36 @@ def main():
         if repo_name in repo_ignore_set:
             print(f"{YELLOW}→ {repo_key}  (skipped via .ignore){RESET}")
             continue
+        selected.append(repo)
+
+    ordered = order_repos(selected, args.order)
+    if args.dry_run:
+        print_schedule(ordered, args.workers, args.order, api_order=selected)
+        return
+
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as executor:
+        futures = {}
+        for repo in ordered:
+            owner    = repo["owner"]["login"]
+            repo_url = repo["clone_url"]
+            repo_name= get_repo_name(repo_url)
+            repo_key = f"{owner}/{repo_name}"
+
+            # Get specific branch for this repo if defined
+            branch = branch_config.get(repo_key)
+            branch_info = f" (branch: {branch})" if branch else ""
+
+            out_file = os.path.join(
+                OUTPUT_DIR,
+                f"{owner}_{repo_name}_contents.txt"
+            )
+            futures[executor.submit(extract_repo, repo_url, out_file, branch)] = f"{repo_key}{branch_info}"
 
-        # Get specific branch for this repo if defined
-        branch = branch_config.get(repo_key)
-        branch_info = f" (branch: {branch})" if branch else ""
-        
-        print(f"{CYAN}→ {repo_key}{branch_info}…{RESET}", end=" ", flush=True)
-        try:
-            with tempfile.TemporaryDirectory() as td:
-                clone_repo(repo_url, td, branch)
-                contents = extract_contents(td)
-
-                out_file = os.path.join(
-                    OUTPUT_DIR,
-                    f"{owner}_{repo_name}_contents.txt"
-                )
-                with open(out_file, "w", encoding="utf-8") as fo:
-                    fo.write(contents)
-
-            print(f"{GREEN}✅{RESET}")
-        except subprocess.TimeoutExpired:
-            print(f"{RED}❌ Clone timeout{RESET}")
-        except subprocess.CalledProcessError:
-            print(f"{RED}❌ Git error{RESET}")
-        except Exception as e:
-            print(f"{RED}❌ {e}{RESET}")
+        for future in as_completed(futures):
+            print(f"{CYAN}→ {futures[future]}{RESET} {future.result()}", flush=True)
 
     print(f"\n{BOLD}All done! Repository contents in: {OUTPUT_DIR}{RESET}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,9 @@
+@echo off
+:: ghsearch.bat — Offline search over ghextractall output
+if "%~1" == "" (
+  echo Usage: ghsearch index ^| ghsearch search [terms]
+  echo Example: ghsearch search firebase auth
+  exit /b 1
+)
+
+python "%~dp0ghsearch.py" %*
\ No newline at end of file
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+import os
+import re
+import sys
+import math
+import glob
+import time
+import heapq
+import argparse
+from collections import Counter
+
+# ─────────────── Paths & Config ───────────────
+SCRIPT_DIR   = os.path.dirname(os.path.abspath(__file__))
+CONTENTS_DIR = os.path.join(SCRIPT_DIR, "CONTENTS")
+INDEX_NAME   = ".search_index.db"
+
+# BM25 tuning (the usual Okapi defaults)
+BM25_K1 = 1.2
+BM25_B  = 0.75
+
+TOKEN_RE  = re.compile(r"[a-z0-9]+")
+MAX_TOKEN = 64
+
+# A record header as written by ghextractall.py / extract.py
+RECORD_RE = re.compile(rb"\nFilename: ([^\r\n]*)\r?\nContent:[ \t]*(?:\r?\n)?")
+SEPARATOR = b"=" * 80
+
+# ─────────────── Colour Codes ───────────────
+RESET = "\033[0m"
+BOLD = "\033[1m"
+RED = "\033[31m"
+GREEN = "\033[32m"
+YELLOW = "\033[33m"
+MAGENTA = "\033[35m"
+CYAN = "\033[36m"
+
+# ─────────────── Helpers ───────────────
+def tokenize(text):
+    """Split text into lowercase alphanumeric terms (drops 1-char and huge tokens)."""
+    return [t for t in TOKEN_RE.findall(text.lower()) if 1 < len(t) <= MAX_TOKEN]
+
+def source_name(path):
+    """Turn CONTENTS/owner_repo_contents.txt into owner_repo."""
+    name = os.path.basename(path)
+    return name[:-len("_contents.txt")] if name.endswith("_contents.txt") else name
+
+def iter_records(data):
+    """Yield (path, offset, length) for every file record in an extract."""
+    matches = list(RECORD_RE.finditer(data))
+    for i, m in enumerate(matches):
+        start = m.end()
+        end   = matches[i + 1].start() if i + 1 < len(matches) else len(data)
+        body  = data[start:end].rstrip()
+        if body.endswith(SEPARATOR):
+            body = body[:-len(SEPARATOR)].rstrip()
+        yield m.group(1).decode("utf-8", errors="replace"), start, len(body)
+
+def open_index(path):
+    """Open (and create if needed) the sqlite-backed inverted index."""
+    import sqlite3
+    db = sqlite3.connect(path)
+    db.executescript("""
+        PRAGMA journal_mode = WAL;
+        PRAGMA synchronous = NORMAL;
+        CREATE TABLE IF NOT EXISTS sources (name TEXT PRIMARY KEY, file TEXT, size INTEGER, mtime REAL);
+        CREATE TABLE IF NOT EXISTS docs (id INTEGER PRIMARY KEY, source TEXT, path TEXT,
+                                         offset INTEGER, length INTEGER, tokens INTEGER);
+        CREATE TABLE IF NOT EXISTS postings (term TEXT, doc INTEGER, tf INTEGER);
+        CREATE INDEX IF NOT EXISTS docs_source ON docs(source);
+        CREATE INDEX IF NOT EXISTS postings_term ON postings(term);
+        CREATE INDEX IF NOT EXISTS postings_doc ON postings(doc);
+    """)
+    return db
+
+def drop_source(db, name):
+    """Remove every document (and its postings) that came from one extract."""
+    db.execute("DELETE FROM postings WHERE doc IN (SELECT id FROM docs WHERE source = ?)", (name,))
+    db.execute("DELETE FROM docs WHERE source = ?", (name,))
+    db.execute("DELETE FROM sources WHERE name = ?", (name,))
+
+def index_source(db, name, path, st):
+    """(Re)index a single extract file; returns the number of documents added."""
+    with open(path, "rb") as f:
+        data = f.read()
+
+    drop_source(db, name)
+    count = 0
+    for rel_path, offset, length in iter_records(data):
+        body  = data[offset:offset + length].decode("utf-8", errors="replace")
+        terms = Counter(tokenize(rel_path) + tokenize(body))
+        cur = db.execute(
+            "INSERT INTO docs (source, path, offset, length, tokens) VALUES (?, ?, ?, ?, ?)",
+            (name, rel_path, offset, length, sum(terms.values()))
+        )
+        db.executemany(
+            "INSERT INTO postings (term, doc, tf) VALUES (?, ?, ?)",
+            ((term, cur.lastrowid, tf) for term, tf in terms.items())
+        )
+        count += 1
+    db.execute(
+        "INSERT INTO sources (name, file, size, mtime) VALUES (?, ?, ?, ?)",
+        (name, os.path.abspath(path), st.st_size, st.st_mtime)
+    )
+    return count
+
+def build_index(contents_dir, rebuild=False):
+    """Bring the index up to date, touching only extracts that changed on disk."""
+    db = open_index(os.path.join(contents_dir, INDEX_NAME))
+    if rebuild:
+        db.executescript("DELETE FROM postings; DELETE FROM docs; DELETE FROM sources;")
+
+    known = {name: (size, mtime) for name, size, mtime in
+             db.execute("SELECT name, size, mtime FROM sources")}
+    files = {source_name(p): p for p in glob.glob(os.path.join(contents_dir, "*_contents.txt"))}
+
+    updated = skipped = 0
+    for name in sorted(files):
+        st = os.stat(files[name])
+        if known.get(name) == (st.st_size, st.st_mtime):
+            skipped += 1
+            continue
+        print(f"{CYAN}→ {name}…{RESET}", end=" ", flush=True)
+        try:
+            with db:
+                docs = index_source(db, name, files[name], st)
+            print(f"{GREEN}✅ {docs} files{RESET}")
+            updated += 1
+        except Exception as e:
+            print(f"{RED}❌ {e}{RESET}")
+
+    removed = [name for name in known if name not in files]
+    with db:
+        for name in removed:
+            drop_source(db, name)
+
+    db.close()
+    print(f"\n{BOLD}Index up to date: {updated} updated, {skipped} unchanged, {len(removed)} removed.{RESET}")
+
+def make_snippet(source_file, offset, length, terms, width=160):
+    """Pull the first line of a document that mentions a query term."""
+    try:
+        with open(source_file, "rb") as f:
+            f.seek(offset)
+            body = f.read(length).decode("utf-8", errors="replace")
+    except OSError:
+        return ""
+
+    lowered = body.lower()
+    hits = [i for i in (lowered.find(t) for t in terms) if i >= 0]
+    if not hits:
+        return ""
+    pos   = min(hits)
+    start = body.rfind("\n", 0, pos) + 1
+    end   = body.find("\n", pos)
+    raw   = body[start:end if end >= 0 else len(body)]
+    line  = raw.strip()
+    if len(line) > width:
+        hit  = pos - start - (len(raw) - len(raw.lstrip()))
+        cut  = max(0, hit - width // 3)
+        line = ("…" if cut else "") + line[cut:cut + width] + "…"
+    return re.sub("(" + "|".join(map(re.escape, terms)) + ")",
+                  f"{YELLOW}\\1{RESET}", line, flags=re.IGNORECASE)
+
+def search(contents_dir, query, limit=10, repo=None):
+    """Rank indexed files against the query with BM25; returns result dicts."""
+    index_path = os.path.join(contents_dir, INDEX_NAME)
+    if not os.path.isfile(index_path):
+        return None
+    terms = list(dict.fromkeys(tokenize(query)))
+    if not terms:
+        return []
+
+    import sqlite3
+    db = sqlite3.connect(index_path)
+    where, scope = "", []
+    if repo:
+        # LIKE keeps the match case-insensitive; escape its wildcards so `my_repo` doesn't match `myXrepo`
+        where = r" AND d.source LIKE ? ESCAPE '\'"
+        scope = ["%" + re.sub(r"([\\%_])", r"\\\1", repo) + "%"]
+    # N and the average length cover the documents being ranked, so --repo scores like a per-repo index
+    total, avgdl = db.execute("SELECT COUNT(*), AVG(d.tokens) FROM docs d WHERE 1" + where, scope).fetchone()
+    if not total:
+        db.close()
+        return []
+
+    doc_len = {}
+    scores  = Counter()
+    for term in terms:
+        rows = db.execute("SELECT p.doc, p.tf, d.tokens FROM postings p JOIN docs d ON d.id = p.doc "
+                          "WHERE p.term = ?" + where, [term] + scope).fetchall()
+        if not rows:
+            continue
+        idf = math.log(1 + (total - len(rows) + 0.5) / (len(rows) + 0.5))
+        for doc, tf, tokens in rows:
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * tokens / avgdl)
+            scores[doc] += idf * tf * (BM25_K1 + 1) / (tf + norm)
+            doc_len[doc] = tokens
+
+    results = []
+    for doc, score in heapq.nlargest(limit, scores.items(), key=lambda kv: kv[1]):
+        source, path, offset, length, source_file = db.execute(
+            "SELECT d.source, d.path, d.offset, d.length, s.file FROM docs d "
+            "JOIN sources s ON s.name = d.source WHERE d.id = ?", (doc,)
+        ).fetchone()
+        results.append({
+            "repo": source,
+            "path": path,
+            "score": score,
+            "snippet": make_snippet(source_file, offset, length, terms),
+        })
+    db.close()
+    return results
+
+# ─────────────── Main ───────────────
+def main():
+    parser = argparse.ArgumentParser(description="Offline full-text search over ghextractall output")
+    parser.add_argument("--contents-dir", default=CONTENTS_DIR,
+                        help=f"Directory holding *_contents.txt extracts (default: {CONTENTS_DIR})")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_index = sub.add_parser("index", help="Build or incrementally update the search index")
+    p_index.add_argument("--rebuild", action="store_true", help="Discard the index and rebuild it")
+
+    p_search = sub.add_parser("search", help="Search the index (BM25 ranking)")
+    p_search.add_argument("query", nargs="+", help="Search terms")
+    p_search.add_argument("--limit", "-n", type=int, default=10, help="Maximum results (default: 10)")
+    p_search.add_argument("--repo", "-r", help="Only search repos whose name contains this text")
+
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.contents_dir):
+        print(f"{RED}Error: '{args.contents_dir}' does not exist. Run ghextractall first.{RESET}")
+        sys.exit(1)
+
+    if args.command == "index":
+        build_index(args.contents_dir, rebuild=args.rebuild)
+        return
+
+    start   = time.perf_counter()
+    results = search(args.contents_dir, " ".join(args.query), args.limit, args.repo)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    if results is None:
+        print(f"{RED}Error: No index found. Run 'ghsearch index' first.{RESET}")
+        sys.exit(1)
+    if not results:
+        print(f"{YELLOW}No matches ({elapsed:.1f} ms).{RESET}")
+        return
+
+    for r in results:
+        print(f"{BOLD}{CYAN}{r['repo']}{RESET}  {MAGENTA}{r['path']}{RESET}  ({r['score']:.2f})")
+        if r["snippet"]:
+            print(f"    {r['snippet']}")
+    print(f"\n{GREEN}{len(results)} results in {elapsed:.1f} ms{RESET}")
+
+if __name__ == "__main__":
+    main()
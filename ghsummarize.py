@@ -1,15 +1,12 @@
 #!/usr/bin/env python3
 import os
 import re
+import argparse
 import tempfile
 import subprocess
-import requests
-import dotenv
 
-from google import genai
-from google.genai import types
-
-dotenv.load_dotenv()
+import llm
+from scheduling import DEFAULT_WORKERS, ORDERS, order_repos, print_schedule
 
 # ─────────────── Paths & Config ───────────────
 SCRIPT_DIR        = os.path.dirname(os.path.abspath(__file__))
@@ -17,12 +14,15 @@ IGNORE_FILE       = os.path.join(SCRIPT_DIR, ".ignore")
 OWNER_IGNORE_FILE = os.path.join(SCRIPT_DIR, ".ownerignore")
 BRANCH_FILE       = os.path.join(SCRIPT_DIR, ".branch")
 
-GITHUB_TOKEN      = os.environ["GITHUB_TOKEN"]
-GEMINI_API_KEY    = os.environ["GEMINI_API_KEY"]
-GEMINI_MODEL      = "gemini-2.0-flash"
 
 OUTPUT_DIR        = os.path.join(SCRIPT_DIR, "SUMMARIES")
 
+# Update mode: regenerate from scratch once the changed files outweigh this
+# fraction of the full extract.
+FULL_THRESHOLD    = 0.3
+COMMIT_MARKER     = "<!-- ghsummarize: commit={} -->"
+COMMIT_MARKER_RE  = re.compile(r"\n*<!-- ghsummarize: commit=([0-9a-f]{40}) -->\s*$")
+
 # ─────────────── Colour Codes ───────────────
 RESET = "\033[0m"
 BOLD = "\033[1m"
@@ -60,9 +60,11 @@ def load_ignore_list(path):
 
 def get_all_repos():
     """Fetch all repos (public + private) via GitHub API with pagination."""
+    import requests
+
     url     = "https://api.github.com/user/repos"
     params  = {"per_page": 100, "type": "all"}
-    headers = {"Authorization": f"token {GITHUB_TOKEN}"}
+    headers = {"Authorization": f"token {os.environ['GITHUB_TOKEN']}"}
     repos   = []
 
     while url:
@@ -120,31 +122,144 @@ def list_git_files(repo_path):
     )
     return result.stdout.splitlines()
 
-def extract_contents(repo_path):
-    """Concatenate all tracked files into one big text (skips >1MB/binary)."""
-    parts = []
-    for f in list_git_files(repo_path):
+def extract_records(repo_path, files=None, skeleton=False):
+    """Yield (path, kind, text) for all tracked files (or just `files`).
+
+    kind is 'full', or 'marker' for files skipped as too large/binary. With
+    `skeleton`, source files are reduced to outlines (plus a tree.txt when
+    extracting the whole repo), see skeleton.py.
+    """
+    whole_repo = files is None
+    if whole_repo:
+        files = list_git_files(repo_path)
+    if skeleton:
+        from skeleton import skeleton_entries
+        yield from skeleton_entries(repo_path, files, tree=whole_repo)
+        return
+    for f in files:
         full = os.path.join(repo_path, f)
-        parts.append(f"\n--- {f} ---\n")
         try:
             if os.path.getsize(full) > 1_048_576:
-                parts.append("[SKIPPED: too large]\n")
+                yield f, "marker", "[SKIPPED: too large]"
                 continue
             text = open(full, encoding="utf-8", errors="strict").read()
-            parts.append(text + "\n")
         except (UnicodeDecodeError, PermissionError):
-            parts.append("[SKIPPED: binary or unreadable]\n")
-    return "".join(parts)
+            yield f, "marker", "[SKIPPED: binary or unreadable]"
+            continue
+        yield f, "full", text
+
+def format_record(path, kind, text):
+    """One `--- path ---` record of the extract."""
+    return f"\n--- {path}{' (outline)' if kind == 'outline' else ''} ---\n{text}\n"
+
+def extract_contents(repo_path, files=None, skeleton=False):
+    """Concatenate all tracked files (or just `files`) into one big text (skips >1MB/binary)."""
+    return "".join(format_record(*record) for record in extract_records(repo_path, files, skeleton))
+
+def build_input(repo_path, files=None, skeleton=False, minify=False):
+    """The extract to prompt with; returns (text, minify stats or None)."""
+    records = list(extract_records(repo_path, files, skeleton))
+    text = "".join(format_record(*record) for record in records)
+    if not minify:
+        return text, None
+    from minify import minify_records
+    return minify_records(records, text)
+
+def get_head_commit(repo_path):
+    """Return the full SHA of the checked-out commit."""
+    result = subprocess.run(
+        ["git", "-C", repo_path, "rev-parse", "HEAD"],
+        stdout=subprocess.PIPE,
+        text=True,
+        check=True
+    )
+    return result.stdout.strip()
+
+def fetch_commit(repo_path, sha):
+    """Fetch a single older commit into a shallow clone; False if it is gone upstream."""
+    result = subprocess.run(
+        ["git", "-C", repo_path, "fetch", "--depth", "1", "origin", sha],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        timeout=60
+    )
+    return result.returncode == 0
+
+def get_diff(repo_path, old_sha):
+    """Return (diff --stat, changed files, deleted files) between old_sha and HEAD."""
+    def git_diff(*args):
+        return subprocess.run(
+            ["git", "-C", repo_path, "diff", *args, old_sha, "HEAD"],
+            stdout=subprocess.PIPE,
+            text=True,
+            check=True
+        ).stdout
+
+    stat    = git_diff("--stat")
+    changed = git_diff("--name-only", "--diff-filter=d").splitlines()
+    deleted = git_diff("--name-only", "--diff-filter=D").splitlines()
+    return stat, changed, deleted
+
+def read_previous_summary(path):
+    """Return (summary, commit) from an earlier run, or (None, None)."""
+    if not os.path.isfile(path):
+        return None, None
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    match = COMMIT_MARKER_RE.search(text)
+    if not match:
+        return text, None
+    return text[:match.start()], match.group(1)
+
+def input_notes(skeleton=False, minified=False):
+    """Prompt paragraphs explaining skeleton and/or minified input, or nothing."""
+    notes = ""
+    if skeleton:
+        from skeleton import SKELETON_NOTE
+        notes += f"\n\n{SKELETON_NOTE} Outlined files are headed `--- path (outline) ---`.\n"
+    if minified:
+        from minify import NOTE
+        notes += f"\n\n{NOTE}\n"
+    return notes
+
+def update_with_gemini(owner, repo_name, previous, stat, changed_text, deleted, skeleton=False, minified=False):
+    """Ask Gemini to revise an existing summary from a diff; returns the response stream."""
+    deleted_list = "\n".join(f"- {f}" for f in deleted) or "(none)"
+    prompt = f"""
+**Role:** Expert Software Engineer
+
+**Task:** Below is an existing technical summary of the repository "{owner}/{repo_name}", followed by the changes made since it was written. Revise the summary so it accurately describes the repository *after* these changes.
+
+**Instructions for the AI:**
+*   Keep the existing Markdown structure, headings and section numbering exactly.
+*   Change only what the diff affects; keep every other sentence as it is.
+*   Base your revision *solely* on the previous summary and the changes provided.
+*   Output only the revised summary, with no commentary about what changed.
 
-def summarize_with_gemini(owner, repo_name, text):
+**Previous summary:**
+{previous}
+
+**`git diff --stat` since the summarized commit:**
+```
+{stat}
+```
+
+**Deleted files:**
+{deleted_list}
+
+**Current contents of added/modified files** (each preceded by `--- path ---`):{input_notes(skeleton, minified)}
+{changed_text}
+"""
+    return llm.get_backend().generate_stream(prompt)
+
+def summarize_with_gemini(owner, repo_name, text, skeleton=False, minified=False):
     """Send a prompt to Gemini and stream back the summary."""
-    client = genai.Client(api_key=GEMINI_API_KEY)
     prompt = f"""
 **Role:** Expert Software Engineer
 
 **Task:** Analyze the provided repository contents for "{owner}/{repo_name}" and generate a concise, structured, and technical summary suitable for another developer quickly understanding the project's purpose, structure, and key characteristics.
 
-**Input Context:** The input contains a concatenation of multiple file contents from the repository. Each file's content is preceded by a line starting with `Filename: ` and followed by `Content:`. Files are separated by lines of `================================================================================`. Some files might be marked as binary or too large to display. A `tree.txt` file providing a directory structure may also be included.
+**Input Context:** The input contains a concatenation of multiple file contents from the repository. Each file's content is preceded by a line starting with `Filename: ` and followed by `Content:`. Files are separated by lines of `================================================================================`. Some files might be marked as binary or too large to display. A `tree.txt` file providing a directory structure may also be included.{input_notes(skeleton, minified)}
 
 **Output Format:** Generate a summary in Markdown format, covering the following sections precisely:
 
@@ -205,23 +320,87 @@ def summarize_with_gemini(owner, repo_name, text):
 Here is the input:
 {text}
 """
-    contents = [
-        types.Content(
-            role="user",
-            parts=[types.Part(text=prompt)]
-        )
-    ]
-    cfg = types.GenerateContentConfig(response_mime_type="text/plain")
-    summary_chunks = client.models.generate_content_stream(
-        model=GEMINI_MODEL,
-        contents=contents,
-        config=cfg
-    )
-    return "".join(chunk.text for chunk in summary_chunks)
+    return llm.get_backend().generate_stream(prompt)
 
 
 # ─────────────── Main ───────────────
+def summarize_repo(owner, repo_name, repo_path, out_file, update=False, full_threshold=FULL_THRESHOLD,
+                   echo=False, skeleton=False, minify=False):
+    """Write a summary for a cloned repo; returns a short status for the progress line.
+
+    The summary is streamed to disk as it is generated (optionally echoed to
+    the terminal); an interrupted run leaves `<out_file>.partial` behind.
+    """
+    head = get_head_commit(repo_path)
+    previous, previous_sha = read_previous_summary(out_file) if update else (None, None)
+
+    if previous_sha == head:
+        return "unchanged"
+
+    contents, stats = build_input(repo_path, skeleton=skeleton, minify=minify)
+    chunks   = None
+    status   = "full"
+    savings  = ""
+    if previous and previous_sha and fetch_commit(repo_path, previous_sha):
+        stat, changed, deleted = get_diff(repo_path, previous_sha)
+        changed_text, changed_stats = build_input(repo_path, changed, skeleton, minify)
+        if len(changed_text) <= full_threshold * len(contents):
+            chunks = update_with_gemini(owner, repo_name, previous.rstrip(), stat, changed_text, deleted,
+                                        skeleton, minify)
+            status = f"updated, {len(changed)} changed / {len(deleted)} deleted"
+            stats  = changed_stats  # report the savings on what was actually sent
+
+    if chunks is None:
+        chunks = summarize_with_gemini(owner, repo_name, contents, skeleton, minify)
+    if minify:
+        from minify import describe_savings
+        savings = f", {describe_savings(stats)}"
+
+    trailer = "\n\n" + COMMIT_MARKER.format(head) + "\n"
+    llm.stream_to_file(chunks, out_file, echo=echo, trailer=trailer)
+    return status + savings
+
+def process_repo(owner, repo_name, repo_url, out_file, branch=None, **kwargs):
+    """Clone one repo and summarize it; returns a coloured status."""
+    try:
+        with tempfile.TemporaryDirectory() as td:
+            clone_repo(repo_url, td, branch)
+            status = summarize_repo(owner, repo_name, td, out_file, **kwargs)
+
+        return f"{GREEN}✅ ({status}){RESET}"
+    except subprocess.TimeoutExpired:
+        return f"{RED}❌ Clone timeout{RESET}"
+    except subprocess.CalledProcessError:
+        return f"{RED}❌ Git error{RESET}"
+    except Exception as e:
+        return f"{RED}❌ {e}{RESET}"
+
 def main():
+    parser = argparse.ArgumentParser(description="Summarize every accessible GitHub repo with Gemini")
+    parser.add_argument("--update", "-u", action="store_true",
+                        help="Revise existing summaries from the diff since the summarized commit")
+    parser.add_argument("--full-threshold", type=float, default=FULL_THRESHOLD,
+                        help=f"In update mode, regenerate from scratch when changed files exceed "
+                             f"this fraction of the repo (default: {FULL_THRESHOLD})")
+    parser.add_argument("--workers", "-j", type=int, default=DEFAULT_WORKERS,
+                        help=f"Repos to process in parallel (default: {DEFAULT_WORKERS})")
+    parser.add_argument("--order", choices=ORDERS, default="size",
+                        help="Processing order: largest first (default), most recently pushed first, or API order")
+    parser.add_argument("--dry-run", action="store_true", help="Print the projected schedule and exit")
+    parser.add_argument("--skeleton", "-s", action="store_true",
+                        help="Send a tree, docs, manifests and source outlines instead of full file contents")
+    parser.add_argument("--minify", "-m", action="store_true",
+                        help="Compact each extract (whitespace, license headers, lockfiles, generated/minified "
+                             "files) and report the token savings")
+    parser.add_argument("--echo", action="store_true",
+                        help="Print each summary to the terminal as it is generated (implies --workers 1)")
+    args = parser.parse_args()
+
+    import dotenv
+    dotenv.load_dotenv()
+    if args.echo:
+        args.workers = 1
+
     os.makedirs(OUTPUT_DIR, exist_ok=True)
     repo_ignore_set   = load_ignore_list(IGNORE_FILE)
     owner_ignore_set  = load_ignore_list(OWNER_IGNORE_FILE)
@@ -231,10 +410,10 @@ def main():
     print(f"{CYAN}Found {len(repos)} repos — skipping {len(repo_ignore_set)} by name and {len(owner_ignore_set)} by owner.{RESET}")
     print(f"{CYAN}Using {len(branch_config)} branch specifications from {BRANCH_FILE}.{RESET}\n")
 
+    selected = []
     for repo in repos:
         owner    = repo["owner"]["login"]
-        repo_url = repo["clone_url"]
-        repo_name= get_repo_name(repo_url)
+        repo_name= get_repo_name(repo["clone_url"])
         repo_key = f"{owner}/{repo_name}"
 
         if owner in owner_ignore_set:
@@ -243,32 +422,43 @@ def main():
         if repo_name in repo_ignore_set:
             print(f"{YELLOW}→ {repo_key}  (skipped via .ignore){RESET}")
             continue
+        selected.append(repo)
+
+    ordered = order_repos(selected, args.order)
+    if args.dry_run:
+        print_schedule(ordered, args.workers, args.order, api_order=selected)
+        return
+
+    try:
+        llm.get_backend()
+    except llm.MissingAPIKeyError as e:
+        print(f"{RED}Error: {e}{RESET}")
+        return
+
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as executor:
+        futures = {}
+        for repo in ordered:
+            owner    = repo["owner"]["login"]
+            repo_url = repo["clone_url"]
+            repo_name= get_repo_name(repo_url)
+            repo_key = f"{owner}/{repo_name}"
+
+            # Get specific branch for this repo if defined
+            branch = branch_config.get(repo_key)
+            branch_info = f" (branch: {branch})" if branch else ""
+
+            out_file = os.path.join(
+                OUTPUT_DIR,
+                f"{owner}_{repo_name}_summary.md"
+            )
+            future = executor.submit(process_repo, owner, repo_name, repo_url, out_file, branch,
+                                     update=args.update, full_threshold=args.full_threshold,
+                                     echo=args.echo, skeleton=args.skeleton, minify=args.minify)
+            futures[future] = f"{repo_key}{branch_info}"
 
-        # Get specific branch for this repo if defined
-        branch = branch_config.get(repo_key)
-        branch_info = f" (branch: {branch})" if branch else ""
-        
-        print(f"{CYAN}→ {repo_key}{branch_info}…{RESET}", end=" ", flush=True)
-        try:
-            with tempfile.TemporaryDirectory() as td:
-                clone_repo(repo_url, td, branch)
-                contents = extract_contents(td)
-                summary  = summarize_with_gemini(owner, repo_name, contents)
-
-                out_file = os.path.join(
-                    OUTPUT_DIR,
-                    f"{owner}_{repo_name}_summary.md"
-                )
-                with open(out_file, "w", encoding="utf-8") as fo:
-                    fo.write(summary)
-
-            print(f"{GREEN}✅{RESET}")
-        except subprocess.TimeoutExpired:
-            print(f"{RED}❌ Clone timeout{RESET}")
-        except subprocess.CalledProcessError:
-            print(f"{RED}❌ Git error{RESET}")
-        except Exception as e:
-            print(f"{RED}❌ {e}{RESET}")
+        for future in as_completed(futures):
+            print(f"{CYAN}→ {futures[future]}{RESET} {future.result()}", flush=True)
 
     print(f"\n{BOLD}All done! Summaries in: {OUTPUT_DIR}{RESET}")
 
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+LLM backends shared by ai.py, summarize.py and ghsummarize.py.
+
+Every tool talks to the model through the same small interface (streaming
+generation, token counting, context caching). The default backend is Gemini;
+an offline stub with configurable latency, throughput and error injection can
+be selected with LLM_BACKEND=stub for load tests and benchmarks.
+
+Environment:
+    LLM_BACKEND          gemini (default) or stub
+    LLM_MODEL            model name (default: gemini-2.0-flash)
+    GEMINI_API_KEY       API key for the Gemini backend
+    LLM_STUB_LATENCY     stub time-to-first-token in seconds (default: 0.2)
+    LLM_STUB_TPS         stub output tokens per second (default: 200)
+    LLM_STUB_TOKENS      stub output length in tokens (default: 400)
+    LLM_STUB_ERROR_RATE  fraction of stub calls that fail (default: 0)
+    LLM_STUB_SEED        seed for the stub's error injection (default: 0)
+"""
+
+import os
+import sys
+import time
+import random
+import hashlib
+import threading
+
+# ─────────────── Config ───────────────
+DEFAULT_MODEL   = "gemini-2.0-flash"
+CHARS_PER_TOKEN = 4  # rough estimate used wherever the API is not consulted
+
+_default_backend = None
+_default_lock    = threading.Lock()
+
+class MissingAPIKeyError(RuntimeError):
+    """Raised when the selected backend needs an API key that is not set."""
+
+class StubError(RuntimeError):
+    """Failure injected by the stub backend."""
+
+# ─────────────── Backends ───────────────
+class LLMBackend:
+    """Interface every backend implements."""
+
+    name = "base"
+
+    def __init__(self, model=None):
+        self.model = model or os.environ.get("LLM_MODEL", DEFAULT_MODEL)
+
+    def generate_stream(self, prompt, system_instruction=None, cached_content=None, history=None):
+        """Yield the response text chunk by chunk.
+
+        `history` is an optional list of earlier turns, each a
+        {"role": "user" | "model", "text": ...} dict, oldest first.
+        """
+        raise NotImplementedError
+
+    def generate(self, prompt, system_instruction=None, cached_content=None, history=None):
+        """Return the whole response as one string."""
+        return "".join(self.generate_stream(prompt, system_instruction, cached_content, history))
+
+    def count_tokens(self, text):
+        """Return the number of input tokens `text` costs."""
+        return max(1, len(text) // CHARS_PER_TOKEN)
+
+    def create_cache(self, text, system_instruction=None, ttl=3600):
+        """Cache a large shared prefix server-side; returns a handle for `cached_content`."""
+        raise NotImplementedError
+
+    def delete_cache(self, name):
+        """Drop a cache created by create_cache."""
+        raise NotImplementedError
+
+class GeminiBackend(LLMBackend):
+    """Google Gemini via the google-genai SDK."""
+
+    name = "gemini"
+
+    def __init__(self, model=None, api_key=None):
+        super().__init__(model)
+        self.api_key = api_key or os.environ.get("GEMINI_API_KEY")
+        if not self.api_key:
+            raise MissingAPIKeyError("GEMINI_API_KEY environment variable not set")
+        from google import genai
+        from google.genai import types
+        self.types  = types
+        self.client = genai.Client(api_key=self.api_key)
+
+    def _contents(self, prompt, history=None):
+        types = self.types
+        turns = list(history or []) + [{"role": "user", "text": prompt}]
+        return [types.Content(role=t["role"], parts=[types.Part.from_text(text=t["text"])]) for t in turns]
+
+    def generate_stream(self, prompt, system_instruction=None, cached_content=None, history=None):
+        types = self.types
+        options = {"response_mime_type": "text/plain"}
+        if cached_content:
+            # The system instruction lives in the cache when one is used
+            options["cached_content"] = cached_content
+        elif system_instruction:
+            options["system_instruction"] = [types.Part.from_text(text=system_instruction)]
+
+        for chunk in self.client.models.generate_content_stream(
+            model=self.model,
+            contents=self._contents(prompt, history),
+            config=types.GenerateContentConfig(**options),
+        ):
+            if chunk.text:
+                yield chunk.text
+
+    def count_tokens(self, text):
+        return self.client.models.count_tokens(model=self.model, contents=text).total_tokens
+
+    def create_cache(self, text, system_instruction=None, ttl=3600):
+        options = {"contents": self._contents(text), "ttl": f"{int(ttl)}s"}
+        if system_instruction:
+            options["system_instruction"] = system_instruction
+        config = self.types.CreateCachedContentConfig(**options)
+        return self.client.caches.create(model=self.model, config=config).name
+
+    def delete_cache(self, name):
+        self.client.caches.delete(name=name)
+
+class StubBackend(LLMBackend):
+    """Deterministic offline backend for load tests and benchmarks.
+
+    The response depends only on the prompt, arrives after `latency` seconds and
+    then streams at `tokens_per_second`. `error_rate` of the calls fail, half of
+    them before the first chunk and half mid-stream.
+    """
+
+    name = "stub"
+
+    WORDS = ("repository", "module", "function", "client", "request", "cache", "stream",
+             "config", "parser", "worker", "index", "token", "server", "build", "deploy")
+
+    def __init__(self, model=None, latency=0.2, tokens_per_second=200.0, output_tokens=400,
+                 error_rate=0.0, seed=0, chunk_tokens=8):
+        super().__init__(model or "stub")
+        self.latency           = latency
+        self.tokens_per_second = tokens_per_second
+        self.output_tokens     = output_tokens
+        self.error_rate        = error_rate
+        self.chunk_tokens      = chunk_tokens
+        self._rng              = random.Random(seed)
+        self._lock             = threading.Lock()
+        self._caches           = {}
+        self.stats             = {"calls": 0, "errors": 0, "input_tokens": 0,
+                                  "cached_tokens": 0, "output_tokens": 0}
+
+    @classmethod
+    def from_env(cls, model=None):
+        """Build a stub from the LLM_STUB_* environment variables."""
+        env = os.environ.get
+        return cls(
+            model=model,
+            latency=float(env("LLM_STUB_LATENCY", 0.2)),
+            tokens_per_second=float(env("LLM_STUB_TPS", 200)),
+            output_tokens=int(env("LLM_STUB_TOKENS", 400)),
+            error_rate=float(env("LLM_STUB_ERROR_RATE", 0)),
+            seed=int(env("LLM_STUB_SEED", 0)),
+        )
+
+    def _response_tokens(self, prompt):
+        """A Markdown-shaped response derived only from the prompt."""
+        digest = hashlib.sha256(prompt.encode("utf-8")).digest()
+        rng    = random.Random(digest)
+        tokens = []
+        while len(tokens) < self.output_tokens:
+            kind = rng.random()
+            if kind < 0.1:
+                tokens += ["\n## ", rng.choice(self.WORDS).title(), "\n\n"]
+            elif kind < 0.3:
+                tokens += ["- **", rng.choice(self.WORDS), "**: "]
+                tokens += [rng.choice(self.WORDS) + " " for _ in range(rng.randint(4, 12))]
+                tokens.append("\n")
+            else:
+                tokens += [rng.choice(self.WORDS) + " " for _ in range(rng.randint(8, 20))]
+                tokens.append("`" + rng.choice(self.WORDS) + "`.\n\n")
+        return tokens[:self.output_tokens]
+
+    def generate_stream(self, prompt, system_instruction=None, cached_content=None, history=None):
+        context = "".join(t["text"] for t in history or [])
+        with self._lock:
+            roll = self._rng.random()
+            self.stats["calls"] += 1
+            self.stats["input_tokens"] += self.count_tokens(context + prompt + (system_instruction or ""))
+            if cached_content:
+                self.stats["cached_tokens"] += self._caches[cached_content]
+
+        time.sleep(self.latency)
+        fail_at = None
+        if roll < self.error_rate:
+            fail_at = 0 if roll < self.error_rate / 2 else self.output_tokens // 2
+            with self._lock:
+                self.stats["errors"] += 1
+
+        tokens = self._response_tokens(prompt)
+        delay  = self.chunk_tokens / self.tokens_per_second if self.tokens_per_second else 0
+        for i in range(0, len(tokens), self.chunk_tokens):
+            if fail_at is not None and i >= fail_at:
+                raise StubError("injected stub failure")
+            if i and delay:
+                time.sleep(delay)
+            chunk = tokens[i:i + self.chunk_tokens]
+            with self._lock:
+                self.stats["output_tokens"] += len(chunk)
+            yield "".join(chunk)
+
+    def create_cache(self, text, system_instruction=None, ttl=3600):
+        name = "cachedContents/stub-" + hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+        with self._lock:
+            self._caches[name] = self.count_tokens(text + (system_instruction or ""))
+        return name
+
+    def delete_cache(self, name):
+        with self._lock:
+            self._caches.pop(name, None)
+
+BACKENDS = {"gemini": GeminiBackend, "stub": StubBackend}
+
+# ─────────────── Output ───────────────
+def stream_to_file(chunks, path, echo=False, trailer=""):
+    """Write streamed chunks straight to disk (and optionally the terminal).
+
+    Chunks go to `<path>.partial` as they arrive and the file is renamed into
+    place once the stream completes, so an interrupted run leaves the partial
+    output behind instead of nothing. Returns the full text.
+    """
+    partial = path + ".partial"
+    parts = []
+    with open(partial, "w", encoding="utf-8") as f:
+        for chunk in chunks:
+            parts.append(chunk)
+            f.write(chunk)
+            f.flush()
+            if echo:
+                sys.stdout.write(chunk)
+                sys.stdout.flush()
+        f.write(trailer)
+    os.replace(partial, path)
+    return "".join(parts)
+
+# ─────────────── Selection ───────────────
+def create_backend(name=None, model=None):
+    """Build a backend by name (default: $LLM_BACKEND, then gemini)."""
+    name = (name or os.environ.get("LLM_BACKEND") or "gemini").lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown LLM backend '{name}' (choose from: {', '.join(BACKENDS)})")
+    if name == "stub":
+        return StubBackend.from_env(model)
+    return BACKENDS[name](model)
+
+def selected_model():
+    """Return "backend:model" for what get_backend() uses, without building a client."""
+    with _default_lock:
+        if _default_backend is not None:
+            return f"{_default_backend.name}:{_default_backend.model}"
+    name = (os.environ.get("LLM_BACKEND") or "gemini").lower()
+    if name == "stub":
+        return "stub:stub"
+    return f"{name}:{os.environ.get('LLM_MODEL', DEFAULT_MODEL)}"
+
+def get_backend():
+    """Return the process-wide backend, creating it from the environment on first use."""
+    global _default_backend
+    with _default_lock:
+        if _default_backend is None:
+            _default_backend = create_backend()
+        return _default_backend
+
+def set_backend(backend):
+    """Replace the process-wide backend (benchmarks, tests); None resets it."""
+    global _default_backend
+    with _default_lock:
+        _default_backend = backend
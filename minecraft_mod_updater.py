@@ -7,17 +7,34 @@ It uses the Modrinth platform for all mods.
 """
 
 import os
+import sys
 import json
 import shutil
 import time
 import zipfile
-import requests
+import hashlib
+import threading
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor
 import argparse
 
+# `requests` is imported inside the methods that talk to Modrinth so that
+# --help and argument errors don't pay for it.
+
 # Constants
-MODRINTH_API_BASE = "https://api.modrinth.com/v2"
+MODRINTH_API_BASE = os.environ.get("MODRINTH_API_BASE", "https://api.modrinth.com/v2")  # see fake_modrinth.py
+DEFAULT_WORKERS = 8  # concurrent Modrinth lookups / downloads
+LOOKUP_MODES = ("hash", "name")
+HASH_CHUNK = 1024 * 1024
+DOWNLOAD_TIMEOUT = 60  # seconds without data before a download is abandoned
+INDEX_NAME = ".mod_index.json"  # scan cache kept in the mods directory
+INDEX_VERSION = 2  # 2: jars without mod metadata are hashed too
+BACKUP_KEEP = 10  # snapshots kept by default
+VERSION_WINDOW = 20  # newest versions per project considered for a new dependency
+HTTP_CACHE_DIR = Path(Path.home(), ".cache", "minecraft_mod_updater", "http")
+HTTP_CACHE_MAX_AGE = 3600  # seconds a cached API response is used without asking Modrinth
+# The bulk hash lookups are POSTs but read-only queries; caching them is what lets --offline plan updates
+CACHEABLE_POSTS = ("/version_files", "/version_files/update")
+ARTIFACT_STORE_DIR = Path(Path.home(), ".cache", "minecraft_mod_updater", "artifacts")
 
 # Default headers for API requests
 HEADERS = {
@@ -25,10 +42,128 @@ HEADERS = {
     "Accept": "application/json"
 }
 
+def hash_file(path):
+    """Return the (sha1, sha512) hex digests Modrinth uses to identify a file."""
+    sha1, sha512 = hashlib.sha1(), hashlib.sha512()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_CHUNK), b''):
+            sha1.update(block)
+            sha512.update(block)
+    return sha1.hexdigest(), sha512.hexdigest()
+
+def primary_file(version):
+    """The file Modrinth marks as primary for a version (the first one otherwise)."""
+    return next((f for f in version['files'] if f.get('primary')), version['files'][0])
+
+class HttpCache:
+    """Disk cache for Modrinth API responses.
+    
+    Responses are reused while fresh (the server's Cache-Control max-age,
+    capped at max_age), revalidated with If-None-Match when an ETag is known,
+    and served regardless of age in offline mode. GETs are cached, and of the
+    POSTs only the read-only lookups in CACHEABLE_POSTS, keyed by their body.
+    One JSON file per request, written atomically, so worker threads can
+    share the cache.
+    """
+    
+    def __init__(self, cache_dir=HTTP_CACHE_DIR, max_age=HTTP_CACHE_MAX_AGE, offline=False):
+        self.cache_dir = Path(cache_dir)
+        self.max_age = max_age
+        self.offline = offline
+        self.stats = {'hits': 0, 'revalidated': 0, 'fetched': 0}
+        self._lock = threading.Lock()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+    
+    def request(self, session, method, url, params=None, json_body=None):
+        """Perform (or answer from the cache) one API request; returns a requests.Response."""
+        import requests
+        
+        if method != "GET" and not url.endswith(CACHEABLE_POSTS):
+            if self.offline:
+                raise requests.exceptions.ConnectionError(f"offline: {method} {url} is never cached")
+            return session.request(method, url, params=params, json=json_body)
+        
+        key = hashlib.sha256(json.dumps([method, url, params, json_body], sort_keys=True).encode('utf-8')).hexdigest()
+        path = Path(self.cache_dir, key[:2], key + ".json")
+        entry = self._load(path)
+        
+        if entry and (self.offline or time.time() - entry['stored'] < self._lifetime(entry)):
+            self._count('hits')
+            return self._response(url, entry)
+        if self.offline:
+            raise requests.exceptions.ConnectionError(f"offline and not cached: {method} {url}")
+        
+        headers = {"If-None-Match": entry['etag']} if entry and entry.get('etag') else {}
+        response = session.request(method, url, params=params, json=json_body, headers=headers)
+        if response.status_code == 304 and entry:
+            self._count('revalidated')
+            entry['stored'] = time.time()
+            entry['max_age'] = self._server_max_age(response.headers)
+            self._save(path, entry)
+            return self._response(url, entry)
+        
+        self._count('fetched')
+        cache_control = response.headers.get('Cache-Control', '').lower()
+        if response.status_code in (200, 404) and 'no-store' not in cache_control:
+            self._save(path, {
+                'url': url,
+                'status': response.status_code,
+                'etag': response.headers.get('ETag'),
+                'stored': time.time(),
+                'max_age': 0 if 'no-cache' in cache_control else self._server_max_age(response.headers),
+                'body': response.text,
+            })
+        return response
+    
+    def _server_max_age(self, headers):
+        """The max-age the server allows in Cache-Control, or None if it doesn't say."""
+        for directive in headers.get('Cache-Control', '').split(','):
+            name, _, value = directive.strip().partition('=')
+            if name.lower() == 'max-age' and value.isdigit():
+                return int(value)
+        return None
+    
+    def _lifetime(self, entry):
+        """Seconds an entry stays fresh: the server's max-age capped at ours."""
+        if entry['max_age'] is None:
+            return self.max_age
+        return min(entry['max_age'], self.max_age)
+    
+    def _response(self, url, entry):
+        import requests
+        response = requests.Response()
+        response.status_code = entry['status']
+        response._content = entry['body'].encode('utf-8')
+        response.encoding = 'utf-8'
+        response.url = url
+        response.headers['Content-Type'] = 'application/json'
+        return response
+    
+    def _load(self, path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def _save(self, path, entry):
+        path.parent.mkdir(exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+    
+    def _count(self, stat):
+        with self._lock:
+            self.stats[stat] += 1
+
 class ModUpdater:
-    def __init__(self, mods_dir=None, backup_dir=None, minecraft_version=None, loader=None):
+    def __init__(self, mods_dir=None, backup_dir=None, minecraft_version=None, loader=None,
+                 workers=DEFAULT_WORKERS, lookup="hash", rescan=False, keep_backups=BACKUP_KEEP,
+                 resolve_deps=True, http_cache=None, name=None):
         """Initialize the mod updater with directories and Minecraft version."""
         self.mods_dir = self._get_default_mods_dir() if mods_dir is None else Path(mods_dir)
+        self.name = name or self.mods_dir.resolve().parent.name or str(self.mods_dir)
         self.backup_dir = Path(self.mods_dir, "../mod_backups") if backup_dir is None else Path(backup_dir)
         self.minecraft_version = minecraft_version
         self.loader = loader
@@ -36,6 +171,26 @@ class ModUpdater:
         self.update_count = 0
         self.check_count = 0
         self.not_found_count = 0
+        self.workers = max(1, workers)
+        self.lookup = lookup
+        self.rescan = rescan
+        self.keep_backups = keep_backups
+        self.resolve_deps = resolve_deps
+        self.http_cache = http_cache
+        self.offline = bool(http_cache and http_cache.offline)
+        self.installed_projects = set()  # Modrinth project ids of the jars we identified
+        self.project_by_sha1 = {}        # jar sha1 -> Modrinth project id
+        self.dependency_count = 0
+        self.index_path = Path(self.mods_dir, INDEX_NAME)
+        self._index = {}      # filename -> cached scan entry from the last run
+        self._new_index = {}  # entries for the files seen in this scan
+        self.reused_count = 0
+        
+        # Worker threads share the counters and mods_data; each keeps its own
+        # HTTP session and buffers its output so every mod prints as one block.
+        self._lock = threading.Lock()
+        self._print_lock = threading.Lock()
+        self._local = threading.local()
         
         # Create backup directory if it doesn't exist
         self.backup_dir.mkdir(parents=True, exist_ok=True)
@@ -57,6 +212,53 @@ class ModUpdater:
         
         # Fallback
         return Path(home, ".minecraft", "mods")
+    
+    def _session(self):
+        """Return this thread's HTTP session (keeps connections to Modrinth alive)."""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            import requests
+            session = requests.Session()
+            session.headers.update(HEADERS)
+            self._local.session = session
+        return session
+    
+    def _api(self, method, url, params=None, json_body=None):
+        """Call the Modrinth API, through the HTTP cache when one is configured."""
+        if self.http_cache:
+            return self.http_cache.request(self._session(), method, url, params, json_body)
+        return self._session().request(method, url, params=params, json=json_body)
+    
+    def _record_project(self, mod_info, project_id):
+        """Remember which Modrinth project an installed jar belongs to."""
+        with self._lock:
+            self.installed_projects.add(project_id)
+            self.project_by_sha1[mod_info['sha1']] = project_id
+    
+    def _count(self, counter):
+        """Increment one of the result counters from any worker thread."""
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+    
+    def _log(self, message):
+        """Print, or buffer while a worker is handling a mod so its lines stay together."""
+        lines = getattr(self._local, 'lines', None)
+        if lines is None:
+            with self._print_lock:
+                print(message)
+        else:
+            lines.append(message)
+    
+    def _run_buffered(self, func, *args):
+        """Run func with output buffered, then print its lines as one block."""
+        self._local.lines = []
+        try:
+            return func(*args)
+        finally:
+            lines, self._local.lines = self._local.lines, None
+            if lines:
+                with self._print_lock:
+                    print("\n".join(lines), flush=True)
         
     def scan_mods(self):
         """Scan the mods directory and identify all installed mods."""
@@ -73,74 +275,136 @@ class ModUpdater:
             return False
             
         print(f"Found {len(mod_files)} mod files.")
+        if not self.rescan:
+            self._index = self._load_index()
         
         # Process each mod file to extract information
-        with ThreadPoolExecutor() as executor:
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
             executor.map(self.process_mod_file, mod_files)
+        
+        self._save_index()
+        if self.reused_count:
+            print(f"{self.reused_count} unchanged mods taken from the scan index.")
             
         print(f"Successfully processed {len(self.mods_data)} mods.")
         return True
+    
+    def _load_index(self):
+        """Read the scan index written by the previous run (empty if missing or stale)."""
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get('version') != INDEX_VERSION:
+            return {}
+        return data.get('files', {})
+    
+    def _save_index(self):
+        """Write the entries for the jars present now; files that are gone drop out."""
+        tmp_path = self.index_path.with_name(self.index_path.name + ".tmp")
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': INDEX_VERSION, 'files': self._new_index}, f)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            print(f"Warning: Could not save scan index: {e}")
         
     def process_mod_file(self, mod_path):
-        """Extract metadata from a mod file."""
+        """Extract metadata from a mod file (or reuse it from the scan index)."""
         try:
-            mod_id = None
-            mod_name = None
-            mod_loader = None
-            
-            # Try to extract the fabric.mod.json or META-INF/mods.toml
-            with zipfile.ZipFile(mod_path, 'r') as zip_ref:
-                file_list = zip_ref.namelist()
-                
-                # Check for Fabric mod
-                if 'fabric.mod.json' in file_list:
-                    with zip_ref.open('fabric.mod.json') as f:
-                        data = json.load(f)
-                        mod_id = data.get('id')
-                        mod_name = data.get('name')
-                        mod_loader = 'fabric'
-                
-                # Check for Forge mod
-                elif 'META-INF/mods.toml' in file_list:
-                    with zip_ref.open('META-INF/mods.toml') as f:
-                        content = f.read().decode('utf-8')
-                        # Basic parsing of TOML
-                        for line in content.split('\n'):
-                            if line.startswith('modId'):
-                                mod_id = line.split('=')[1].strip().strip('"\'')
-                            elif line.startswith('displayName'):
-                                mod_name = line.split('=')[1].strip().strip('"\'')
-                            if mod_id and mod_name:
-                                break
-                        mod_loader = 'forge'
-                
-                # Check for mcmod.info (older Forge)
-                elif 'mcmod.info' in file_list:
-                    with zip_ref.open('mcmod.info') as f:
-                        data = json.load(f)
-                        if isinstance(data, list) and data:
-                            mod_id = data[0].get('modid')
-                            mod_name = data[0].get('name')
-                        elif isinstance(data, dict) and 'modList' in data:
-                            mod_id = data['modList'][0].get('modid')
-                            mod_name = data['modList'][0].get('name')
-                        mod_loader = 'forge'
-            
-            # If we found a mod ID
-            if mod_id and (self.loader is None or self.loader == mod_loader):
-                self.mods_data[mod_path.name] = {
-                    'path': str(mod_path),
+            stat = mod_path.stat()
+            entry = self._index.get(mod_path.name)
+            if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+                # Unchanged since the last scan: no need to open or hash the jar
+                self._count('reused_count')
+                quiet = True
+            else:
+                mod_id, mod_name, mod_loader = self._read_mod_metadata(mod_path)
+                sha1, sha512 = hash_file(mod_path)  # every jar, so the bulk lookup can identify it
+                entry = {
+                    'size': stat.st_size,
+                    'mtime_ns': stat.st_mtime_ns,
                     'mod_id': mod_id,
-                    'mod_name': mod_name or mod_id,  # Use ID as fallback if name not found
-                    'current_file': mod_path.name,
-                    'loader': mod_loader
+                    'mod_name': mod_name,
+                    'loader': mod_loader,
+                    'sha1': sha1,
+                    'sha512': sha512,
                 }
-                print(f"Found mod: {mod_id} ({mod_path.name})")
+                quiet = False
+            with self._lock:
+                self._new_index[mod_path.name] = entry
+            
+            mod_id = entry['mod_id']
+            mod_loader = entry['loader']
+            
+            # Jars without metadata are kept too: Modrinth may still know them by hash
+            if mod_id is None or self.loader is None or self.loader == mod_loader:
+                with self._lock:
+                    self.mods_data[mod_path.name] = {
+                        'path': str(mod_path),
+                        'mod_id': mod_id,
+                        'mod_name': entry['mod_name'] or mod_id or mod_path.stem,  # fall back to ID, then file name
+                        'current_file': mod_path.name,
+                        'loader': mod_loader,
+                        'sha1': entry['sha1'],
+                        'sha512': entry['sha512']
+                    }
+                if not quiet:
+                    self._log(f"Found mod: {mod_id} ({mod_path.name})" if mod_id else
+                              f"Warning: Could not identify mod ID for {mod_path.name}; looking it up by hash")
             else:
-                print(f"Warning: Could not identify mod ID for {mod_path.name}")
+                self._log(f"Skipping {mod_path.name}: a {mod_loader} mod, not {self.loader}")
                 
         except Exception as e:
-            print(f"Error processing mod file {mod_path.name}: {e}")
+            self._log(f"Error processing mod file {mod_path.name}: {e}")
+    
+    def _read_mod_metadata(self, mod_path):
+        """Read (mod_id, mod_name, loader) from the jar's fabric.mod.json, mods.toml or mcmod.info."""
+        mod_id = None
+        mod_name = None
+        mod_loader = None
+        
+        # Try to extract the fabric.mod.json or META-INF/mods.toml
+        with zipfile.ZipFile(mod_path, 'r') as zip_ref:
+            file_list = zip_ref.namelist()
+            
+            # Check for Fabric mod
+            if 'fabric.mod.json' in file_list:
+                with zip_ref.open('fabric.mod.json') as f:
+                    data = json.load(f)
+                    mod_id = data.get('id')
+                    mod_name = data.get('name')
+                    mod_loader = 'fabric'
+            
+            # Check for Forge mod
+            elif 'META-INF/mods.toml' in file_list:
+                with zip_ref.open('META-INF/mods.toml') as f:
+                    content = f.read().decode('utf-8')
+                    # Basic parsing of TOML
+                    for line in content.split('\n'):
+                        if line.startswith('modId'):
+                            mod_id = line.split('=')[1].strip().strip('"\'')
+                        elif line.startswith('displayName'):
+                            mod_name = line.split('=')[1].strip().strip('"\'')
+                        if mod_id and mod_name:
+                            break
+                    mod_loader = 'forge'
+            
+            # Check for mcmod.info (older Forge)
+            elif 'mcmod.info' in file_list:
+                with zip_ref.open('mcmod.info') as f:
+                    data = json.load(f)
+                    if isinstance(data, list) and data:
+                        mod_id = data[0].get('modid')
+                        mod_name = data[0].get('name')
+                    elif isinstance(data, dict) and 'modList' in data:
+                        mod_id = data['modList'][0].get('modid')
+                        mod_name = data['modList'][0].get('name')
+                    mod_loader = 'forge'
+        
+        return mod_id, mod_name, mod_loader
     
     def update_mods(self):
         """Update all mods to their latest versions using Modrinth."""
@@ -148,103 +412,438 @@ class ModUpdater:
             print("No mods data available. Run scan_mods() first.")
             return
             
-        print(f"Checking {len(self.mods_data)} mods for updates on Modrinth...")
+        print(f"Checking {len(self.mods_data)} mods for updates on Modrinth "
+              f"({self.workers} workers)...")
         
-        # Process each mod
-        for mod_name, mod_info in self.mods_data.items():
-            try:
-                self.check_count += 1
-                self.update_modrinth_mod(mod_info)
-            except Exception as e:
-                print(f"Error updating {mod_name}: {e}")
+        # Phase 1: find the newest version of every mod
+        updates = self.check_updates(list(self.mods_data.items()))
+        
+        # Phase 2: work out the full install plan, dependencies included
+        if updates and self.resolve_deps:
+            updates = self.resolve_dependencies(updates)
+        
+        # Phase 3: download everything in the plan concurrently
+        if updates and self.offline:
+            print(f"Offline: {len(updates)} downloads planned but not performed:")
+            for update in updates:
+                print(f"  {update['new_filename']}")
+        elif updates:
+            print(f"Downloading {len(updates)} files...")
+            from concurrent.futures import ThreadPoolExecutor
+            # Identical jars under different names update to the same file; those go one at a time
+            first, repeats, targets = [], [], set()
+            for update in updates:
+                (repeats if update['new_filename'] in targets else first).append(update)
+                targets.add(update['new_filename'])
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                list(executor.map(self._apply_update, first))
+            for update in repeats:
+                self._apply_update(update)
                 
         print(f"Update complete. Checked {self.check_count} mods.")
         print(f"Updated {self.update_count} mods.")
+        if self.dependency_count:
+            print(f"Installed {self.dependency_count} new dependencies.")
         print(f"Could not find {self.not_found_count} mods on Modrinth.")
+        if self.http_cache:
+            stats = self.http_cache.stats
+            print(f"HTTP cache: {stats['hits']} hits, {stats['revalidated']} revalidated, "
+                  f"{stats['fetched']} fetched.")
+    
+    def check_updates(self, items):
+        """Return the available updates for (name, mod_info) items, without downloading."""
+        from concurrent.futures import ThreadPoolExecutor
+        
+        # Identify jars by hash in a couple of bulk requests
+        updates, remaining = [], items
+        if self.lookup == "hash":
+            updates, remaining = self.bulk_check(remaining)
+        
+        # Without mod metadata there is nothing to search for by name
+        for name, info in remaining:
+            if not info['mod_id']:
+                self._log(f"Could not find {name} on Modrinth (unknown hash, no mod metadata)")
+                self._count('not_found_count')
+        remaining = [(name, info) for name, info in remaining if info['mod_id']]
+        if remaining and self.lookup == "hash":
+            print(f"{len(remaining)} mods not recognised by hash, looking them up by name...")
+        
+        # Look the rest up by id/search concurrently
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            updates += [u for u in executor.map(self._check_one, remaining) if u]
+        return updates
+    
+    def bulk_check(self, items):
+        """Check mods via Modrinth's hash endpoints in a constant number of requests.
+
+        Returns (updates, unresolved items) where the unresolved jars are the ones
+        Modrinth doesn't know by hash (local builds, other sites).
+        """
+        import requests
+        
+        by_hash = {}  # identical jars under different names share a hash
+        for name, info in items:
+            by_hash.setdefault(info['sha1'], []).append((name, info))
+        try:
+            response = self._api("POST", f"{MODRINTH_API_BASE}/version_files",
+                                 json_body={"hashes": sorted(by_hash), "algorithm": "sha1"})
+            response.raise_for_status()
+            current = response.json()
+            
+            # One update query per loader, since the filter applies to the whole request
+            groups = {}
+            for sha1, version in current.items():
+                info = by_hash[sha1][0][1]
+                # Jars without metadata take the loader Modrinth lists for them
+                loader = self.loader or info['loader'] or next(iter(version.get('loaders') or []), None)
+                groups.setdefault(loader, []).append(sha1)
+            for hashes in groups.values():
+                hashes.sort()  # stable request bodies, so the HTTP cache can match them
+            latest = {}
+            for loader, hashes in groups.items():
+                body = {"hashes": hashes, "algorithm": "sha1"}
+                if loader:
+                    body["loaders"] = [loader]
+                if self.minecraft_version:
+                    body["game_versions"] = [self.minecraft_version]
+                response = self._api("POST", f"{MODRINTH_API_BASE}/version_files/update", json_body=body)
+                response.raise_for_status()
+                latest.update(response.json())
+        except requests.exceptions.RequestException as e:
+            print(f"Bulk hash lookup failed ({e}); falling back to per-mod lookups.")
+            return [], items
+        
+        updates = []
+        for sha1, version in current.items():
+            newest = latest.get(sha1)
+            for name, info in by_hash[sha1]:
+                self._count('check_count')
+                self._record_project(info, version['project_id'])
+                if newest is None:
+                    self._log(f"No compatible versions found for {info['mod_name']}")
+                elif newest['id'] == version['id']:
+                    self._log(f"Mod {info['mod_name']} is already up to date")
+                else:
+                    update = self._make_update(newest, info)
+                    self._log(f"Update available for {info['mod_name']}: {update['new_filename']}")
+                    updates.append(update)
+        return updates, [item for sha1, entries in by_hash.items() if sha1 not in current for item in entries]
+    
+    def _check_one(self, item):
+        """Check a single mod for an update with its output kept together."""
+        mod_name, mod_info = item
+        self._count('check_count')
+        try:
+            return self._run_buffered(self.update_modrinth_mod, mod_info)
+        except Exception as e:
+            self._log(f"Error updating {mod_name}: {e}")
+            return None
+    
+    def _make_update(self, version, mod_info, required_by=None):
+        """Describe the download of a version: an update of mod_info, or a new dependency."""
+        new_file = primary_file(version)
+        return {
+            'mod_info': mod_info,
+            'project_id': version.get('project_id'),
+            'download_url': new_file['url'],
+            'new_filename': new_file['filename'],
+            'hashes': new_file.get('hashes', {}),
+            'dependencies': version.get('dependencies') or [],
+            'loaders': version.get('loaders') or [],
+            'required_by': required_by,
+        }
+    
+    def resolve_dependencies(self, updates):
+        """Extend the updates with the required dependencies they don't have yet.
+        
+        Each level of the dependency tree costs at most two bulk requests
+        (/projects?ids= for unpinned dependencies, /versions?ids= for the
+        candidate versions), however many dependencies there are. Updates that
+        declare themselves incompatible with something installed are dropped.
+        """
+        import requests
+        
+        planned = set(self.installed_projects)
+        planned.update(u['project_id'] for u in updates if u['project_id'])
+        
+        plan = []
+        for update in updates:
+            clashes = [d['project_id'] for d in update['dependencies']
+                       if d.get('dependency_type') == 'incompatible' and d.get('project_id') in planned]
+            if clashes:
+                name = update['mod_info']['mod_name']
+                print(f"Skipping update of {name}: incompatible with installed project(s) {', '.join(clashes)}")
+            else:
+                plan.append(update)
+        updates = list(plan)
+        
+        frontier = plan
+        try:
+            while frontier:
+                pinned, unpinned = {}, {}  # version id / project id -> update that requires it
+                for update in frontier:
+                    for dep in update['dependencies']:
+                        if dep.get('dependency_type') != 'required' or dep.get('project_id') in planned:
+                            continue
+                        if dep.get('version_id'):
+                            pinned[dep['version_id']] = update
+                        elif dep.get('project_id'):
+                            unpinned[dep['project_id']] = update
+                if not pinned and not unpinned:
+                    break
+                
+                candidates = {}  # version id -> project id, for unpinned dependencies
+                if unpinned:
+                    for project in self._get_many("projects", unpinned):
+                        for version_id in project['versions'][-VERSION_WINDOW:]:
+                            candidates[version_id] = project['id']
+                versions = {v['id']: v for v in self._get_many("versions", list(pinned) + list(candidates))}
+                
+                chosen = []
+                for version_id, update in pinned.items():
+                    if version_id in versions:
+                        chosen.append((versions[version_id], update))
+                for project_id, update in unpinned.items():
+                    version = self._newest_compatible(
+                        [v for vid, v in versions.items() if candidates.get(vid) == project_id], update)
+                    if version:
+                        chosen.append((version, update))
+                    else:
+                        print(f"Warning: No compatible version of dependency {project_id} "
+                              f"(required by {self._plan_name(update)})")
+                
+                frontier = []
+                for version, update in chosen:
+                    if version['project_id'] in planned:
+                        continue
+                    planned.add(version['project_id'])
+                    dependency = self._make_update(version, None, required_by=self._plan_name(update))
+                    print(f"Dependency {dependency['new_filename']} required by {dependency['required_by']}")
+                    frontier.append(dependency)
+                plan += frontier
+        except requests.exceptions.RequestException as e:
+            print(f"Error resolving dependencies on Modrinth: {e}")
+        
+        print(f"Install plan: {len(updates)} updates, {len(plan) - len(updates)} new dependencies.")
+        return plan
+    
+    def _get_many(self, endpoint, ids):
+        """Fetch many projects or versions in one request (/projects?ids=, /versions?ids=)."""
+        if not ids:
+            return []
+        response = self._api("GET", f"{MODRINTH_API_BASE}/{endpoint}", params={'ids': json.dumps(sorted(ids))})
+        response.raise_for_status()
+        return response.json()
+    
+    def _newest_compatible(self, versions, update):
+        """Newest version that runs on the requiring mod's loader and our game version."""
+        loaders = {self.loader} if self.loader else set(update['loaders'])
+        if update['mod_info']:
+            loaders.add(update['mod_info']['loader'])
+        compatible = [v for v in versions
+                      if (not loaders or loaders & set(v.get('loaders', [])))
+                      and (not self.minecraft_version or self.minecraft_version in v.get('game_versions', []))]
+        return max(compatible, key=lambda v: v.get('date_published', ''), default=None)
+    
+    def _plan_name(self, update):
+        return update['mod_info']['mod_name'] if update['mod_info'] else update['new_filename']
+    
+    def _apply_update(self, update):
+        """Download one entry of the install plan and swap it in."""
+        mod_info = update['mod_info']
+        old_path = mod_info['path'] if mod_info else None
+        if self._download_and_replace_mod(old_path, update['download_url'], update['new_filename'],
+                                          update.get('hashes')):
+            if mod_info:
+                self._count('update_count')
+                self._log(f"Updated {mod_info['mod_name']} from {mod_info['current_file']} to {update['new_filename']}")
+            else:
+                self._count('dependency_count')
+                self._log(f"Installed {update['new_filename']} (required by {update['required_by']})")
+        
+    # Backups are content-addressed: every distinct jar is stored once under
+    # store/<sha1[:2]>/<sha1>.jar and a snapshot is a manifest plus hardlinks.
+    def backup_mods(self, prune=True):
+        """Snapshot the mods directory into the backup store."""
+        files = self._current_files()
+        latest = self._snapshots()[-1:]
+        if latest and self._read_manifest(latest[0]) == files:
+            print(f"No changes since {latest[0].name}; no new backup needed.")
+            return latest[0]
         
-    def backup_mods(self):
-        """Create a backup of all mods."""
         backup_folder = Path(self.backup_dir, f"backup_{self.timestamp}")
-        backup_folder.mkdir(parents=True, exist_ok=True)
+        suffix = 1
+        while backup_folder.exists():
+            backup_folder = Path(self.backup_dir, f"backup_{self.timestamp}_{suffix}")
+            suffix += 1
+        backup_folder.mkdir(parents=True)
         
         print(f"Creating backup in {backup_folder}")
         
-        for mod_name, mod_info in self.mods_data.items():
+        stored = 0
+        manifest = {}
+        for name, sha1 in files.items():
             try:
-                src_path = Path(mod_info['path'])
-                dst_path = Path(backup_folder, src_path.name)
-                shutil.copy2(src_path, dst_path)
+                blob = self._blob_path(sha1)
+                if not blob.exists():
+                    blob.parent.mkdir(parents=True, exist_ok=True)
+                    tmp_path = blob.with_name(blob.name + ".tmp")
+                    shutil.copy2(Path(self.mods_dir, name), tmp_path)
+                    os.replace(tmp_path, blob)
+                    stored += 1
+                try:
+                    os.link(blob, Path(backup_folder, name))
+                except OSError:
+                    shutil.copy2(blob, Path(backup_folder, name))  # no hardlinks on this filesystem
+                manifest[name] = {'sha1': sha1, 'size': blob.stat().st_size}
             except Exception as e:
-                print(f"Error backing up {mod_name}: {e}")
+                print(f"Error backing up {name}: {e}")
+        
+        with open(Path(backup_folder, "manifest.json"), 'w', encoding='utf-8') as f:
+            json.dump({'created': self.timestamp, 'mods_dir': str(self.mods_dir), 'files': manifest}, f, indent=2)
                 
-        print(f"Backup complete. {len(self.mods_data)} mods backed up.")
+        print(f"Backup complete. {len(manifest)} mods backed up, {stored} new files stored.")
+        if prune:
+            self.prune_backups()
+        return backup_folder
+    
+    def _current_files(self):
+        """Return {jar name: sha1} for the mods directory, reusing hashes from the scan."""
+        files = {}
+        for path in sorted(self.mods_dir.glob("*.jar")):
+            entry = self._new_index.get(path.name) or {}
+            files[path.name] = entry.get('sha1') or hash_file(path)[0]
+        return files
+    
+    def _blob_path(self, sha1):
+        return Path(self.backup_dir, "store", sha1[:2], sha1 + ".jar")
+    
+    def _snapshots(self):
+        """Snapshot folders that have a manifest, oldest first."""
+        return sorted(p.parent for p in self.backup_dir.glob("backup_*/manifest.json"))
+    
+    def _read_manifest(self, snapshot):
+        """Return {jar name: sha1} for a snapshot, or None for an old full-copy backup."""
+        try:
+            with open(Path(snapshot, "manifest.json"), 'r', encoding='utf-8') as f:
+                return {name: entry['sha1'] for name, entry in json.load(f)['files'].items()}
+        except (OSError, ValueError, KeyError):
+            return None
+    
+    def prune_backups(self, keep=None):
+        """Drop all but the newest `keep` snapshots and store files nothing refers to."""
+        keep = self.keep_backups if keep is None else keep
+        snapshots = self._snapshots()
+        for snapshot in snapshots[:max(0, len(snapshots) - keep)]:
+            shutil.rmtree(snapshot)
+            print(f"Pruned old backup {snapshot.name}")
+        
+        referenced = set()
+        for snapshot in self._snapshots():
+            referenced.update((self._read_manifest(snapshot) or {}).values())
+        freed = 0
+        for blob in Path(self.backup_dir, "store").glob("*/*.jar"):
+            if blob.stem not in referenced:
+                freed += blob.stat().st_size
+                blob.unlink()
+        if freed:
+            print(f"Freed {freed / (1024 * 1024):.1f} MB from the backup store.")
+    
+    def list_backups(self):
+        """Print the snapshots available to --rollback."""
+        folders = sorted(p for p in self.backup_dir.glob("backup_*") if p.is_dir())
+        if not folders:
+            print(f"No backups in {self.backup_dir}")
+            return
+        for folder in folders:
+            manifest = self._read_manifest(folder)
+            if manifest is None:
+                print(f"{folder.name}  {len(list(folder.glob('*.jar')))} mods (full copy)")
+            else:
+                print(f"{folder.name}  {len(manifest)} mods")
+    
+    def rollback(self, snapshot_name):
+        """Restore the mods directory to a snapshot ('latest' for the newest one)."""
+        if snapshot_name == "latest":
+            snapshots = self._snapshots()
+            snapshot = snapshots[-1] if snapshots else None
+        else:
+            snapshot = Path(self.backup_dir, snapshot_name)
+        if snapshot is None or not snapshot.is_dir():
+            print(f"Error: Backup {snapshot_name} not found in {self.backup_dir}.")
+            return False
+        
+        manifest = self._read_manifest(snapshot)
+        if manifest is None:
+            # Old full-copy backup: the jars themselves are the source
+            sources = {p.name: (p, None) for p in snapshot.glob("*.jar")}
+        else:
+            sources = {name: (self._blob_path(sha1), sha1) for name, sha1 in manifest.items()}
+        missing = [name for name, (src, _) in sources.items() if not src.exists()]
+        if missing:
+            print(f"Error: Backup {snapshot.name} is incomplete (missing {', '.join(missing)}).")
+            return False
+        
+        # Snapshot the current state first so the rollback itself can be undone
+        current = self._current_files()
+        if current:
+            self.backup_mods(prune=False)
+        
+        print(f"Rolling back {self.mods_dir} to {snapshot.name}")
+        restored = removed = 0
+        for name, (src, sha1) in sources.items():
+            if sha1 is not None and current.get(name) == sha1:
+                continue
+            part_path = Path(self.mods_dir, name + ".part")
+            shutil.copy2(src, part_path)
+            os.replace(part_path, Path(self.mods_dir, name))
+            restored += 1
+        for name in current:
+            if name not in sources:
+                os.remove(Path(self.mods_dir, name))
+                removed += 1
+        
+        print(f"Rollback complete. {restored} mods restored, {removed} removed.")
+        return True
         
     def update_modrinth_mod(self, mod_info):
-        """Update a mod from Modrinth."""
+        """Look a mod up on Modrinth; returns the update to download, or None."""
+        import requests
+
         mod_id = mod_info['mod_id']
         mod_name = mod_info['mod_name']
-        current_file = mod_info['current_file']
         
-        print(f"Checking for updates for mod: {mod_name} ({mod_id})")
+        self._log(f"Checking for updates for mod: {mod_name} ({mod_id})")
         
         # First try direct lookup by mod_id
         try:
             # Try to find the project directly by its ID
-            response = requests.get(f"{MODRINTH_API_BASE}/project/{mod_id}", headers=HEADERS)
+            response = self._api("GET", f"{MODRINTH_API_BASE}/project/{mod_id}")
             
             # If we get a 404, try to search for the project instead
             if response.status_code == 404:
-                print(f"Project {mod_id} not found directly, trying search...")
+                self._log(f"Project {mod_id} not found directly, trying search...")
                 return self._search_and_update_mod(mod_info)
                 
             response.raise_for_status()  # Handle other errors
             project = response.json()
-            project_id = project['id']
-            
-            # Get latest version compatible with the specified Minecraft version
-            version_url = f"{MODRINTH_API_BASE}/project/{project_id}/version"
-            if self.minecraft_version:
-                version_url += f"?game_versions=[\"{self.minecraft_version}\"]"
-                
-            response = requests.get(version_url, headers=HEADERS)
-            response.raise_for_status()
-            versions = response.json()
-            
-            if not versions:
-                print(f"No compatible versions found for {mod_name}")
-                return
-                
-            # Get the latest version
-            latest_version = versions[0]
-            
-            # Download the latest version
-            download_url = latest_version['files'][0]['url']
-            new_filename = latest_version['files'][0]['filename']
-            
-            # Skip if already up to date
-            if new_filename == current_file:
-                print(f"Mod {mod_name} is already up to date")
-                return
-                
-            # Download and update the mod
-            self._download_and_replace_mod(mod_info['path'], download_url, new_filename)
-            self.update_count += 1
-            
-            print(f"Updated {mod_name} from {current_file} to {new_filename}")
+            self._record_project(mod_info, project['id'])
+            return self._latest_update(project['id'], mod_info)
             
         except requests.exceptions.RequestException as e:
             if "404" in str(e):
-                self._search_and_update_mod(mod_info)
-            else:
-                print(f"Error fetching data from Modrinth for {mod_name}: {e}")
+                return self._search_and_update_mod(mod_info)
+            self._log(f"Error fetching data from Modrinth for {mod_name}: {e}")
         except Exception as e:
-            print(f"Error updating mod {mod_name}: {e}")
+            self._log(f"Error updating mod {mod_name}: {e}")
+        return None
     
     def _search_and_update_mod(self, mod_info):
-        """Search for a mod on Modrinth and update it if found."""
+        """Search for a mod on Modrinth; returns the update to download, or None."""
+        import requests
+
         mod_id = mod_info['mod_id']
         mod_name = mod_info['mod_name']
-        current_file = mod_info['current_file']
         
         try:
             # Search for the mod using both ID and name
@@ -262,7 +861,7 @@ class ModUpdater:
                     'facets': '[[\"project_type:mod\"]]'  # Only search for mods
                 }
                 
-                response = requests.get(search_url, headers=HEADERS, params=params)
+                response = self._api("GET", search_url, params=params)
                 response.raise_for_status()
                 search_results = response.json()
                 
@@ -295,69 +894,264 @@ class ModUpdater:
             
             # If we found a project
             if project:
-                project_id = project['project_id']
-                
-                # Get latest version compatible with the specified Minecraft version
-                version_url = f"{MODRINTH_API_BASE}/project/{project_id}/version"
-                if self.minecraft_version:
-                    version_url += f"?game_versions=[\"{self.minecraft_version}\"]"
-                    
-                response = requests.get(version_url, headers=HEADERS)
-                response.raise_for_status()
-                versions = response.json()
-                
-                if not versions:
-                    print(f"No compatible versions found for {mod_name}")
-                    return
-                    
-                # Get the latest version
-                latest_version = versions[0]
-                
-                # Download the latest version
-                download_url = latest_version['files'][0]['url']
-                new_filename = latest_version['files'][0]['filename']
-                
-                # Skip if already up to date
-                if new_filename == current_file:
-                    print(f"Mod {mod_name} is already up to date")
-                    return
-                    
-                # Download and update the mod
-                self._download_and_replace_mod(mod_info['path'], download_url, new_filename)
-                self.update_count += 1
-                
-                print(f"Updated {mod_name} from {current_file} to {new_filename}")
-            else:
-                print(f"Could not find {mod_name} on Modrinth")
-                self.not_found_count += 1
+                self._record_project(mod_info, project['project_id'])
+                return self._latest_update(project['project_id'], mod_info)
+            self._log(f"Could not find {mod_name} on Modrinth")
+            self._count('not_found_count')
                 
         except requests.exceptions.RequestException as e:
-            print(f"Error searching for {mod_name} on Modrinth: {e}")
+            self._log(f"Error searching for {mod_name} on Modrinth: {e}")
         except Exception as e:
-            print(f"Error updating mod {mod_name}: {e}")
+            self._log(f"Error updating mod {mod_name}: {e}")
+        return None
     
-    def _download_and_replace_mod(self, old_path, download_url, new_filename):
-        """Download a new mod version and replace the old one."""
-        try:
-            # Download the new version
-            response = requests.get(download_url, headers=HEADERS)
-            response.raise_for_status()
+    def _latest_update(self, project_id, mod_info):
+        """Fetch a project's newest compatible version; None if there's nothing to update."""
+        mod_name = mod_info['mod_name']
+        
+        # Get latest version compatible with the specified Minecraft version
+        version_url = f"{MODRINTH_API_BASE}/project/{project_id}/version"
+        if self.minecraft_version:
+            version_url += f"?game_versions=[\"{self.minecraft_version}\"]"
+            
+        response = self._api("GET", version_url)
+        response.raise_for_status()
+        versions = response.json()
+        
+        if not versions:
+            self._log(f"No compatible versions found for {mod_name}")
+            return None
             
-            # Path for the new file
-            new_path = Path(self.mods_dir, new_filename)
+        # Get the latest version
+        update = self._make_update(versions[0], mod_info)
+        
+        # Skip if already up to date
+        if update['new_filename'] == mod_info['current_file']:
+            self._log(f"Mod {mod_name} is already up to date")
+            return None
+        
+        self._log(f"Update available for {mod_name}: {update['new_filename']}")
+        return update
+    
+    def _download_and_replace_mod(self, old_path, download_url, new_filename, hashes=None):
+        """Download a new mod version and replace the old one.
+        
+        The jar is streamed to `<name>.part` (resuming a previous partial download
+        when the server allows it), checked against Modrinth's published hash,
+        renamed into place and only then is the old jar removed.
+        """
+        new_path = Path(self.mods_dir, new_filename)
+        part_path = Path(self.mods_dir, new_filename + ".part")
+        hashes = hashes or {}
+        algorithm = 'sha512' if 'sha512' in hashes else 'sha1' if 'sha1' in hashes else None
+        
+        try:
+            for attempt in range(2):
+                digest = self._stream_to_part(download_url, part_path, algorithm, resume=attempt == 0)
+                if algorithm is None or digest == hashes[algorithm]:
+                    break
+                # Corrupt (or stale partial) download: start over once from scratch
+                part_path.unlink()
+            else:
+                raise ValueError(f"{algorithm} mismatch after download")
             
-            # Write the new file
-            with open(new_path, 'wb') as f:
-                f.write(response.content)
+            os.replace(part_path, new_path)
                 
             # Remove the old file if it's different from the new one
-            if old_path != str(new_path):
+            if old_path and old_path != str(new_path):
                 os.remove(old_path)
                 
             return True
         except Exception as e:
-            print(f"Error downloading mod: {e}")
+            self._log(f"Error downloading mod {new_filename}: {e}")
             return False
+    
+    def _stream_to_part(self, download_url, part_path, algorithm, resume=True):
+        """Stream a download into part_path in chunks; returns its hex digest (or None)."""
+        hasher = hashlib.new(algorithm) if algorithm else None
+        offset = part_path.stat().st_size if resume and part_path.exists() else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        
+        with self._session().get(download_url, headers=headers, stream=True,
+                                 timeout=DOWNLOAD_TIMEOUT) as response:
+            if response.status_code == 416:
+                # The partial file is no use (e.g. larger than the jar); start over
+                return self._stream_to_part(download_url, part_path, algorithm, resume=False)
+            response.raise_for_status()
+            if response.status_code != 206:
+                offset = 0  # server ignored the range; rewrite from the start
+            
+            if offset and hasher:
+                # Hash the bytes we already have before appending the rest
+                with open(part_path, 'rb') as f:
+                    for block in iter(lambda: f.read(HASH_CHUNK), b''):
+                        hasher.update(block)
+            
+            with open(part_path, 'ab' if offset else 'wb') as f:
+                for block in response.iter_content(HASH_CHUNK):
+                    f.write(block)
+                    if hasher:
+                        hasher.update(block)
+        return hasher.hexdigest() if hasher else None
+
+class FleetUpdater:
+    """Update several mods directories in one run.
+    
+    Instances that share a game version and loader are checked together: every
+    distinct jar is looked up once, each needed file is downloaded once into a
+    shared artifact store and then hardlinked (or copied) into every instance
+    that needs it.
+    """
+    
+    def __init__(self, updaters, store_dir=ARTIFACT_STORE_DIR):
+        self.updaters = updaters
+        self.store_dir = Path(store_dir)
+        self.report = {}  # updater -> counters for the final table
+    
+    def run(self, backup=True):
+        """Scan, back up, plan and install every instance; returns False if any step failed."""
+        for updater in self.updaters:
+            print(f"\n=== {updater.name} ({updater.mods_dir}) ===")
+            self.report[updater] = {'mods': 0, 'updated': 0, 'deps': 0, 'not_found': 0, 'failed': 0}
+            if updater.scan_mods():
+                self.report[updater]['mods'] = len(updater.mods_data)
+                if backup:
+                    updater.backup_mods()
+        
+        groups = {}
+        for updater in self.updaters:
+            if updater.mods_data:
+                groups.setdefault((updater.minecraft_version, updater.loader), []).append(updater)
+        
+        for (minecraft_version, loader), group in groups.items():
+            print(f"\n=== Checking {len(group)} instance(s) for Minecraft {minecraft_version or 'any'}"
+                  f"{f' ({loader})' if loader else ''} ===")
+            self._update_group(group)
+        
+        self.print_report()
+        return not any(row['failed'] for row in self.report.values())
+    
+    def _update_group(self, group):
+        """Check the union of the group's jars once, then plan and install per instance."""
+        lead = group[0]
+        unique = {}
+        for updater in group:
+            for name, info in updater.mods_data.items():
+                unique.setdefault(info['sha1'], (name, info))
+        print(f"{sum(len(u.mods_data) for u in group)} jars, {len(unique)} distinct.")
+        found = {u['mod_info']['sha1']: u for u in lead.check_updates(list(unique.values()))}
+        
+        plans = {}
+        for updater in group:
+            updater.installed_projects = {lead.project_by_sha1[info['sha1']]
+                                          for info in updater.mods_data.values()
+                                          if info['sha1'] in lead.project_by_sha1}
+            self.report[updater]['not_found'] = sum(1 for info in updater.mods_data.values()
+                                                    if info['sha1'] not in lead.project_by_sha1)
+            updates = [dict(found[info['sha1']], mod_info=info) for info in updater.mods_data.values()
+                       if info['sha1'] in found]
+            if updates and updater.resolve_deps:
+                print(f"--- {updater.name}: resolving dependencies")
+                updates = updater.resolve_dependencies(updates)  # repeats are answered by the HTTP cache
+            plans[updater] = updates
+        
+        # Download every distinct file once
+        artifacts, stored = {}, {}
+        for updates in plans.values():
+            for update in updates:
+                artifacts.setdefault(update['download_url'], update)
+        if lead.offline:
+            print(f"Offline: {len(artifacts)} downloads planned but not performed.")
+            return
+        if artifacts:
+            print(f"Downloading {len(artifacts)} distinct files for {len(group)} instance(s)...")
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=lead.workers) as executor:
+                stored = dict(zip(artifacts, executor.map(self._fetch_artifact, [lead] * len(artifacts),
+                                                          artifacts.values())))
+        
+        for updater, updates in plans.items():
+            for update in updates:
+                self._install(updater, update, stored[update['download_url']])
+    
+    def _fetch_artifact(self, lead, update):
+        """Download one file into the shared store (once); returns its path or None."""
+        hashes = update.get('hashes') or {}
+        key = hashes.get('sha512') or hashes.get('sha1') or hashlib.sha256(update['download_url'].encode()).hexdigest()
+        folder = Path(self.store_dir, key[:2], key)
+        path = Path(folder, update['new_filename'])
+        if path.exists():
+            return path
+        folder.mkdir(parents=True, exist_ok=True)
+        algorithm = 'sha512' if 'sha512' in hashes else 'sha1' if 'sha1' in hashes else None
+        part_path = Path(folder, update['new_filename'] + ".part")
+        try:
+            digest = lead._stream_to_part(update['download_url'], part_path, algorithm)
+            if algorithm and digest != hashes[algorithm]:
+                part_path.unlink()
+                raise ValueError(f"{algorithm} mismatch after download")
+            os.replace(part_path, path)
+            return path
+        except Exception as e:
+            lead._log(f"Error downloading {update['new_filename']}: {e}")
+            return None
+    
+    def _install(self, updater, update, source):
+        """Link (or copy) a stored file into an instance, replacing the old jar."""
+        mod_info = update['mod_info']
+        row = self.report[updater]
+        if source is None:
+            row['failed'] += 1
+            return
+        new_path = Path(updater.mods_dir, update['new_filename'])
+        part_path = Path(updater.mods_dir, update['new_filename'] + ".part")
+        try:
+            # Already in place when an identical jar under another name was just updated
+            # (renaming a hardlink onto the same file would be a no-op that leaves the .part)
+            if not (new_path.exists() and os.path.samefile(source, new_path)):
+                if part_path.exists():
+                    part_path.unlink()
+                try:
+                    os.link(source, part_path)
+                except OSError:
+                    shutil.copy2(source, part_path)  # different filesystem or no hardlink support
+                os.replace(part_path, new_path)
+            if mod_info and mod_info['path'] != str(new_path):
+                os.remove(mod_info['path'])
+        except Exception as e:
+            print(f"{updater.name}: error installing {update['new_filename']}: {e}")
+            row['failed'] += 1
+            return
+        if mod_info:
+            row['updated'] += 1
+            print(f"{updater.name}: updated {mod_info['mod_name']} to {update['new_filename']}")
+        else:
+            row['deps'] += 1
+            print(f"{updater.name}: installed {update['new_filename']} (required by {update['required_by']})")
+    
+    def print_report(self):
+        """One line per instance."""
+        width = max([len('instance')] + [len(u.name) for u in self.updaters])
+        print(f"\n{'instance':<{width}}  {'mods':>5} {'updated':>8} {'new deps':>9} {'not found':>10} {'failed':>7}")
+        for updater in self.updaters:
+            row = self.report[updater]
+            print(f"{updater.name:<{width}}  {row['mods']:>5} {row['updated']:>8} {row['deps']:>9} "
+                  f"{row['not_found']:>10} {row['failed']:>7}")
+
+def load_instances(path):
+    """Read a fleet manifest: a JSON list of mods dirs, or {"instances": [{...}, ...]}."""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    entries = data.get('instances', []) if isinstance(data, dict) else data
+    base = Path(path).resolve().parent
+    instances = []
+    for entry in entries:
+        if isinstance(entry, str):
+            entry = {'mods_dir': entry}
+        entry = dict(entry)
+        entry['mods_dir'] = str(Path(base, entry['mods_dir']))
+        instances.append(entry)
+    return instances
 
 def main():
     """Main function to run the mod updater."""
@@ -367,17 +1161,94 @@ def main():
     parser.add_argument('--minecraft-version', type=str, help='Minecraft version (e.g., 1.20.1)')
     parser.add_argument('--loader', type=str, choices=['fabric', 'forge'], help='Mod loader type (fabric/forge)')
     parser.add_argument('--no-backup', action='store_true', help='Skip creating backups')
+    parser.add_argument('--keep-backups', type=int, default=BACKUP_KEEP,
+                        help=f'Number of backup snapshots to keep (default: {BACKUP_KEEP})')
+    parser.add_argument('--list-backups', action='store_true', help='List backup snapshots and exit')
+    parser.add_argument('--rollback', metavar='SNAPSHOT',
+                        help="Restore the mods directory to a backup snapshot ('latest' for the newest) and exit")
+    parser.add_argument('--workers', '-j', type=int, default=DEFAULT_WORKERS,
+                        help=f'Concurrent Modrinth lookups and downloads (default: {DEFAULT_WORKERS})')
+    parser.add_argument('--rescan', action='store_true',
+                        help=f'Ignore the scan index ({INDEX_NAME}) and re-read every jar')
+    parser.add_argument('--no-deps', action='store_true', help="Don't install missing required dependencies")
+    parser.add_argument('--http-cache-dir', default=str(HTTP_CACHE_DIR),
+                        help=f'Where Modrinth API responses are cached (default: {HTTP_CACHE_DIR})')
+    parser.add_argument('--cache-max-age', type=int, default=HTTP_CACHE_MAX_AGE,
+                        help=f'Seconds a cached API response is reused without asking Modrinth (default: {HTTP_CACHE_MAX_AGE})')
+    parser.add_argument('--no-http-cache', action='store_true', help="Don't cache Modrinth API responses")
+    parser.add_argument('--offline', action='store_true',
+                        help='Plan updates from cached API responses only; nothing is downloaded')
+    parser.add_argument('--lookup', choices=LOOKUP_MODES, default="hash",
+                        help='Identify mods by file hash in bulk (default) or by mod id/name search per mod')
+    parser.add_argument('--instances', nargs='+', metavar='MODS_DIR',
+                        help='Update several mods directories in one run, sharing lookups and downloads')
+    parser.add_argument('--instances-file', metavar='MANIFEST',
+                        help='JSON list of instances (mods_dir, optional name/backup_dir/minecraft_version/loader)')
+    parser.add_argument('--artifact-store', default=str(ARTIFACT_STORE_DIR),
+                        help=f'Shared download store for --instances (default: {ARTIFACT_STORE_DIR})')
     
     args = parser.parse_args()
     
+    http_cache = None
+    if args.offline and args.no_http_cache:
+        parser.error("--offline needs the HTTP cache")
+    if (args.instances or args.instances_file) and (args.rollback or args.list_backups):
+        parser.error("--rollback and --list-backups work on a single --mods-dir, not with --instances/--instances-file")
+    if not args.no_http_cache:
+        http_cache = HttpCache(args.http_cache_dir, args.cache_max_age, args.offline)
+    
+    if args.instances or args.instances_file:
+        instances = [{'mods_dir': d} for d in args.instances or []]
+        if args.instances_file:
+            instances += load_instances(args.instances_file)
+        for entry in instances:
+            entry.setdefault('name', Path(entry['mods_dir']).resolve().parent.name)
+            if args.backup_dir and 'backup_dir' not in entry:
+                entry['backup_dir'] = str(Path(args.backup_dir, entry['name']))  # one backup folder each
+        updaters = [
+            ModUpdater(
+                mods_dir=entry['mods_dir'],
+                backup_dir=entry.get('backup_dir'),
+                minecraft_version=entry.get('minecraft_version', args.minecraft_version),
+                loader=entry.get('loader', args.loader),
+                workers=args.workers,
+                lookup=args.lookup,
+                rescan=args.rescan,
+                keep_backups=args.keep_backups,
+                resolve_deps=not args.no_deps,
+                http_cache=http_cache,
+                name=entry.get('name')
+            )
+            for entry in instances
+        ]
+        print(f"Minecraft Mod Updater (Modrinth Only) - {len(updaters)} instances")
+        fleet = FleetUpdater(updaters, args.artifact_store)
+        if not fleet.run(backup=not args.no_backup):
+            sys.exit(1)
+        return
+    
     # Initialize updater
     updater = ModUpdater(
         mods_dir=args.mods_dir,
         backup_dir=args.backup_dir,
         minecraft_version=args.minecraft_version,
-        loader=args.loader
+        loader=args.loader,
+        workers=args.workers,
+        lookup=args.lookup,
+        rescan=args.rescan,
+        keep_backups=args.keep_backups,
+        resolve_deps=not args.no_deps,
+        http_cache=http_cache
     )
     
+    if args.list_backups:
+        updater.list_backups()
+        return
+    if args.rollback:
+        if not updater.rollback(args.rollback):
+            sys.exit(1)
+        return
+    
     print("Minecraft Mod Updater (Modrinth Only)")
     print("-" * 40)
     print(f"Mods directory: {updater.mods_dir}")
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Token-saving normalization of repository extracts before they are prompted.
+
+Takes the (path, kind, text) records behind an extract (`extract_records`
+in summarize.py or ghsummarize.py, full or skeleton) and writes them
+compactly: `--- path ---` record headers instead of Filename/Content blocks
+and 80-character separators, trailing whitespace and runs of blank lines
+collapsed, boilerplate license headers stripped, and lockfiles, minified
+bundles and generated code dropped (their paths are kept in one
+`--- omitted ---` record). Savings are estimated in tokens.
+"""
+
+import os
+import re
+import fnmatch
+
+from skeleton import LANGUAGES
+
+# ─────────────── Config ───────────────
+CHARS_PER_TOKEN = 4        # same estimate as llm.py; counting via the API would cost a request
+HEADER_SCAN_LINES = 40     # license headers and generated-code markers live at the top
+MINIFIED_LINE_CHARS = 1000 # a line this long in a short file means a bundle, not source
+
+LOCKFILES = {
+    "package-lock.json", "npm-shrinkwrap.json", "yarn.lock", "pnpm-lock.yaml", "bun.lockb", "poetry.lock",
+    "Pipfile.lock", "uv.lock", "pdm.lock", "Cargo.lock", "composer.lock", "Gemfile.lock", "go.sum",
+    "flake.lock", "mix.lock", "packages.lock.json", "pubspec.lock", "Podfile.lock", "gradle.lockfile",
+}
+MINIFIED_PATTERNS = ("*.min.js", "*.min.css", "*.min.mjs", "*.bundle.js", "*.map")
+GENERATED_PATTERNS = ("*_pb2.py", "*_pb2_grpc.py", "*.pb.go", "*.pb.cc", "*.pb.h", "*.g.dart",
+                      "*.freezed.dart", "*.designer.cs", "*.generated.*", "*_generated.*")
+GENERATED_RE = re.compile(r"@generated|do not edit|code generated by|auto-?generated|"
+                          r"automatically generated|generated by the protocol buffer compiler", re.IGNORECASE)
+LICENSE_RE = re.compile(r"SPDX-License-Identifier|copyright\s*(\(c\)|©|\d{4})|permission is hereby granted|"
+                        r"licensed under the|general public license|all rights reserved", re.IGNORECASE)
+# `#`/`//` line comments, but not shebangs or C preprocessor directives
+LINE_COMMENT_RE = re.compile(r"^\s*(//|#(?!!|\s*(include|define|undef|ifn?def|if|elif|else|endif|pragma|import|"
+                             r"error|line)\b))")
+GENERATED_COMMENT_RE = re.compile(r"^\s*(#|//|/\*|\*|--)")
+SOURCE_EXTENSIONS = set(LANGUAGES) | {".py", ".pyw", ".pyi"}  # content heuristics only apply to code
+BLANK_RUN_RE = re.compile(r"\n{3,}")
+
+NOTE = (
+    "The input has been normalized to save space: each file starts with a `--- path ---` line (outlines "
+    "with `--- path (outline) ---`, unreadable files with a bracketed note on that line), whitespace is "
+    "collapsed, license headers are removed, and lockfiles, minified bundles and generated code are left "
+    "out; their paths are listed under `--- omitted ---`."
+)
+
+# ─────────────── Filters ───────────────
+def drop_reason(path, body):
+    """'lockfile', 'minified' or 'generated' if the file isn't worth prompting, else None."""
+    name = os.path.basename(path)
+    if name in LOCKFILES:
+        return "lockfile"
+    if any(fnmatch.fnmatch(name, p) for p in MINIFIED_PATTERNS):
+        return "minified"
+    if any(fnmatch.fnmatch(name, p) for p in GENERATED_PATTERNS):
+        return "generated"
+    ext = os.path.splitext(name)[1].lower()
+    if ext not in SOURCE_EXTENSIONS and ext != ".css":
+        return None
+    lines = body.splitlines()
+    if lines and len(lines) <= 20 and max(len(l) for l in lines) >= MINIFIED_LINE_CHARS:
+        return "minified"
+    if ext in SOURCE_EXTENSIONS and any(GENERATED_COMMENT_RE.match(line) and GENERATED_RE.search(line)
+                                        for line in lines[:5]):
+        return "generated"
+    return None
+
+def strip_license_header(body):
+    """Remove a leading comment block that is a license notice; returns (body, stripped?).
+
+    Only the first run of `#`/`//` line comments or a `/* ... */` block counts,
+    ending at the first blank or non-comment line, so docstrings and later
+    comments are kept; it must also carry a real cue (SPDX, "Copyright (c)", ...).
+    """
+    lines = body.splitlines()
+    head = 1 if lines and lines[0].startswith("#!") else 0
+    start = head
+    while start < len(lines) and not lines[start].strip():
+        start += 1
+    end = start
+    if start < len(lines) and lines[start].lstrip().startswith("/*"):
+        while end < len(lines) and end - start < HEADER_SCAN_LINES:
+            end += 1
+            if "*/" in lines[end - 1]:
+                break
+        else:
+            return body, False  # unterminated or too long to be a header
+    else:
+        while end < len(lines) and end - start < HEADER_SCAN_LINES and LINE_COMMENT_RE.match(lines[end]):
+            end += 1
+    if end == start or not LICENSE_RE.search("\n".join(lines[start:end])):
+        return body, False
+    while end < len(lines) and not lines[end].strip():
+        end += 1
+    return "\n".join(lines[:head] + lines[end:]), True
+
+def collapse_whitespace(body):
+    """Strip trailing whitespace and squeeze runs of blank lines to one."""
+    return BLANK_RUN_RE.sub("\n\n", "\n".join(line.rstrip() for line in body.splitlines())).strip("\n")
+
+# ─────────────── Stage ───────────────
+def estimate_tokens(text):
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+def minify_records(records, original):
+    """Normalize extract records; `original` is the formatted extract, for the savings. Returns (text, stats)."""
+    stats = {"files": 0, "lockfile": 0, "minified": 0, "generated": 0, "licenses": 0,
+             "tokens_before": estimate_tokens(original)}
+    parts, omitted = [], []
+    for path, kind, body in records:
+        stats["files"] += 1
+        if kind == "marker":
+            parts.append(f"--- {path} --- {body}\n")
+            continue
+        if kind == "full":
+            reason = drop_reason(path, body)
+            if reason:
+                stats[reason] += 1
+                omitted.append(f"{path} ({reason})")
+                continue
+            body, stripped = strip_license_header(body)
+            stats["licenses"] += stripped
+        parts.append(f"--- {path}{' (outline)' if kind == 'outline' else ''} ---\n{collapse_whitespace(body)}\n")
+    if omitted:
+        parts.append("--- omitted ---\n" + "\n".join(omitted) + "\n")
+    result = "".join(parts)
+    stats["tokens_after"] = estimate_tokens(result)
+    return result, stats
+
+def describe_savings(stats):
+    """One line like '≈120k → 81k tokens (-32%); dropped 2 lockfiles, 1 generated; 14 license headers'."""
+    before, after = stats["tokens_before"], stats["tokens_after"]
+    def fmt(tokens):
+        return f"{tokens / 1000:.1f}k" if tokens >= 1000 else str(tokens)
+    line = f"≈{fmt(before)} → {fmt(after)} tokens ({(after - before) / before:+.0%})"
+    dropped = [f"{stats[k]} {k}{'s' if k == 'lockfile' and stats[k] != 1 else ''}"
+               for k in ("lockfile", "minified", "generated") if stats[k]]
+    if dropped:
+        line += "; dropped " + ", ".join(dropped)
+    if stats["licenses"]:
+        line += f"; {stats['licenses']} license header{'s' if stats['licenses'] != 1 else ''}"
+    return line
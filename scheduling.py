@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Job ordering for the bulk GitHub tools (ghextractall, ghsummarize).
+
+Repos are weighted by the `size` the /user/repos API already reports, and the
+largest ones are started first so a single giant repo never ends up running
+alone at the tail of a parallel run (longest-processing-time-first).
+"""
+
+import heapq
+
+# ─────────────── Config ───────────────
+DEFAULT_WORKERS   = 4
+ORDERS            = ("size", "recent", "api")
+# Fixed per-repo cost (clone setup, API round-trips) in the same unit as the
+# GitHub `size` field (KB), so tiny repos are not treated as free.
+CLONE_OVERHEAD_KB = 256
+
+# ─────────────── Colour Codes ───────────────
+RESET = "\033[0m"
+BOLD = "\033[1m"
+CYAN = "\033[36m"
+YELLOW = "\033[33m"
+
+# ─────────────── Helpers ───────────────
+def job_cost(repo):
+    """Estimated cost of processing a repo, in KB-equivalents."""
+    return (repo.get("size") or 0) + CLONE_OVERHEAD_KB
+
+def order_repos(repos, order="size"):
+    """Return repos in processing order: largest first, most recently pushed first, or as listed."""
+    if order == "size":
+        return sorted(repos, key=job_cost, reverse=True)
+    if order == "recent":
+        # ISO-8601 timestamps sort correctly as strings; never-pushed repos go last
+        return sorted(repos, key=lambda r: (r.get("pushed_at") or "", job_cost(r)), reverse=True)
+    return list(repos)
+
+def project_schedule(repos, workers):
+    """Simulate handing repos (in order) to the first free worker.
+
+    Returns ([(repo, worker, start, end), ...], makespan) in cost units.
+    """
+    free = [(0, w) for w in range(max(1, workers))]
+    plan = []
+    for repo in repos:
+        start, worker = heapq.heappop(free)
+        end = start + job_cost(repo)
+        plan.append((repo, worker, start, end))
+        heapq.heappush(free, (end, worker))
+    return plan, max((end for *_, end in plan), default=0)
+
+def print_schedule(repos, workers, order, api_order=None):
+    """Print the projected schedule for a dry run."""
+    plan, makespan = project_schedule(repos, workers)
+    print(f"{BOLD}Projected schedule — {len(repos)} repos, {workers} workers, order: {order}{RESET}\n")
+    print(f"{'#':>4}  {'worker':>6}  {'start MB':>9}  {'end MB':>9}  {'pushed':<10}  repo")
+    for i, (repo, worker, start, end) in enumerate(plan, 1):
+        pushed = (repo.get("pushed_at") or "")[:10]
+        print(f"{i:>4}  {worker:>6}  {start / 1024:>9.1f}  {end / 1024:>9.1f}  {pushed:<10}  {repo['full_name']}")
+
+    print(f"\n{CYAN}Projected makespan: {makespan / 1024:.1f} MB-equivalents{RESET}")
+    if api_order is not None and order != "api":
+        _, baseline = project_schedule(api_order, workers)
+        print(f"{YELLOW}API order would take: {baseline / 1024:.1f} MB-equivalents{RESET}")
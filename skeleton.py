@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Skeleton extraction for summarize and ghsummarize.
+
+Instead of every byte of every file, a skeleton holds a directory tree
+(`tree.txt`), the full text of documentation and build manifests, and an
+outline of each source file: imports, declarations, signatures and
+docstrings with the bodies left out. Python is outlined with `ast`; other
+languages with line-based regexes. Summaries need the shape of a project,
+not its function bodies, so the prompt shrinks several times over.
+"""
+
+import os
+import re
+import ast
+import fnmatch
+
+# ─────────────── Config ───────────────
+MAX_FILE_BYTES    = 1_048_576  # same cut-off as the full extract
+SMALL_FILE_BYTES  = 512        # source and config files this small are cheaper kept whole
+DOC_MAX_BYTES     = 8192       # docs are cut here (changelogs, guides)...
+README_MAX_BYTES  = 32768      # ...except READMEs, which say the most per byte
+MAX_OUTLINE_LINES = 400
+MAX_LINE_CHARS    = 200
+MAX_DOC_CHARS     = 300        # docstrings are cut to their first paragraph and this length
+TREE_DIR_LIMIT    = 40         # files listed per directory in tree.txt
+LICENSE_LINES     = 3          # enough to name the license
+
+DOC_EXTENSIONS = {".md", ".markdown", ".rst", ".adoc", ".org"}
+CONFIG_EXTENSIONS = {".json", ".yml", ".yaml", ".toml", ".ini", ".cfg", ".conf", ".properties"}
+CONFIG_NAMES = {".env.example", ".env.sample", ".env.template"}  # splitext would see ".example"
+MANIFEST_NAMES = {
+    "package.json", "pyproject.toml", "setup.py", "setup.cfg", "Pipfile", "environment.yml",
+    "Cargo.toml", "go.mod", "pom.xml", "build.gradle", "build.gradle.kts", "settings.gradle",
+    "Gemfile", "composer.json", "Makefile", "CMakeLists.txt", "tsconfig.json", "firebase.json",
+    "Procfile", "tox.ini", "mix.exs", "pubspec.yaml", "deno.json", "app.json", "manifest.json",
+}
+MANIFEST_PATTERNS = (
+    "requirements*.txt", "Dockerfile*", "docker-compose*.yml", "docker-compose*.yaml", "*.csproj",
+    "vite.config.*", "webpack.config.*", "next.config.*", "*.cabal", "*.gemspec",
+)
+LICENSE_RE = re.compile(r"^(license|licence|copying)(\.\w+)?$", re.IGNORECASE)
+
+SKELETON_NOTE = (
+    "This input is a *skeleton* of the repository: `tree.txt` lists every tracked file, documentation "
+    "and build manifests are included in full, and source files marked as outlines show only imports, "
+    "declarations, signatures and docstrings, with bodies elided as `...`. Files that are not shown "
+    "are still listed in `tree.txt`."
+)
+
+# ─────────────── Regex Outlines ───────────────
+_C_LIKE_DECL = (
+    r"^\s*(import|package|using|namespace)\b",
+    r"^\s*(export\s+)?(default\s+)?(abstract\s+|final\s+|sealed\s+|data\s+|open\s+)*"
+    r"(class|interface|enum|struct|record|object|trait|protocol|extension)\s+\w+",
+    r"^\s*((public|private|protected|internal|static|abstract|final|override|virtual|async|"
+    r"suspend|inline|extern|synchronized)\s+)+[\w<>\[\],.?\s]*\w+\s*\(",
+)
+OUTLINE_PATTERNS = {
+    "js": (
+        r"^\s*(import|export)\b",
+        r"^\s*(async\s+)?function\b",
+        r"^\s*(export\s+)?(default\s+)?(abstract\s+)?class\s",
+        r"^\s*(export\s+)?(interface|type|enum)\s+\w+",
+        r"^\s*(export\s+)?(const|let|var)\s+\w+\s*=\s*(async\s*)?(\([^)]*\)|\w+)\s*=>",
+        r"^\s*module\.exports\b",
+        r"^\s+(static\s+|async\s+|get\s+|set\s+)*(?!(if|for|while|switch|catch|return)\b)\w+\s*\([^)]*\)\s*\{",
+    ),
+    "py": (
+        r"^\s*(import|from)\s",
+        r"^\s*(async\s+)?def\s",
+        r"^\s*class\s",
+    ),
+    "go": (
+        r"^(package|import|func|type)\b",
+        r"^\s+\"[\w./-]+\"$",
+    ),
+    "rust": (
+        r"^\s*(pub(\([\w:]+\))?\s+)?(use|mod|fn|async\s+fn|struct|enum|trait|impl|type|const|static)\b",
+        r"^\s*impl\b",
+        r"^\s*macro_rules!",
+    ),
+    "c_like": _C_LIKE_DECL,
+    "c": (
+        r"^#\s*include\b",
+        r"^\s*(class|struct|enum|union|namespace|typedef|template)\b",
+        r"^[A-Za-z_][\w\s\*&:<>,~]*\([^;]*\)\s*(const)?\s*\{?\s*$",
+    ),
+    "ruby": (
+        r"^\s*(require|require_relative|module|class|def|include|extend|attr_\w+)\b",
+    ),
+    "php": (
+        r"^\s*(namespace|use|require|require_once|include)\b",
+        r"^\s*(abstract\s+|final\s+)?(class|interface|trait|enum)\s",
+        r"^\s*((public|private|protected|static|abstract|final)\s+)*function\b",
+    ),
+    "shell": (
+        r"^\s*(function\s+\w+|\w+\s*\(\)\s*\{?)",
+        r"^\s*(source|\.)\s",
+    ),
+}
+OUTLINE_PATTERNS = {lang: [re.compile(p) for p in pats] for lang, pats in OUTLINE_PATTERNS.items()}
+
+LANGUAGES = {
+    ".js": "js", ".jsx": "js", ".mjs": "js", ".cjs": "js", ".ts": "js", ".tsx": "js", ".vue": "js", ".svelte": "js",
+    ".go": "go",
+    ".rs": "rust",
+    ".java": "c_like", ".kt": "c_like", ".kts": "c_like", ".scala": "c_like", ".cs": "c_like",
+    ".swift": "c_like", ".dart": "c_like",
+    ".c": "c", ".h": "c", ".cc": "c", ".cpp": "c", ".cxx": "c", ".hpp": "c", ".hh": "c", ".m": "c",
+    ".rb": "ruby",
+    ".php": "php",
+    ".sh": "shell", ".bash": "shell", ".zsh": "shell",
+}
+COMMENT_RE = re.compile(r"^\s*(//|#(?!include)|/\*|\*|--)")
+
+def regex_outline(text, language):
+    """Declaration lines (and the doc comment right above each) for a non-Python source file."""
+    patterns = OUTLINE_PATTERNS[language]
+    lines, comments = [], []
+    for line in text.splitlines():
+        if COMMENT_RE.match(line):
+            stripped = line.strip()
+            if stripped not in ("/**", "*/", "*", "/*", "//", "#"):
+                comments.append(line.rstrip())
+            continue
+        if any(p.match(line) for p in patterns):
+            lines.extend(comments[-2:])
+            lines.append(line.rstrip().rstrip("{").rstrip()[:MAX_LINE_CHARS])
+        comments = []
+    return lines
+
+# ─────────────── Python Outlines ───────────────
+def _docstring(node, indent):
+    doc = ast.get_docstring(node)
+    if not doc:
+        return []
+    first = doc.strip().split("\n\n")[0].strip()
+    if len(first) > MAX_DOC_CHARS:
+        first = first[:MAX_DOC_CHARS].rstrip() + "…"
+    return [f'{indent}"""{first}"""']
+
+def _header(node, source_lines, indent):
+    """Decorators and the `def`/`class` line(s) exactly as written."""
+    lines = [f"{indent}@{' '.join(source_lines[d.lineno - 1][d.col_offset:].split())}"
+             for d in node.decorator_list]
+    first = node.body[0]
+    if first.lineno == node.lineno:  # `def f(): return x` — cut the body off
+        header = [source_lines[node.lineno - 1][node.col_offset:first.col_offset]]
+    else:
+        header = source_lines[node.lineno - 1:first.lineno - 1]
+    text = " ".join(l.strip() for l in header if l.strip() and not l.strip().startswith("#"))
+    lines.append(f"{indent}{text[:MAX_LINE_CHARS]}")
+    return lines
+
+def _outline_body(body, source_lines, indent, lines):
+    for node in body:
+        if isinstance(node, (ast.Import, ast.ImportFrom)) and not indent:
+            lines.append(" ".join(" ".join(source_lines[node.lineno - 1:node.end_lineno]).split()))
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            lines.extend(_header(node, source_lines, indent))
+            doc = _docstring(node, indent + "    ")
+            if doc:
+                lines.extend(doc)
+                lines.append(f"{indent}    ...")
+            else:
+                lines[-1] += " ..."
+        elif isinstance(node, ast.ClassDef):
+            lines.extend(_header(node, source_lines, indent))
+            lines.extend(_docstring(node, indent + "    "))
+            before = len(lines)
+            _outline_body(node.body, source_lines, indent + "    ", lines)
+            if len(lines) == before:
+                lines.append(f"{indent}    ...")
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            names = [t.id for t in targets if isinstance(t, ast.Name)]
+            # Module constants and class attributes (dataclass/enum fields) describe the shape
+            if names and (indent or all(n.isupper() for n in names)):
+                line = source_lines[node.lineno - 1].strip()[:MAX_LINE_CHARS]
+                lines.append(f"{indent}{line}{' …' if node.end_lineno > node.lineno else ''}")
+        elif (isinstance(node, ast.If) and not indent and isinstance(node.test, ast.Compare)
+              and isinstance(node.test.left, ast.Name) and node.test.left.id == "__name__"):
+            lines.append("if __name__ == '__main__':")
+            lines.append("    ...")
+
+def python_outline(text):
+    """Imports, constants, classes and function signatures with docstrings; None if it doesn't parse."""
+    try:
+        tree = ast.parse(text)
+    except (SyntaxError, ValueError):
+        return None
+    lines = _docstring(tree, "")
+    _outline_body(tree.body, text.splitlines(), "", lines)
+    return lines
+
+# ─────────────── Tree ───────────────
+def render_tree(files):
+    """`tree`-style listing of tracked files, with very full directories cut short."""
+    root = {}
+    for path in files:
+        node = root
+        parts = path.split("/")
+        for part in parts[:-1]:
+            node = node.setdefault(part + "/", {})
+        node[parts[-1]] = None
+
+    lines = ["."]
+    def walk(node, prefix):
+        dirs  = sorted(k for k, v in node.items() if v is not None)
+        plain = sorted(k for k, v in node.items() if v is None)
+        hidden = max(0, len(plain) - TREE_DIR_LIMIT)
+        entries = dirs + plain[:TREE_DIR_LIMIT] + ([f"… {hidden} more files"] if hidden else [])
+        for i, name in enumerate(entries):
+            last = i == len(entries) - 1
+            lines.append(f"{prefix}{'└── ' if last else '├── '}{name}")
+            if name in dirs:
+                walk(node[name], prefix + ("    " if last else "│   "))
+    walk(root, "")
+    return "\n".join(lines) + "\n"
+
+# ─────────────── Extraction ───────────────
+def classify(path):
+    """'license', 'manifest', 'doc', 'config', a language for outlining, or None (tree only)."""
+    name = os.path.basename(path)
+    ext = os.path.splitext(name)[1].lower()
+    if LICENSE_RE.match(name):
+        return "license"
+    if (name in MANIFEST_NAMES or any(fnmatch.fnmatch(name, p) for p in MANIFEST_PATTERNS)
+            or path.startswith(".github/workflows/")):
+        return "manifest"
+    if ext in DOC_EXTENSIONS or (ext == ".txt" and ("/" not in path or path.startswith("docs/"))):
+        return "doc"
+    if ext in (".py", ".pyw"):
+        return "python"
+    if ext in CONFIG_EXTENSIONS or name in CONFIG_NAMES:
+        return "config"
+    return LANGUAGES.get(ext)
+
+def skeleton_entries(repo_path, files, tree=True):
+    """Yield (path, kind, text) records; kind is 'tree', 'full' or 'outline'."""
+    if tree:
+        yield "tree.txt", "tree", render_tree(files)
+    for path in files:
+        kind = classify(path)
+        full = os.path.join(repo_path, path)
+        try:
+            size = os.path.getsize(full)
+            if kind is None or size > MAX_FILE_BYTES or (kind == "config" and size > SMALL_FILE_BYTES):
+                continue
+            with open(full, encoding="utf-8", errors="strict") as f:
+                text = f.read()
+        except (UnicodeDecodeError, OSError):
+            continue  # binary or unreadable; still listed in tree.txt
+
+        if kind == "license":
+            yield path, "full", "\n".join(text.strip().splitlines()[:LICENSE_LINES]) + "\n[…]\n"
+        elif kind == "doc":
+            limit = README_MAX_BYTES if os.path.basename(path).lower().startswith("readme") else DOC_MAX_BYTES
+            if len(text) > limit:
+                text = text[:limit] + f"\n[… {(len(text) - limit) // 1024} KB more]\n"
+            yield path, "full", text
+        elif kind in ("manifest", "config") or size <= SMALL_FILE_BYTES:
+            yield path, "full", text
+        else:
+            outline = python_outline(text) if kind == "python" else None
+            if outline is None:
+                outline = regex_outline(text, "py" if kind == "python" else kind)
+            if outline:
+                if len(outline) > MAX_OUTLINE_LINES:
+                    outline = outline[:MAX_OUTLINE_LINES] + [f"… {len(outline) - MAX_OUTLINE_LINES} more lines"]
+                yield path, "outline", "\n".join(outline) + "\n"
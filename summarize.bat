@@ -3,10 +3,11 @@
 if "%~1" == "" (
   echo Usage: summarize.bat [repository_path]
   echo Example: summarize.bat C:\Projects\my-repo
+  echo          summarize.bat --all C:\Projects
   pause
   exit /b
 )
 
-echo Summarizing repository: %~1
-python "%~dp0summarize.py" "%~1"
+echo Summarizing: %*
+python "%~dp0summarize.py" %*
 pause
\ No newline at end of file
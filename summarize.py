@@ -2,17 +2,14 @@
 import os
 import subprocess
 import argparse
-import dotenv
-from google import genai
-from google.genai import types
 
-dotenv.load_dotenv()
+import llm
+from extract import find_git_repos
 
 # ─────────────── Paths & Config ───────────────
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 OUTPUT_DIR = os.getcwd()  # Changed to current working directory
-GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY")
-GEMINI_MODEL = "gemini-2.0-flash"
+DEFAULT_WORKERS = 4
 
 # ─────────────── Color Codes ───────────────
 RESET = "\033[0m"
@@ -25,56 +22,65 @@ CYAN = "\033[36m"
 # ─────────────── Helpers ───────────────
 def list_git_files(repo_path):
     """List all files tracked by git in a repository."""
-    original_dir = os.getcwd()
-    try:
-        os.chdir(repo_path)
-        result = subprocess.run(
-            ['git', 'ls-files'], 
-            stdout=subprocess.PIPE, 
-            text=True, 
-            check=True
-        )
-        return result.stdout.splitlines()
-    finally:
-        os.chdir(original_dir)
+    result = subprocess.run(
+        ['git', '-C', repo_path, 'ls-files'],
+        stdout=subprocess.PIPE,
+        text=True,
+        check=True
+    )
+    return result.stdout.splitlines()
 
-def extract_contents(repo_path):
-    """Extract all git-tracked files' contents into a formatted string."""
+def extract_records(repo_path, skeleton=False):
+    """Yield (path, kind, text) for every git-tracked file.
+
+    kind is 'full' for file contents and 'marker' when the file was skipped
+    (text says why). With `skeleton`, source files are reduced to outlines
+    and a tree.txt is added (see skeleton.py).
+    """
     files = list_git_files(repo_path)
-    parts = []
+    if skeleton:
+        from skeleton import skeleton_entries
+        yield from skeleton_entries(repo_path, files)
+        return
     
     for file_path in files:
         full_path = os.path.join(repo_path, file_path)
-        parts.append(f"\nFilename: {file_path}\nContent:\n")
-        
         try:
             # Skip binary files, large files, or files that can't be read as text
             if os.path.getsize(full_path) > 1_048_576:  # Skip files > 1MB
-                parts.append("[File too large to display]\n")
+                yield file_path, "marker", "[File too large to display]"
                 continue
                 
             # Try to read the file
             with open(full_path, 'r', encoding='utf-8', errors='strict') as file:
                 content = file.read()
-                parts.append(content)
-                
-            parts.append("\n\n" + "=" * 80 + "\n")
         except UnicodeDecodeError:
-            parts.append("[Binary file - cannot display content]\n")
+            yield file_path, "marker", "[Binary file - cannot display content]"
+            continue
         except Exception as e:
-            parts.append(f"[Error reading file: {str(e)}]\n")
-    
-    return "".join(parts)
+            yield file_path, "marker", f"[Error reading file: {str(e)}]"
+            continue
+        yield file_path, "full", content
+
+def format_record(path, kind, text):
+    """One `Filename:`/`Content:` record of the extract."""
+    if kind == "marker":
+        return f"\nFilename: {path}\nContent:\n{text}\n"
+    label = "Content (outline):" if kind == "outline" else "Content:"
+    return f"\nFilename: {path}\n{label}\n{text}\n\n" + "=" * 80 + "\n"
+
+def extract_contents(repo_path, skeleton=False):
+    """Extract all git-tracked files' contents into a formatted string."""
+    return "".join(format_record(*record) for record in extract_records(repo_path, skeleton))
 
 def get_repo_info(repo_path):
     """Extract owner and repo name from the git remote URL."""
-    original_dir = os.getcwd()
     try:
-        os.chdir(repo_path)
         result = subprocess.run(
-            ['git', 'remote', 'get-url', 'origin'], 
-            stdout=subprocess.PIPE, 
-            text=True, 
+            ['git', '-C', repo_path, 'remote', 'get-url', 'origin'],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
             check=True
         )
         remote_url = result.stdout.strip()
@@ -95,22 +101,33 @@ def get_repo_info(repo_path):
         # If no remote URL exists, use directory name as repo name
         repo_name = os.path.basename(os.path.abspath(repo_path))
         return "local", repo_name
-    finally:
-        os.chdir(original_dir)
 
-def summarize_with_gemini(owner, repo_name, text):
-    """Send a prompt to Gemini and stream back the summary."""
-    if not GEMINI_API_KEY:
+def summarize_with_gemini(owner, repo_name, text, output_file=None, echo=False, skeleton=False, minified=False):
+    """Send a prompt to Gemini and stream back the summary; returns (ok, summary or error message).
+
+    With `output_file`, chunks are written through to disk as they arrive
+    (and echoed to the terminal if `echo`), see llm.stream_to_file.
+    """
+    try:
+        backend = llm.get_backend()
+    except llm.MissingAPIKeyError:
         print(f"{RED}Error: GEMINI_API_KEY environment variable not set{RESET}")
-        return "Error: GEMINI_API_KEY not set. Please set this environment variable with your API key."
+        return False, "Error: GEMINI_API_KEY not set. Please set this environment variable with your API key."
     
-    client = genai.Client(api_key=GEMINI_API_KEY)
+    skeleton_note = ""
+    if skeleton:
+        from skeleton import SKELETON_NOTE
+        skeleton_note = f"\n\n{SKELETON_NOTE} Source outlines are marked `Content (outline):`."
+    if minified:
+        from minify import NOTE
+        skeleton_note += f"\n\n{NOTE}"
+
     prompt = f"""
 **Role:** Expert Software Engineer
 
 **Task:** Analyze the provided repository contents for "{owner}/{repo_name}" and generate a concise, structured, and technical summary suitable for another developer quickly understanding the project's purpose, structure, and key characteristics.
 
-**Input Context:** The input contains a concatenation of multiple file contents from the repository. Each file's content is preceded by a line starting with `Filename: ` and followed by `Content:`. Files are separated by lines of `================================================================================`. Some files might be marked as binary or too large to display. A `tree.txt` file providing a directory structure may also be included.
+**Input Context:** The input contains a concatenation of multiple file contents from the repository. Each file's content is preceded by a line starting with `Filename: ` and followed by `Content:`. Files are separated by lines of `================================================================================`. Some files might be marked as binary or too large to display. A `tree.txt` file providing a directory structure may also be included.{skeleton_note}
 
 **Output Format:** Generate a summary in Markdown format, covering the following sections precisely:
 
@@ -171,32 +188,105 @@ def summarize_with_gemini(owner, repo_name, text):
 Here is the input:
 {text}
 """
-    contents = [
-        types.Content(
-            role="user",
-            parts=[types.Part(text=prompt)]
-        )
-    ]
-    cfg = types.GenerateContentConfig(response_mime_type="text/plain")
     try:
-        summary_chunks = client.models.generate_content_stream(
-            model=GEMINI_MODEL,
-            contents=contents,
-            config=cfg
-        )
-        return "".join(chunk.text for chunk in summary_chunks)
+        if output_file:
+            return True, llm.stream_to_file(backend.generate_stream(prompt), output_file, echo=echo)
+        return True, backend.generate(prompt)
     except Exception as e:
         print(f"{RED}Error calling Gemini API: {e}{RESET}")
-        return f"Error generating summary: {e}"
+        return False, f"Error generating summary: {e}"
+
+def output_path(owner, repo_name, extract_only, output_dir=OUTPUT_DIR):
+    """Default output file for a repository."""
+    if extract_only:
+        return os.path.join(output_dir, f"{owner}_{repo_name}_contents.txt")
+    return os.path.join(output_dir, f"{owner}_{repo_name}_summary.md")
+
+def process_repo(repo_path, root, extract_only=False, skeleton=False, minify=False):
+    """Extract (and summarize) one repository for --all mode; returns (repo_key, ok, status)."""
+    owner, repo_name = get_repo_info(repo_path)
+    relative = os.path.relpath(repo_path, root)
+    if owner == "local" and relative != os.curdir:
+        # Directory names aren't unique across a workspace (a/foo, b/foo); the relative path is
+        repo_name = relative.replace(os.sep, "_")
+    repo_key = f"{owner}/{repo_name}"
+    try:
+        output_file = output_path(owner, repo_name, extract_only)
+        records = list(extract_records(repo_path, skeleton))
+        contents = "".join(format_record(*record) for record in records)
+        savings = ""
+        if minify:
+            from minify import minify_records, describe_savings
+            contents, stats = minify_records(records, contents)
+            savings = f" ({describe_savings(stats)})"
+        if extract_only:
+            with open(output_file, 'w', encoding='utf-8') as f:
+                f.write(contents)
+        else:
+            ok, summary = summarize_with_gemini(owner, repo_name, contents, output_file=output_file,
+                                                skeleton=skeleton, minified=minify)
+            if not ok:
+                return repo_key, False, f"{RED}❌ {summary}{RESET}"
+        return repo_key, True, f"{GREEN}✅ {os.path.basename(output_file)}{savings}{RESET}"
+    except Exception as e:
+        return repo_key, False, f"{RED}❌ {e}{RESET}"
+
+def process_workspace(root, extract_only=False, workers=DEFAULT_WORKERS, skeleton=False, minify=False):
+    """Extract and summarize every git repo under root with bounded parallelism; returns the failure count."""
+    repos = find_git_repos(root)
+    if not repos:
+        print(f"{YELLOW}No git repositories found under {root}{RESET}")
+        return 0
+
+    print(f"{CYAN}Found {len(repos)} repositories under {root} — using {workers} workers.{RESET}\n")
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    failed = 0
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = [executor.submit(process_repo, repo, root, extract_only, skeleton, minify) for repo in repos]
+        for future in as_completed(futures):
+            repo_key, ok, status = future.result()
+            failed += not ok
+            print(f"{CYAN}→ {repo_key}{RESET} {status}", flush=True)
+
+    print(f"\n{BOLD}All done! {len(repos) - failed}/{len(repos)} repositories saved to {OUTPUT_DIR}{RESET}")
+    return failed
 
 def main():
     parser = argparse.ArgumentParser(description='Extract and summarize a git repository')
-    parser.add_argument('repo_path', help='Path to the git repository')
+    parser.add_argument('repo_path', nargs='?', help='Path to the git repository')
+    parser.add_argument('--all', '-a', metavar='WORKSPACE_DIR',
+                        help='Summarize every git repository found under this directory')
+    parser.add_argument('--workers', '-j', type=int, default=DEFAULT_WORKERS,
+                        help=f'Repositories to process in parallel with --all (default: {DEFAULT_WORKERS})')
     parser.add_argument('--output', '-o', help='Output file (default: auto-generated based on repo name)')
     parser.add_argument('--extract-only', '-e', action='store_true', help='Only extract contents without summarizing')
+    parser.add_argument('--echo', action='store_true', help='Print the summary to the terminal as it is generated')
+    parser.add_argument('--skeleton', '-s', action='store_true',
+                        help='Send a tree, docs, manifests and source outlines instead of full file contents')
+    parser.add_argument('--minify', '-m', action='store_true',
+                        help='Compact the extract (whitespace, license headers, lockfiles, generated/minified files) '
+                             'and report the token savings')
     
     args = parser.parse_args()
     
+    # Only the summarizing paths need the API key from .env
+    if not args.extract_only:
+        import dotenv
+        dotenv.load_dotenv()
+    
+    if args.all:
+        if args.output:
+            parser.error('--output names a single file and cannot be combined with --all')
+        if not os.path.isdir(args.all):
+            print(f"{RED}Error: Workspace directory '{args.all}' does not exist{RESET}")
+            exit(1)
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
+        failed = process_workspace(args.all, args.extract_only, args.workers, args.skeleton, args.minify)
+        exit(1 if failed else 0)
+    
+    if not args.repo_path:
+        parser.error('a repository path or --all WORKSPACE_DIR is required')
+    
     # Validate repository path
     if not os.path.exists(args.repo_path):
         print(f"{RED}Error: Repository path '{args.repo_path}' does not exist{RESET}")
@@ -222,7 +312,18 @@ def main():
             output_file = os.path.join(OUTPUT_DIR, f"{owner}_{repo_name}_summary.md")
     
     print(f"{CYAN}Extracting files from {args.repo_path}...{RESET}")
-    contents = extract_contents(args.repo_path)
+    records = list(extract_records(args.repo_path, args.skeleton))
+    contents = "".join(format_record(*record) for record in records)
+    if args.skeleton:
+        tracked = sum(os.path.getsize(os.path.join(args.repo_path, f))
+                      for f in list_git_files(args.repo_path)
+                      if os.path.isfile(os.path.join(args.repo_path, f)))
+        print(f"{CYAN}Skeleton: {len(contents) / 1024:.0f} KB from {tracked / 1024:.0f} KB of tracked files "
+              f"({tracked / max(1, len(contents)):.1f}x smaller){RESET}")
+    if args.minify:
+        from minify import minify_records, describe_savings
+        contents, stats = minify_records(records, contents)
+        print(f"{CYAN}Minified: {describe_savings(stats)}{RESET}")
     
     if args.extract_only:
         # Save extracted contents to file
@@ -232,10 +333,15 @@ def main():
     else:
         # Summarize and save
         print(f"{CYAN}Summarizing repository {owner}/{repo_name}...{RESET}")
-        summary = summarize_with_gemini(owner, repo_name, contents)
+        ok, summary = summarize_with_gemini(owner, repo_name, contents, output_file=output_file, echo=args.echo,
+                                            skeleton=args.skeleton, minified=args.minify)
+        if args.echo:
+            print()
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(summary)
+        if not ok:
+            if os.path.exists(output_file + ".partial"):
+                print(f"{YELLOW}Partial summary kept in {output_file}.partial{RESET}")
+            exit(1)
         
         print(f"{GREEN}Done! Summary saved to {output_file}{RESET}")
 